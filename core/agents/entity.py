@@ -3,6 +3,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+STARVING_HUNGER = 8
+DEATH_HUNGER = 10
+
 
 @dataclass
 class Entity:
@@ -42,8 +45,20 @@ class Entity:
             "reproduction_cooldown": int(self.reproduction_cooldown),
         }
 
+    def copy(self) -> "Entity":
+        return Entity(
+            id=self.id,
+            type=self.type,
+            x=self.x,
+            y=self.y,
+            hunger=self.hunger,
+            age=self.age,
+            health=self.health,
+            reproduction_cooldown=self.reproduction_cooldown,
+        )
+
     def is_starving(self) -> bool:
-        return self.hunger >= 8
+        return self.hunger >= STARVING_HUNGER
 
     def is_dead(self) -> bool:
-        return self.hunger >= 10 or self.health <= 0
+        return self.hunger >= DEATH_HUNGER or self.health <= 0
@@ -0,0 +1,251 @@
+"""Columnar entity registry backed by NumPy.
+
+`EntityStore` keeps every entity field in a parallel typed array, reuses freed
+slots through a free-list, and maps entity ids to slots. It behaves like the
+`Dict[int, Entity]` registry on `GridState.entities`: lookups hand out
+`EntityRef` views whose attributes read and write the arrays directly, while
+batch kernels (see core.kernels) work on whole columns at once.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+from core.agents.entity import Entity
+
+DEFAULT_TYPES = ("rabbit", "fox")
+NO_TYPE = -1
+_COLUMNS = (
+    ("ids", np.int64),
+    ("type_code", np.int16),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("hunger", np.int32),
+    ("age", np.int32),
+    ("health", np.int32),
+    ("cooldown", np.int32),
+)
+
+
+class EntityStore(MutableMapping):
+    """Parallel id/type/x/y/hunger/age/health/cooldown arrays with a free-list and id-to-slot map."""
+
+    def __init__(self, capacity: int = 64) -> None:
+        capacity = max(1, int(capacity))
+        for name, dtype in _COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.type_code[:] = NO_TYPE
+        self.health[:] = 100
+        self.slot_of: Dict[int, int] = {}
+        self.free: List[int] = []
+        self.size = 0
+        self.type_names: List[str] = list(DEFAULT_TYPES)
+        self.type_counts: Counter[str] = Counter()
+
+    @classmethod
+    def from_entities(cls, entities: Iterable[Entity]) -> "EntityStore":
+        entities = list(entities)
+        store = cls(capacity=max(64, len(entities)))
+        for entity in entities:
+            store[entity.id] = entity
+        return store
+
+    @property
+    def capacity(self) -> int:
+        return len(self.ids)
+
+    def type_code_for(self, entity_type: str) -> int:
+        try:
+            return self.type_names.index(entity_type)
+        except ValueError:
+            self.type_names.append(str(entity_type))
+            return len(self.type_names) - 1
+
+    def insert(
+        self,
+        entity_id: int,
+        entity_type: str,
+        x: int,
+        y: int,
+        *,
+        hunger: int = 0,
+        age: int = 0,
+        health: int = 100,
+        reproduction_cooldown: int = 0,
+    ) -> int:
+        """Store an entity and return its slot (reusing freed slots first)."""
+        slot = self.slot_of.get(entity_id)
+        if slot is None:
+            slot = self._allocate()
+            self.slot_of[int(entity_id)] = slot
+        else:
+            self.type_counts[self.type_names[self.type_code[slot]]] -= 1
+        self.ids[slot] = entity_id
+        self.type_code[slot] = self.type_code_for(entity_type)
+        self.x[slot] = x
+        self.y[slot] = y
+        self.hunger[slot] = hunger
+        self.age[slot] = age
+        self.health[slot] = health
+        self.cooldown[slot] = reproduction_cooldown
+        self.type_counts[entity_type] += 1
+        return slot
+
+    def _allocate(self) -> int:
+        if self.free:
+            return self.free.pop()
+        if self.size >= self.capacity:
+            self._grow(max(64, self.capacity * 2))
+        slot = self.size
+        self.size += 1
+        return slot
+
+    def _grow(self, capacity: int) -> None:
+        for name, dtype in _COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+        self.type_code[self.size :] = NO_TYPE
+
+    def active_slots(self) -> np.ndarray:
+        """Slots of live entities in insertion order."""
+        return np.fromiter(self.slot_of.values(), dtype=np.intp, count=len(self.slot_of))
+
+    def slots_of_type(self, entity_type: str, slots: np.ndarray | None = None) -> np.ndarray:
+        if slots is None:
+            slots = self.active_slots()
+        if entity_type not in self.type_names:
+            return slots[:0]
+        return slots[self.type_code[slots] == self.type_names.index(entity_type)]
+
+    def count(self, entity_type: str) -> int:
+        return int(self.type_counts.get(entity_type, 0))
+
+    def copy(self) -> "EntityStore":
+        clone = EntityStore.__new__(EntityStore)
+        for name, _ in _COLUMNS:
+            setattr(clone, name, getattr(self, name).copy())
+        clone.slot_of = dict(self.slot_of)
+        clone.free = list(self.free)
+        clone.size = self.size
+        clone.type_names = list(self.type_names)
+        clone.type_counts = Counter(self.type_counts)
+        return clone
+
+    def __getitem__(self, entity_id: int) -> "EntityRef":
+        return EntityRef(self, self.slot_of[entity_id])
+
+    def __setitem__(self, entity_id: int, entity: Entity) -> None:
+        self.insert(
+            entity_id,
+            entity.type,
+            entity.x,
+            entity.y,
+            hunger=entity.hunger,
+            age=entity.age,
+            health=entity.health,
+            reproduction_cooldown=entity.reproduction_cooldown,
+        )
+
+    def __delitem__(self, entity_id: int) -> None:
+        slot = self.slot_of.pop(entity_id)
+        self.type_counts[self.type_names[self.type_code[slot]]] -= 1
+        self.type_code[slot] = NO_TYPE
+        self.free.append(slot)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self.slot_of
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.slot_of)
+
+    def __len__(self) -> int:
+        return len(self.slot_of)
+
+    def get(self, entity_id: int, default: Entity | None = None) -> Entity | None:
+        slot = self.slot_of.get(entity_id)
+        if slot is None:
+            return default
+        return EntityRef(self, slot)
+
+    def keys(self):
+        return self.slot_of.keys()
+
+
+class EntityRef(Entity):
+    """`Entity` view over one `EntityStore` slot; only valid while that entity stays in the store."""
+
+    def __init__(self, store: EntityStore, slot: int) -> None:
+        self._store = store
+        self._slot = slot
+
+    @property
+    def id(self) -> int:
+        return int(self._store.ids[self._slot])
+
+    @id.setter
+    def id(self, value: int) -> None:
+        raise AttributeError("Entity ids are fixed once stored")
+
+    @property
+    def type(self) -> str:
+        return self._store.type_names[self._store.type_code[self._slot]]
+
+    @type.setter
+    def type(self, value: str) -> None:
+        store = self._store
+        store.type_counts[self.type] -= 1
+        store.type_code[self._slot] = store.type_code_for(value)
+        store.type_counts[value] += 1
+
+    @property
+    def x(self) -> int:
+        return int(self._store.x[self._slot])
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self._store.x[self._slot] = value
+
+    @property
+    def y(self) -> int:
+        return int(self._store.y[self._slot])
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self._store.y[self._slot] = value
+
+    @property
+    def hunger(self) -> int:
+        return int(self._store.hunger[self._slot])
+
+    @hunger.setter
+    def hunger(self, value: int) -> None:
+        self._store.hunger[self._slot] = value
+
+    @property
+    def age(self) -> int:
+        return int(self._store.age[self._slot])
+
+    @age.setter
+    def age(self, value: int) -> None:
+        self._store.age[self._slot] = value
+
+    @property
+    def health(self) -> int:
+        return int(self._store.health[self._slot])
+
+    @health.setter
+    def health(self, value: int) -> None:
+        self._store.health[self._slot] = value
+
+    @property
+    def reproduction_cooldown(self) -> int:
+        return int(self._store.cooldown[self._slot])
+
+    @reproduction_cooldown.setter
+    def reproduction_cooldown(self, value: int) -> None:
+        self._store.cooldown[self._slot] = value
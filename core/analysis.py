@@ -4,13 +4,18 @@ from __future__ import annotations
 import json
 import random
 from dataclasses import dataclass
-from typing import Dict, List, Literal
+from typing import TYPE_CHECKING, Dict, Iterator, List, Literal, TextIO
 
 import core.scheduler as scheduler
 import core.telemetry as telemetry
+from core.checkpoint import FORECAST
 from core.model import GridState
+from core.rng import NOISE, RngContext
 from core.environment.producers import PRODUCER_PROFILES, PRODUCER_TYPES
 
+if TYPE_CHECKING:
+    from core.checkpoint import Checkpointer
+
 SPECIES = ("biomass", "rabbits", "foxes")
 PRODUCER_SPECIES = tuple(PRODUCER_TYPES)
 EXTINCTION_THRESHOLD = 0.5
@@ -100,6 +105,7 @@ class WaterSummary:
     wettest_cell: float
     max_dry_cells: int
     max_dry_day: int | None = None
+    first_dry_day: int | None = None
 
     def as_dict(self) -> Dict[str, float | int | None]:
         return {
@@ -111,144 +117,254 @@ class WaterSummary:
             "wettest_cell": self.wettest_cell,
             "max_dry_cells": self.max_dry_cells,
             "max_dry_day": self.max_dry_day,
+            "first_dry_day": self.first_dry_day,
         }
 
 
-def run(state: GridState, *, world_name: str, days: int, step: int, seed: int | None = None) -> ForecastResult:
-    if days <= 0:
-        raise ValueError("--days must be positive")
-    if step <= 0:
-        raise ValueError("--step must be positive")
-
-    current = state.clone()
-    start_day = current.day
-    end_day = start_day + days
-    rng = random.Random(seed) if seed is not None else None
-
-    def totals_dict(st: GridState) -> Dict[str, float | Dict[str, float]]:
-        producer_totals = st.producer_totals()
-        return {
-            "day": float(st.day),
-            "biomass": float(sum(producer_totals.values())),
-            "rabbits": float(st.total_rabbits()),
-            "foxes": float(st.total_foxes()),
-            "producers": {name: float(producer_totals.get(name, 0)) for name in PRODUCER_SPECIES},
-        }
-
-    def water_snapshot(st: GridState) -> Dict[str, float]:
-        stats = st.water_stats()
-        return {
-            "mean": float(stats["mean"]),
-            "min": float(stats["min"]),
-            "max": float(stats["max"]),
-            "dry_cells": int(stats["dry_cells"]),
-        }
-
-    def init_summary(species: str, totals: Dict[str, float]) -> MetricSummary:
-        value = totals[species]
-        return MetricSummary(start=value, end=value, min=value, max=value)
-
-    initial_totals = totals_dict(current)
-    initial_water = water_snapshot(current)
-    summary = {species: init_summary(species, initial_totals) for species in SPECIES}
-    producer_summary = {
-        name: MetricSummary(
-            start=initial_totals["producers"][name],
-            end=initial_totals["producers"][name],
-            min=initial_totals["producers"][name],
-            max=initial_totals["producers"][name],
-        )
-        for name in PRODUCER_SPECIES
-    }
-    water_summary = WaterSummary(
-        mean_start=initial_water["mean"],
-        mean_end=initial_water["mean"],
-        mean_min=initial_water["mean"],
-        mean_max=initial_water["mean"],
-        driest_cell=initial_water["min"],
-        wettest_cell=initial_water["max"],
-        max_dry_cells=initial_water["dry_cells"],
-        max_dry_day=current.day if initial_water["dry_cells"] else None,
+def run(
+    state: GridState,
+    *,
+    world_name: str,
+    days: int,
+    step: int,
+    seed: int | None = None,
+    copy_state: bool = True,
+    profiler: telemetry.PhaseProfiler | None = None,
+    checkpoint: Checkpointer | None = None,
+) -> ForecastResult:
+    """Project `state` forward; pass `copy_state=False` when the caller owns a throwaway state (saves one clone)."""
+    stream = ForecastStream(
+        state,
+        world_name=world_name,
+        days=days,
+        step=step,
+        seed=seed,
+        copy_state=copy_state,
+        keep_samples=True,
+        profiler=profiler,
+        checkpoint=checkpoint,
     )
-    samples: List[Sample] = []
-    capacity_tracker = telemetry.CapacityTracker()
-
-    def record_sample(totals: Dict[str, float | Dict[str, float]], water: Dict[str, float]) -> None:
-        samples.append(
-            Sample(
-                day=int(totals["day"]),
-                biomass=totals["biomass"],
-                rabbits=totals["rabbits"],
-                foxes=totals["foxes"],
-                water_mean=water["mean"],
-                water_min=water["min"],
-                water_max=water["max"],
-                dry_cells=int(water["dry_cells"]),
-                producers={name: float(totals["producers"][name]) for name in PRODUCER_SPECIES},
-            )
+    return finish(stream)
+
+
+def finish(stream: ForecastStream) -> ForecastResult:
+    """Consume the rest of `stream` (fresh or resumed) and return its result."""
+    for _ in stream:
+        pass
+    return stream.result()
+
+
+class ForecastStream:
+    """Incremental forecast: iterate to receive each `Sample` as it is produced, then call `result()`.
+
+    Only the running summaries are retained (unless `keep_samples=True`), so memory stays flat however long the
+    horizon is. With a `checkpoint`, the stream pickles itself every `checkpoint.every` days (after the consumer has
+    taken the latest sample); `ForecastStream.resume` continues from such a payload.
+    """
+
+    def __init__(
+        self,
+        state: GridState,
+        *,
+        world_name: str,
+        days: int,
+        step: int,
+        seed: int | None = None,
+        copy_state: bool = True,
+        keep_samples: bool = False,
+        profiler: telemetry.PhaseProfiler | None = None,
+        checkpoint: Checkpointer | None = None,
+    ) -> None:
+        if days <= 0:
+            raise ValueError("--days must be positive")
+        if step <= 0:
+            raise ValueError("--step must be positive")
+        self.world_name = world_name
+        self.days = days
+        self.step = step
+        self.seed = seed
+        self.current = state.clone() if copy_state else state
+        self.start_day = self.current.day
+        self.end_day = self.start_day + days
+        # Seeded forecasts drive both the tick rules and the noise from one context; unseeded ones stay random.
+        self.rng = RngContext(seed) if seed is not None else None
+        self.keep_samples = keep_samples
+        self.profiler = profiler
+        self.checkpoint = checkpoint
+        self.samples: List[Sample] = []
+        self.capacity_tracker = telemetry.CapacityTracker()
+        self.started = False
+
+        initial_totals = _totals_dict(self.current)
+        initial_water = _water_snapshot(self.current)
+        self.initial_totals = initial_totals
+        self.initial_water = initial_water
+        self.summary = {species: _init_summary(initial_totals[species]) for species in SPECIES}
+        self.producer_summary = {
+            name: _init_summary(initial_totals["producers"][name]) for name in PRODUCER_SPECIES
+        }
+        self.water_summary = WaterSummary(
+            mean_start=initial_water["mean"],
+            mean_end=initial_water["mean"],
+            mean_min=initial_water["mean"],
+            mean_max=initial_water["mean"],
+            driest_cell=initial_water["min"],
+            wettest_cell=initial_water["max"],
+            max_dry_cells=initial_water["dry_cells"],
+            max_dry_day=self.current.day if initial_water["dry_cells"] else None,
+            first_dry_day=self.current.day if initial_water["dry_cells"] else None,
         )
 
-    record_sample(initial_totals, initial_water)
-
-    while current.day < end_day:
-        current = scheduler.tick_grid(current, log_capacity=False)
-        capacity_tracker.ingest(current.capacity_events)
+    @classmethod
+    def resume(
+        cls,
+        payload: Dict[str, object],
+        *,
+        profiler: telemetry.PhaseProfiler | None = None,
+        checkpoint: Checkpointer | None = None,
+    ) -> "ForecastStream":
+        """Rebuild a stream from a forecast checkpoint payload (see `core.checkpoint.load`)."""
+        stream = payload["stream"]
+        if not isinstance(stream, cls):
+            raise ValueError("Checkpoint does not hold a forecast stream")
+        stream.profiler = profiler
+        stream.checkpoint = checkpoint
+        return stream
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = self.__dict__.copy()
+        state["profiler"] = None
+        state["checkpoint"] = None
+        return state
+
+    @property
+    def finished(self) -> bool:
+        return self.started and self.current.day >= self.end_day
+
+    def __iter__(self) -> Iterator[Sample]:
+        if not self.started:
+            self.started = True
+            yield self._record(self.initial_totals, self.initial_water)
+        checkpoint = self.checkpoint
+        if checkpoint is not None:
+            checkpoint.start(self.current.day)
+        while self.current.day < self.end_day:
+            sample = self._advance()
+            if sample is not None:
+                yield sample
+            if checkpoint is not None and checkpoint.due(self.current.day):
+                checkpoint.save(FORECAST, self.current.day, {"stream": self})
+        if checkpoint is not None:
+            checkpoint.clear()
+
+    def _advance(self) -> Sample | None:
+        profiler = self.profiler
+        current = scheduler.tick_grid(
+            self.current, log_capacity=False, in_place=True, rng=self.rng, profiler=profiler
+        )
+        self.current = current
+        self.capacity_tracker.ingest(current.capacity_events)
 
-        if rng is not None:
-            _apply_noise(current, rng)
+        if self.rng is not None:
+            with telemetry.measure(profiler, "forecast_noise"):
+                _apply_noise(current, self.rng.stream(NOISE, current.day))
 
-        totals = totals_dict(current)
-        water = water_snapshot(current)
+        with telemetry.measure(profiler, "forecast_summary"):
+            totals = _totals_dict(current)
+            water = _water_snapshot(current)
         for species in SPECIES:
-            value = totals[species]
-            metric = summary[species]
-            metric.min = min(metric.min, value)
-            metric.max = max(metric.max, value)
-            if value <= EXTINCTION_THRESHOLD:
-                metric.extinct_days += 1
-                if metric.first_extinction_day is None:
-                    metric.first_extinction_day = int(totals["day"])
+            _update_metric(self.summary[species], totals[species], int(totals["day"]))
         for name in PRODUCER_SPECIES:
-            value = totals["producers"][name]
-            metric = producer_summary[name]
-            metric.min = min(metric.min, value)
-            metric.max = max(metric.max, value)
-            if value <= EXTINCTION_THRESHOLD:
-                metric.extinct_days += 1
-                if metric.first_extinction_day is None:
-                    metric.first_extinction_day = int(totals["day"])
+            _update_metric(self.producer_summary[name], totals["producers"][name], int(totals["day"]))
 
+        water_summary = self.water_summary
         water_summary.mean_min = min(water_summary.mean_min, water["mean"])
         water_summary.mean_max = max(water_summary.mean_max, water["mean"])
         water_summary.driest_cell = min(water_summary.driest_cell, water["min"])
         water_summary.wettest_cell = max(water_summary.wettest_cell, water["max"])
+        if water["dry_cells"] and water_summary.first_dry_day is None:
+            water_summary.first_dry_day = current.day
         if water["dry_cells"] > water_summary.max_dry_cells:
             water_summary.max_dry_cells = water["dry_cells"]
             water_summary.max_dry_day = current.day
 
-        if current.day >= end_day or ((current.day - start_day) % step == 0):
-            record_sample(totals, water)
+        if current.day >= self.end_day or ((current.day - self.start_day) % self.step == 0):
+            return self._record(totals, water)
+        return None
+
+    def _record(self, totals: Dict[str, float | Dict[str, float]], water: Dict[str, float]) -> Sample:
+        sample = Sample(
+            day=int(totals["day"]),
+            biomass=totals["biomass"],
+            rabbits=totals["rabbits"],
+            foxes=totals["foxes"],
+            water_mean=water["mean"],
+            water_min=water["min"],
+            water_max=water["max"],
+            dry_cells=int(water["dry_cells"]),
+            producers={name: float(totals["producers"][name]) for name in PRODUCER_SPECIES},
+        )
+        if self.keep_samples:
+            self.samples.append(sample)
+        return sample
+
+    def result(self) -> ForecastResult:
+        if not self.finished:
+            raise RuntimeError("Forecast stream has not been fully consumed")
+        totals = _totals_dict(self.current)
+        final_water = _water_snapshot(self.current)
+        for species in SPECIES:
+            self.summary[species].end = totals[species]
+        for name in PRODUCER_SPECIES:
+            self.producer_summary[name].end = totals["producers"][name]
+        self.water_summary.mean_end = final_water["mean"]
+
+        return ForecastResult(
+            world=self.world_name,
+            days=self.days,
+            step=self.step,
+            seed=self.seed,
+            initial_state=self.initial_totals,
+            samples=self.samples,
+            summary=self.summary,
+            producer_summary=self.producer_summary,
+            water_summary=self.water_summary,
+            capacity_summary=self.capacity_tracker.snapshot(),
+        )
 
-    totals = totals_dict(current)
-    final_water = water_snapshot(current)
-    for species in SPECIES:
-        summary[species].end = totals[species]
-    for name in PRODUCER_SPECIES:
-        producer_summary[name].end = totals["producers"][name]
-    water_summary.mean_end = final_water["mean"]
 
-    return ForecastResult(
-        world=world_name,
-        days=days,
-        step=step,
-        seed=seed,
-        initial_state=initial_totals,
-        samples=samples,
-        summary=summary,
-        producer_summary=producer_summary,
-        water_summary=water_summary,
-        capacity_summary=capacity_tracker.snapshot(),
-    )
+def _totals_dict(st: GridState) -> Dict[str, float | Dict[str, float]]:
+    producer_totals = st.producer_totals()
+    return {
+        "day": float(st.day),
+        "biomass": float(sum(producer_totals.values())),
+        "rabbits": float(st.total_rabbits()),
+        "foxes": float(st.total_foxes()),
+        "producers": {name: float(producer_totals.get(name, 0)) for name in PRODUCER_SPECIES},
+    }
+
+
+def _water_snapshot(st: GridState) -> Dict[str, float]:
+    stats = st.water_stats()
+    return {
+        "mean": float(stats["mean"]),
+        "min": float(stats["min"]),
+        "max": float(stats["max"]),
+        "dry_cells": int(stats["dry_cells"]),
+    }
+
+
+def _init_summary(value: float) -> MetricSummary:
+    return MetricSummary(start=value, end=value, min=value, max=value)
+
+
+def _update_metric(metric: MetricSummary, value: float, day: int) -> None:
+    metric.min = min(metric.min, value)
+    metric.max = max(metric.max, value)
+    if value <= EXTINCTION_THRESHOLD:
+        metric.extinct_days += 1
+        if metric.first_extinction_day is None:
+            metric.first_extinction_day = day
 
 
 def _apply_noise(state: GridState, rng: random.Random) -> None:
@@ -390,18 +506,8 @@ def _extinction_warning(sample: Sample, summary: Dict[str, MetricSummary]) -> st
 
 
 def render_csv(result: ForecastResult, *, include_capacity: bool = False) -> str:
-    producer_headers = ",".join(f"producer_{name}" for name in PRODUCER_SPECIES)
-    base_header = "day,biomass,rabbits,foxes,water_mean,water_min,water_max,dry_cells"
-    header = f"{base_header},{producer_headers}" if producer_headers else base_header
-    lines = [header]
-    for sample in result.samples:
-        producer_values = ",".join(str(int(sample.producers.get(name, 0))) for name in PRODUCER_SPECIES)
-        producer_text = f",{producer_values}" if producer_values else ""
-        lines.append(
-            f"{sample.day},{sample.biomass:.0f},{sample.rabbits:.0f},{sample.foxes:.0f},"
-            f"{sample.water_mean:.3f},{sample.water_min:.3f},{sample.water_max:.3f},{sample.dry_cells}"
-            f"{producer_text}"
-        )
+    lines = [_csv_header()]
+    lines.extend(_csv_row(sample) for sample in result.samples)
     if include_capacity:
         block = telemetry.capacity_csv_block(result.capacity_summary)
         if block:
@@ -414,6 +520,66 @@ def render_json(result: ForecastResult) -> str:
     return json.dumps(result.as_dict(), indent=2)
 
 
+def stream_csv(
+    stream: ForecastStream, out: TextIO, *, include_capacity: bool = False, header: bool = True
+) -> ForecastResult:
+    """Write CSV rows as samples arrive, then a summary block (and capacity block when requested).
+
+    Pass `header=False` when continuing output for a resumed stream.
+    """
+    if header:
+        out.write(_csv_header() + "\n")
+    for sample in stream:
+        out.write(_csv_row(sample) + "\n")
+    result = stream.result()
+    out.write("\n" + "\n".join(summary_csv_block(result)) + "\n")
+    if include_capacity:
+        block = telemetry.capacity_csv_block(result.capacity_summary)
+        if block:
+            out.write("\n" + "\n".join(block) + "\n")
+    return result
+
+
+def stream_jsonl(stream: ForecastStream, out: TextIO) -> ForecastResult:
+    """Write one JSON object per sample (`"type": "sample"`) followed by a final `"type": "summary"` line."""
+    for sample in stream:
+        out.write(json.dumps({"type": "sample", **sample.as_dict()}) + "\n")
+    result = stream.result()
+    summary = result.as_dict()
+    summary.pop("samples")
+    out.write(json.dumps({"type": "summary", **summary}) + "\n")
+    return result
+
+
+def summary_csv_block(result: ForecastResult) -> List[str]:
+    lines = ["metric,start,end,min,max,extinct_days,first_extinction_day"]
+    metrics = [(species, result.summary[species]) for species in SPECIES]
+    metrics.extend((f"producer_{name}", result.producer_summary[name]) for name in PRODUCER_SPECIES)
+    for label, metric in metrics:
+        first_day = "" if metric.first_extinction_day is None else str(metric.first_extinction_day)
+        lines.append(
+            f"{label},{metric.start:.0f},{metric.end:.0f},{metric.min:.0f},{metric.max:.0f},"
+            f"{metric.extinct_days},{first_day}"
+        )
+    return lines
+
+
+def _csv_header() -> str:
+    producer_headers = ",".join(f"producer_{name}" for name in PRODUCER_SPECIES)
+    base_header = "day,biomass,rabbits,foxes,water_mean,water_min,water_max,dry_cells"
+    return f"{base_header},{producer_headers}" if producer_headers else base_header
+
+
+def _csv_row(sample: Sample) -> str:
+    producer_values = ",".join(str(int(sample.producers.get(name, 0))) for name in PRODUCER_SPECIES)
+    producer_text = f",{producer_values}" if producer_values else ""
+    return (
+        f"{sample.day},{sample.biomass:.0f},{sample.rabbits:.0f},{sample.foxes:.0f},"
+        f"{sample.water_mean:.3f},{sample.water_min:.3f},{sample.water_max:.3f},{sample.dry_cells}"
+        f"{producer_text}"
+    )
+
+
 def _format_producer_totals(snapshot: Dict[str, float]) -> str:
     return " ".join(
         f"{PRODUCER_PROFILES[name].emoji}{snapshot.get(name, 0):.0f}" for name in PRODUCER_SPECIES
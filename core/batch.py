@@ -0,0 +1,246 @@
+"""Advance worlds: the shared tick-and-save body (`advance_world`) and batch jobs across a process pool."""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+import core.checkpoint as checkpoint
+import core.repository as repository
+import core.scheduler as scheduler
+import core.telemetry as telemetry
+import core.visualization as visualization
+from core import persistence
+from core.model import GridState
+from core.rng import RngContext
+from migrations import runner
+
+if TYPE_CHECKING:
+    from core.tiling import TiledExecutor
+
+
+@dataclass
+class WorldTickResult:
+    world: str
+    start_day: int | None = None
+    end_day: int | None = None
+    seconds: float = 0.0
+    summary: str = ""
+    capacity: Dict[str, object] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "world": self.world,
+            "start_day": self.start_day,
+            "end_day": self.end_day,
+            "seconds": round(self.seconds, 4),
+            "summary": self.summary,
+            "capacity": self.capacity,
+            "error": self.error,
+        }
+
+
+def discover_worlds(worlds_dir: Path | None = None) -> List[str]:
+    """Names of the world directories that hold a state (`state.json`, `state.bin`, or `deltas/`)."""
+    root = Path(worlds_dir or repository.WORLDS_DIR)
+    if not root.is_dir():
+        return []
+    return sorted(
+        path.name
+        for path in root.iterdir()
+        if path.is_dir() and any((path / name).exists() for name in ("state.json", "state.bin", "deltas"))
+    )
+
+
+def advance_world(
+    world_name: str,
+    state: GridState,
+    count: int,
+    *,
+    tracker: telemetry.CapacityTracker,
+    done: int = 0,
+    start_day: int | None = None,
+    rng: RngContext | None = None,
+    tiles: "TiledExecutor | None" = None,
+    profiler: "telemetry.PhaseProfiler | None" = None,
+    log_capacity: bool = True,
+    checkpoint_every: int | None = None,
+    log: bool = False,
+    log_every_day: bool = False,
+    snapshot: bool = False,
+    update_readme: bool = False,
+    worlds_dir: Path | None = None,
+) -> GridState:
+    """Tick `state` until `count` days are done, then save it; the shared body of `sim.py tick` and `tick_world`.
+
+    `done` days were already ticked (a resumed checkpoint from `start_day`). Checkpoints, the final state,
+    snapshot/README, and history rows are written on background threads; this returns once they are on disk.
+    """
+    start_day = state.day if start_day is None else start_day
+    with persistence.PersistenceWriter() as writer:
+        checkpointer = None
+        if checkpoint_every is not None:
+            path = checkpoint.checkpoint_path(world_name, checkpoint.TICK, worlds_dir=worlds_dir)
+            checkpointer = checkpoint.Checkpointer(path, checkpoint_every, writer=writer)
+            checkpointer.start(state.day)
+        daily_history = None
+        if log_every_day and checkpointer is not None:
+            # Rows go out with each checkpoint (and at the end), never ahead of it, so a resume adds no duplicates.
+            daily_history = persistence.HistoryBuffer(
+                world_name, writer, artifact=persistence.STATE, batch_rows=None, worlds_dir=worlds_dir
+            )
+        elif log_every_day:
+            # Rows come from the incrementally tracked totals, so each day costs O(guilds), not a grid scan.
+            daily_history = persistence.HistoryBuffer(world_name, writer, worlds_dir=worlds_dir)
+        for done in range(done + 1, max(count, 0) + 1):
+            state = scheduler.tick_grid(
+                state, log_capacity=log_capacity, in_place=True, rng=rng, tiles=tiles, profiler=profiler
+            )
+            tracker.ingest(state.capacity_events)
+            if daily_history is not None:
+                daily_history.add(repository.history_row(state))
+            if checkpointer is not None and checkpointer.due(state.day):
+                if daily_history is not None:
+                    daily_history.flush()
+                payload = {
+                    "start_day": start_day,
+                    "count": count,
+                    "done": done,
+                    "state": state,
+                    "capacity_tracker": tracker,
+                }
+                checkpointer.save(checkpoint.TICK, state.day, payload)
+        if daily_history is not None:
+            daily_history.flush()
+        log_final = (log or log_every_day) and (daily_history is None or not daily_history.logged)
+        _persist(
+            world_name,
+            state,
+            writer,
+            checkpointer,
+            log=log_final,
+            snapshot=snapshot,
+            update_readme=update_readme,
+            worlds_dir=worlds_dir,
+        )
+    return state
+
+
+def _persist(
+    world_name: str,
+    state: GridState,
+    writer: persistence.PersistenceWriter,
+    checkpointer: checkpoint.Checkpointer | None,
+    *,
+    log: bool,
+    snapshot: bool,
+    update_readme: bool,
+    worlds_dir: Path | None,
+) -> None:
+    """Queue the state save (then checkpoint removal), snapshot/README, and history row; `state` is final."""
+
+    def save_state() -> None:
+        repository.save_world(world_name, state, worlds_dir=worlds_dir)
+        repository.record_delta(world_name, state, worlds_dir=worlds_dir)
+
+    def save_snapshot() -> None:
+        if snapshot:
+            text = visualization.generate_snapshot(state)
+            visualization.save_snapshot(world_name, text, worlds_dir=worlds_dir)
+        if update_readme:
+            visualization.update_readme(world_name, worlds_dir=worlds_dir)
+
+    writer.submit(persistence.STATE, save_state)
+    if checkpointer is not None:
+        # Queued behind the save on the same thread, so the checkpoint goes only once the state it protects is on disk.
+        checkpointer.clear()
+    if snapshot or update_readme:
+        writer.submit(persistence.SNAPSHOT, save_snapshot)
+    if log:
+        row = repository.history_row(state)
+        writer.submit(persistence.HISTORY, repository.append_history_rows, world_name, [row], worlds_dir=worlds_dir)
+
+
+def tick_world(
+    world_name: str,
+    count: int,
+    *,
+    log: bool = False,
+    snapshot: bool = False,
+    seed: int | None = None,
+    worlds_dir: Path | None = None,
+) -> WorldTickResult:
+    """Migrate, load, tick, and save one world under `worlds_dir`; failures are reported, not raised."""
+    result = WorldTickResult(world=world_name)
+    start = time.perf_counter()
+    try:
+        runner.run_pending(world_name, silent=True, worlds_dir=worlds_dir)
+        state = repository.load_world(world_name, worlds_dir=worlds_dir)
+        result.start_day = state.day
+        tracker = telemetry.CapacityTracker()
+        rng = RngContext(seed) if seed is not None else None
+        state = advance_world(
+            world_name,
+            state,
+            count,
+            tracker=tracker,
+            rng=rng,
+            log_capacity=False,
+            log=log,
+            snapshot=snapshot,
+            worlds_dir=worlds_dir,
+        )
+        result.end_day = state.day
+        result.summary = repository.format_summary(world_name, state)
+        result.capacity = tracker.snapshot()
+    except Exception as exc:  # one broken world must not sink the batch
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def tick_worlds(
+    worlds: Iterable[str],
+    count: int,
+    *,
+    workers: int | None = None,
+    log: bool = False,
+    snapshot: bool = False,
+    seed: int | None = None,
+    worlds_dir: Path | None = None,
+) -> List[WorldTickResult]:
+    """Tick every world `count` times, one world per task on a process pool; results keep the input order."""
+    names = list(worlds)
+    if not names:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(names)))
+    # Resolve the root here so pool workers never depend on module state in their own process.
+    root = Path(worlds_dir if worlds_dir is not None else repository.WORLDS_DIR)
+    options = {"log": log, "snapshot": snapshot, "seed": seed, "worlds_dir": root}
+    if workers == 1:
+        return [tick_world(name, count, **options) for name in names]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(tick_world, name, count, **options) for name in names]
+        return [future.result() for future in futures]
+
+
+def render_table(results: List[WorldTickResult]) -> str:
+    lines = [f"{'World':<16} {'days':>13} {'seconds':>9}  summary"]
+    for result in results:
+        if result.ok:
+            days = f"{result.start_day}->{result.end_day}"
+            lines.append(f"{result.world:<16} {days:>13} {result.seconds:>9.2f}  {result.summary}")
+        else:
+            lines.append(f"{result.world:<16} {'failed':>13} {result.seconds:>9.2f}  {result.error}")
+    total = sum(result.seconds for result in results)
+    failed = sum(1 for result in results if not result.ok)
+    lines.append(f"{len(results)} worlds, {failed} failed, {total:.2f}s of world time")
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+"""Compact binary world state (`state.bin`) backed by NumPy.
+
+Layout: 8-byte magic, little-endian uint32 header length, UTF-8 JSON header, then
+packed arrays aligned to 64 bytes. The header records scalar state (day, grid size,
+ids, migration version), lookup tables (producer order, limiting factors, entity
+types), and an offset/dtype/shape entry per array so readers can memory-map any
+array without parsing the rest of the file.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from core.agents.store import EntityStore
+from core.environment.arrays import GridArrays, LazyArrayCells
+from core.environment.producers import PRODUCER_TYPES
+from core.model import GridState
+
+MAGIC = b"PWSTATE1"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sI")
+GRID_ARRAYS = (
+    "producers",
+    "water",
+    "fertility",
+    "temperature",
+    "limiting_code",
+    "limiting_value",
+    "water_history",
+    "history_len",
+)
+ENTITY_ARRAYS = ("ids", "type_code", "x", "y", "hunger", "age", "health", "cooldown")
+
+
+def read_header(path: Path) -> dict:
+    """Parse only the JSON header (cheap even for multi-GB states)."""
+    with Path(path).open("rb") as fh:
+        magic, length = _PREFIX.unpack(fh.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Patient World binary state")
+        header = json.loads(fh.read(length).decode("utf-8"))
+    if int(header.get("format_version", 0)) > FORMAT_VERSION:
+        raise ValueError(f"{path} uses binary format v{header['format_version']}; upgrade Patient World to read it")
+    return header
+
+
+def write_state(path: Path, state: GridState, *, extra: Dict[str, object] | None = None) -> None:
+    """Write `state` to `path` atomically (temp file + rename, so live memory maps stay valid).
+
+    `extra` adds caller-defined keys to the header (read back with `read_header`).
+    """
+    path = Path(path)
+    arrays = state.arrays if state.arrays is not None else GridArrays.from_cells(state.cells)
+    payload: Dict[str, np.ndarray] = {name: getattr(arrays, name) for name in GRID_ARRAYS}
+    entity_columns, type_names = _entity_columns(state)
+    payload.update({f"entity_{name}": column for name, column in entity_columns.items()})
+    # Per-cell membership order drives grazing/predation order, so store it rather than rebuild it from x/y.
+    membership = _cell_entity_ids(state.cells)
+    payload["cell_entity_counts"] = np.fromiter((len(ids) for ids in membership), dtype=np.int32, count=len(membership))
+    payload["cell_entity_ids"] = np.fromiter(
+        (entity_id for ids in membership for entity_id in ids),
+        dtype=np.int64,
+        count=int(payload["cell_entity_counts"].sum()),
+    )
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "day": int(state.day),
+        "grid_width": int(state.grid_width),
+        "grid_height": int(state.grid_height),
+        "next_entity_id": int(state.next_entity_id),
+        "_migration_version": int(state.migration_version),
+        "producer_types": list(PRODUCER_TYPES),
+        "history_window": int(arrays.history_window),
+        "factor_names": list(arrays.factor_names),
+        "entity_types": type_names,
+        **(extra or {}),
+        "arrays": {},
+    }
+    # Offsets depend on the header size, so lay out twice: once to size the header, once for real.
+    offset = 0
+    for _ in range(2):
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        offset = _align(_PREFIX.size + len(header_bytes))
+        table = {}
+        for name, array in payload.items():
+            table[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset = _align(offset + array.nbytes)
+        header["arrays"] = table
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    # A unique name per write, as in `repository.atomic_write`.
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with tmp_path.open("wb") as fh:
+            fh.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+            fh.write(header_bytes)
+            for name, array in payload.items():
+                fh.seek(header["arrays"][name]["offset"])
+                fh.write(np.ascontiguousarray(array).tobytes())
+            fh.truncate(offset)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def read_state(path: Path, *, mmap: bool = False) -> GridState:
+    """Load a binary state into array storage; `mmap=True` maps arrays copy-on-write instead of reading them."""
+    path = Path(path)
+    header = read_header(path)
+    if list(header.get("producer_types", [])) != list(PRODUCER_TYPES):
+        raise ValueError(f"{path} was written with a different producer guild list; re-save it as JSON to migrate")
+    loaded = {name: _load_array(path, spec, mmap) for name, spec in header["arrays"].items()}
+
+    arrays = GridArrays.__new__(GridArrays)
+    arrays.cell_count = int(header["grid_width"]) * int(header["grid_height"])
+    arrays.history_window = int(header["history_window"])
+    arrays.factor_names = list(header["factor_names"])
+    arrays.ledger = None
+    for name in GRID_ARRAYS:
+        setattr(arrays, name, loaded[name])
+
+    store = EntityStore.__new__(EntityStore)
+    for name in ENTITY_ARRAYS:
+        setattr(store, name, np.array(loaded[f"entity_{name}"]))
+    store.type_names = list(header["entity_types"])
+    store.size = len(store.ids)
+    store.free = []
+    store.slot_of = {entity_id: slot for slot, entity_id in enumerate(store.ids.tolist())}
+    store.type_counts = Counter(store.type_names[code] for code in store.type_code.tolist())
+
+    # Views and their entity index are built per row on first access; totals come from the arrays.
+    members = loaded["cell_entity_ids"].tolist()
+    bounds = np.concatenate(([0], np.cumsum(loaded["cell_entity_counts"]))).tolist()
+    cells = LazyArrayCells(arrays, members, bounds)
+
+    return GridState(
+        day=int(header["day"]),
+        grid_width=int(header["grid_width"]),
+        grid_height=int(header["grid_height"]),
+        cells=cells,
+        entities=store,
+        next_entity_id=int(header["next_entity_id"]),
+        migration_version=int(header.get("_migration_version", 0)),
+        arrays=arrays,
+    )
+
+
+def _cell_entity_ids(cells: List) -> List[List[int]]:
+    if isinstance(cells, LazyArrayCells):
+        # Saving a freshly loaded grid should not build a view for every row.
+        return [cells.row_entity_ids(index) for index in range(len(cells))]
+    return [cell.entity_ids for cell in cells]
+
+
+def _entity_columns(state: GridState) -> tuple[Dict[str, np.ndarray], List[str]]:
+    entities = state.entities
+    if isinstance(entities, EntityStore):
+        slots = entities.active_slots()
+        return {name: getattr(entities, name)[slots] for name in ENTITY_ARRAYS}, list(entities.type_names)
+    store = EntityStore.from_entities(entities.values())
+    return {name: getattr(store, name)[: store.size] for name in ENTITY_ARRAYS}, list(store.type_names)
+
+
+def _load_array(path: Path, spec: dict, mmap: bool) -> np.ndarray:
+    dtype = np.dtype(spec["dtype"])
+    shape = tuple(int(dim) for dim in spec["shape"])
+    count = int(np.prod(shape)) if shape else 1
+    if mmap and count:
+        # Plain ndarray view of the mapping: same pages, without np.memmap's per-operation subclass overhead.
+        return np.memmap(path, dtype=dtype, mode="c", offset=int(spec["offset"]), shape=shape).view(np.ndarray)
+    with path.open("rb") as fh:
+        fh.seek(int(spec["offset"]))
+        return np.fromfile(fh, dtype=dtype, count=count).reshape(shape)
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
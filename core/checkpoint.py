@@ -0,0 +1,123 @@
+"""Periodic checkpoints so long tick batches and forecasts can resume after a crash.
+
+A checkpoint is a pickle of everything a run needs to continue (grid state, trackers, running
+summaries) plus the module-level `random` state, which unseeded runs draw their per-tick seeds
+from. Restoring both makes a resumed run bit-identical to one that was never interrupted.
+Files are written to a temporary name and renamed, so a crash mid-write keeps the previous one.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, TextIO, Tuple
+
+import core.repository as repository
+from core.persistence import STATE
+
+if TYPE_CHECKING:
+    from core.persistence import PersistenceWriter
+
+CHECKPOINT_VERSION = 1
+TICK = "tick"
+FORECAST = "forecast"
+
+
+def checkpoint_path(world_name: str, kind: str, *, worlds_dir: Path | None = None) -> Path:
+    return repository.get_paths(world_name, worlds_dir).directory / "checkpoints" / f"{kind}.ckpt"
+
+
+@dataclass
+class Checkpointer:
+    """Save a payload whenever at least `every` days have passed since the last save.
+
+    `outputs` are flushed before each save so rows a streaming consumer already wrote are on disk
+    before the checkpoint that skips them. With a `writer`, the payload is pickled right away (so the
+    caller may keep mutating it) and written on the writer's `state` thread.
+    """
+
+    path: Path
+    every: int
+    outputs: Tuple[TextIO, ...] = ()
+    writer: PersistenceWriter | None = None
+    last_day: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        if self.every <= 0:
+            raise ValueError("--checkpoint-every must be positive")
+
+    def start(self, day: int) -> None:
+        """Count the interval from `day` (the run's first or resumed day)."""
+        self.last_day = day
+
+    def due(self, day: int) -> bool:
+        return day - self.last_day >= self.every
+
+    def save(self, kind: str, day: int, payload: Dict[str, object]) -> None:
+        for out in self.outputs:
+            out.flush()
+        record = {
+            "version": CHECKPOINT_VERSION,
+            "kind": kind,
+            "day": day,
+            "random_state": random.getstate(),
+            "payload": payload,
+        }
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.writer is not None:
+            self.writer.submit(STATE, self._write, data)
+        else:
+            self._write(data)
+        self.last_day = day
+
+    def _write(self, data: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint (after any queued checkpoint writes when using a writer)."""
+        if self.writer is not None:
+            self.writer.submit(STATE, self.path.unlink, missing_ok=True)
+        else:
+            self.path.unlink(missing_ok=True)
+
+
+class CheckpointedOutput:
+    """Text output that holds written rows until `flush()`; pass it as a `Checkpointer` output.
+
+    Rows reach `target` only when a checkpoint is saved (or the caller flushes at the end), so an
+    interrupted run never leaves rows past its last checkpoint for a resumed run to repeat.
+    """
+
+    def __init__(self, target: TextIO) -> None:
+        self.target = target
+        self.pending: List[str] = []
+
+    def write(self, text: str) -> int:
+        self.pending.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        if self.pending:
+            self.target.write("".join(self.pending))
+            self.pending.clear()
+        self.target.flush()
+
+
+def load(path: Path, kind: str) -> Dict[str, object]:
+    """Read a checkpoint written by `Checkpointer.save`, restore the `random` state, and return its payload."""
+    if not path.exists():
+        raise FileNotFoundError(f"No {kind} checkpoint at {path}")
+    with path.open("rb") as fh:
+        record = pickle.load(fh)
+    if record.get("version") != CHECKPOINT_VERSION or record.get("kind") != kind:
+        raise ValueError(f"{path} is not a v{CHECKPOINT_VERSION} {kind} checkpoint")
+    random.setstate(record["random_state"])
+    return record["payload"]
@@ -0,0 +1,309 @@
+"""Long-running simulation server that keeps worlds resident in memory (`sim.py serve`).
+
+Clients connect to a Unix socket (default `worlds/sim.sock`) or to a localhost TCP port. They send one
+JSON object per line and get one JSON object per line back:
+
+    {"command": "totals", "world": "prod"}
+    -> {"ok": true, "result": {"world": "prod", "day": 412, "biomass": ..., "water": {...}, ...}}
+
+Commands:
+
+- `totals {world}`: cached totals of the resident state; refreshed after every tick, never waits on one.
+- `tick {world, count=1, seed=None, log=False, snapshot=False}`: advance in memory. The state is written
+  back by the periodic flush, not per tick. `log`/`snapshot` append history and write snapshot.md now.
+- `forecast {world, days=365, step=30, seed=None}`: read-only projection of the resident state (`ForecastResult`).
+- `snapshot {world, save=False}`: emoji snapshot text; `save=true` also writes snapshot.md.
+- `flush {world=None}`: save dirty worlds now. `worlds`: resident worlds. `shutdown`: flush and stop.
+
+Worlds load on first use (running pending migrations). Each world has an asyncio lock, so requests for
+one world run in order while other worlds stay available. Ticks, forecasts, and saves run in worker
+threads so the event loop keeps answering `totals`. Dirty worlds are saved through
+`repository.save_world` (plus `record_delta`) every `flush_interval` seconds and on shutdown. The server
+owns the worlds it has loaded: a `sim.py tick` run against the same world meanwhile will be overwritten.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import signal
+import socket
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import core.analysis as analysis
+import core.repository as repository
+import core.scheduler as scheduler
+import core.visualization as visualization
+from core.environment.producers import PRODUCER_TYPES
+from core.model import GridState
+from core.rng import RngContext
+from migrations import runner
+
+DEFAULT_FLUSH_INTERVAL = 30.0
+DEFAULT_HOST = "127.0.0.1"
+COMMANDS = ("totals", "tick", "forecast", "snapshot", "flush", "worlds", "shutdown")
+
+
+def default_socket_path() -> Path:
+    return Path(repository.WORLDS_DIR) / "sim.sock"
+
+
+def state_totals(world_name: str, state: GridState) -> Dict[str, object]:
+    producers = state.producer_totals()
+    water = state.water_stats()
+    return {
+        "world": world_name,
+        "day": state.day,
+        "biomass": round(sum(producers.values())),
+        "rabbits": round(state.total_rabbits()),
+        "foxes": round(state.total_foxes()),
+        "producers": {name: round(producers.get(name, 0)) for name in PRODUCER_TYPES},
+        "water": {
+            "mean": round(float(water["mean"]), 4),
+            "min": round(float(water["min"]), 4),
+            "max": round(float(water["max"]), 4),
+            "dry_cells": int(water["dry_cells"]),
+        },
+        "summary": repository.format_summary(world_name, state),
+    }
+
+
+@dataclass
+class ResidentWorld:
+    state: GridState
+    totals: Dict[str, object]
+    dirty: bool = False
+    saved_day: int = 0
+
+
+class RequestError(Exception):
+    """A bad request; reported to the client as `{"ok": false, "error": ...}`."""
+
+
+@dataclass
+class SimulationDaemon:
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    worlds: Dict[str, ResidentWorld] = field(default_factory=dict)
+    _locks: Dict[str, asyncio.Lock] = field(default_factory=dict, init=False)
+    _stopping: asyncio.Event | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        if self.flush_interval <= 0:
+            raise ValueError("--flush-interval must be positive")
+
+    def _lock(self, world_name: str) -> asyncio.Lock:
+        lock = self._locks.get(world_name)
+        if lock is None:
+            lock = self._locks[world_name] = asyncio.Lock()
+        return lock
+
+    async def _in_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _resident(self, world_name: str) -> ResidentWorld:
+        """The loaded world; call with the world's lock held."""
+        resident = self.worlds.get(world_name)
+        if resident is None:
+            resident = await self._in_thread(_load, world_name)
+            self.worlds[world_name] = resident
+        return resident
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = request.get("command")
+        if command not in COMMANDS:
+            raise RequestError(f"Unknown command {command!r}. Choose from: {', '.join(COMMANDS)}")
+        if command == "worlds":
+            return {
+                name: {"day": resident.state.day, "dirty": resident.dirty, "saved_day": resident.saved_day}
+                for name, resident in sorted(self.worlds.items())
+            }
+        if command == "flush":
+            names = [_world(request)] if request.get("world") else list(self.worlds)
+            return {"saved": await self.flush(names)}
+        if command == "shutdown":
+            if self._stopping is not None:
+                self._stopping.set()
+            return {"stopping": True}
+
+        world_name = _world(request)
+        if command == "totals":
+            resident = self.worlds.get(world_name)
+            if resident is not None:
+                return resident.totals
+        async with self._lock(world_name):
+            resident = await self._resident(world_name)
+            if command == "totals":
+                return resident.totals
+            if command == "tick":
+                count = _int(request, "count", 1)
+                seed = _seed(request)
+                rng = RngContext(seed) if seed is not None else None
+                await self._in_thread(
+                    _tick, world_name, resident, count, rng, bool(request.get("log")), bool(request.get("snapshot"))
+                )
+                return resident.totals
+            if command == "forecast":
+                options = {
+                    "world_name": world_name,
+                    "days": _int(request, "days", 365),
+                    "step": max(1, _int(request, "step", 30)),
+                    "seed": _seed(request),
+                    "copy_state": False,
+                }
+                state = resident.state.clone()
+                result = await self._in_thread(lambda: analysis.run(state, **options))
+                return result.as_dict()
+            text = await self._in_thread(visualization.generate_snapshot, resident.state)
+            if request.get("save"):
+                await self._in_thread(visualization.save_snapshot, world_name, text)
+            return {"world": world_name, "day": resident.state.day, "snapshot": text}
+
+    async def flush(self, names: List[str] | None = None) -> List[str]:
+        """Save every dirty world in `names` (default: all resident worlds); returns the saved names."""
+        saved = []
+        for name in names if names is not None else list(self.worlds):
+            if name not in self.worlds:
+                continue
+            async with self._lock(name):
+                resident = self.worlds[name]
+                if resident.dirty:
+                    await self._in_thread(_save, name, resident)
+                    saved.append(name)
+        return saved
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise RequestError("Requests are JSON objects")
+                    response = {"ok": True, "result": await self.handle(request)}
+                except (RequestError, json.JSONDecodeError) as exc:
+                    response = {"ok": False, "error": str(exc)}
+                except SystemExit as exc:  # migrations report missing state files this way
+                    response = {"ok": False, "error": str(exc.code)}
+                except Exception as exc:  # one failing request must not take the server down
+                    response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        *,
+        socket_path: Path | None = None,
+        host: str = DEFAULT_HOST,
+        port: int | None = None,
+        ready: Callable[[str], None] | None = None,
+    ) -> None:
+        """Serve until SIGINT/SIGTERM or a `shutdown` request, then flush dirty worlds."""
+        self._stopping = asyncio.Event()
+        if port is not None:
+            server = await asyncio.start_server(self._serve_client, host, port)
+            address = f"{host}:{server.sockets[0].getsockname()[1]}"
+        else:
+            path = Path(socket_path or default_socket_path())
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.unlink(missing_ok=True)
+            server = await asyncio.start_unix_server(self._serve_client, path)
+            address = str(path)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self._stopping.set)
+        flusher = asyncio.create_task(self._flush_periodically())
+        if ready is not None:
+            ready(address)
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            flusher.cancel()
+            server.close()
+            await self.flush()
+            if port is None:
+                path.unlink(missing_ok=True)
+
+
+def _world(request: Dict[str, Any]) -> str:
+    world_name = request.get("world")
+    if not isinstance(world_name, str) or not world_name or "/" in world_name or world_name.startswith("."):
+        raise RequestError("Missing or invalid 'world'")
+    return world_name
+
+
+def _int(request: Dict[str, Any], key: str, default: int) -> int:
+    value = request.get(key, default)
+    if not isinstance(value, int) or value < 0:
+        raise RequestError(f"'{key}' must be a non-negative integer")
+    return value
+
+
+def _seed(request: Dict[str, Any]) -> int | None:
+    seed = request.get("seed")
+    if seed is not None and not isinstance(seed, int):
+        raise RequestError("'seed' must be an integer")
+    return seed
+
+
+def _load(world_name: str) -> ResidentWorld:
+    runner.run_pending(world_name, silent=True)
+    state = repository.load_world(world_name)
+    return ResidentWorld(state=state, totals=state_totals(world_name, state), saved_day=state.day)
+
+
+def _tick(
+    world_name: str, resident: ResidentWorld, count: int, rng: RngContext | None, log: bool, snapshot: bool
+) -> None:
+    state = resident.state
+    for _ in range(count):
+        state = scheduler.tick_grid(state, log_capacity=False, in_place=True, rng=rng)
+    resident.state = state
+    resident.dirty = resident.dirty or count > 0
+    resident.totals = state_totals(world_name, state)
+    if log:
+        repository.log_history(world_name, state)
+    if snapshot:
+        visualization.save_snapshot(world_name, visualization.generate_snapshot(state))
+
+
+def _save(world_name: str, resident: ResidentWorld) -> None:
+    repository.save_world(world_name, resident.state)
+    repository.record_delta(world_name, resident.state)
+    resident.dirty = False
+    resident.saved_day = resident.state.day
+
+
+def request(
+    payload: Dict[str, Any],
+    *,
+    socket_path: Path | None = None,
+    host: str = DEFAULT_HOST,
+    port: int | None = None,
+    timeout: float | None = None,
+) -> Dict[str, Any]:
+    """Send one request to a running server and return its `result` (raises RuntimeError on `ok: false`)."""
+    if port is not None:
+        conn = socket.create_connection((host, port), timeout=timeout)
+    else:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(timeout)
+        conn.connect(str(socket_path or default_socket_path()))
+    with conn, conn.makefile("rwb") as stream:
+        stream.write(json.dumps(payload).encode("utf-8") + b"\n")
+        stream.flush()
+        response = json.loads(stream.readline())
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "request failed"))
+    return response["result"]
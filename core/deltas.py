@@ -0,0 +1,206 @@
+"""Delta-encoded state snapshots (`worlds/<name>/deltas/`).
+
+A world that opts in keeps one gzip-compressed full state (`base-DDDDDD.json.gz`) plus, for every
+later recorded day, a compressed diff against the previous recorded day (`delta-DDDDDD.json.gz`):
+
+- `header`: top-level fields that changed (`day`, `next_entity_id`, ...).
+- `cells`: per cell index, only the fields that changed; `producers` only lists changed guilds, or is
+  `{"replace": map}` when the set of guilds changed (so dropped guilds are dropped on replay too).
+- `entities`: `added` (full records), `removed` (ids), `changed` (only the fields that changed, so a
+  move is just `x`/`y`), and `order` when the id order is not "survivors, then additions".
+
+Any recorded day is rebuilt from the nearest base at or before it by applying the deltas in order.
+A new base is written every `rebase_every` deltas (or when the grid is resized) so that replay
+stays short. Files are gzipped with a fixed mtime, so identical states produce identical bytes.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from core.model import GridState
+
+DEFAULT_REBASE_EVERY = 100
+_FILE_PATTERN = re.compile(r"^(base|delta)-(\d{6,})\.json\.gz$")
+_STRUCTURAL_FIELDS = ("grid_width", "grid_height")
+
+
+def normalize(data: dict) -> dict:
+    """State dict in its JSON form (string entity ids), the shape every reconstruction returns."""
+    return json.loads(json.dumps(data))
+
+
+def diff_states(old: dict, new: dict) -> dict:
+    """Delta that turns normalized state `old` into normalized state `new` (same grid dimensions)."""
+    header = {
+        key: value for key, value in new.items() if key not in ("cells", "entities") and old.get(key) != value
+    }
+    cells: Dict[str, dict] = {}
+    for index, (before, after) in enumerate(zip(old["cells"], new["cells"])):
+        if before == after:
+            continue
+        if before.keys() != after.keys():
+            cells[str(index)] = {"replace": after}
+            continue
+        change = {}
+        for field, value in after.items():
+            previous = before[field]
+            if value == previous:
+                continue
+            if field == "producers":
+                if previous.keys() == value.keys():
+                    value = {name: amount for name, amount in value.items() if previous[name] != amount}
+                else:
+                    value = {"replace": value}
+            change[field] = value
+        cells[str(index)] = change
+
+    old_entities: dict = old["entities"]
+    new_entities: dict = new["entities"]
+    added = {eid: record for eid, record in new_entities.items() if eid not in old_entities}
+    removed = [eid for eid in old_entities if eid not in new_entities]
+    changed = {}
+    for eid, record in new_entities.items():
+        previous = old_entities.get(eid)
+        if previous is None or previous == record:
+            continue
+        changed[eid] = {field: value for field, value in record.items() if previous.get(field) != value}
+    entities: Dict[str, object] = {}
+    if added:
+        entities["added"] = added
+    if removed:
+        entities["removed"] = removed
+    if changed:
+        entities["changed"] = changed
+    order = list(new_entities)
+    if order != [eid for eid in old_entities if eid in new_entities] + list(added):
+        entities["order"] = order
+    return {"header": header, "cells": cells, "entities": entities}
+
+
+def apply_delta(state: dict, delta: dict) -> dict:
+    """Apply `delta` to normalized `state` in place and return it."""
+    state.update(delta.get("header", {}))
+    cells: List[dict] = state["cells"]
+    for key, change in delta.get("cells", {}).items():
+        cell = cells[int(key)]
+        if "replace" in change:
+            cells[int(key)] = change["replace"]
+            continue
+        for field, value in change.items():
+            if field != "producers":
+                cell[field] = value
+            elif "replace" in value:
+                cell["producers"] = value["replace"]
+            elif cell["producers"].keys() >= value.keys():
+                cell["producers"].update(value)
+            else:
+                # Deltas written before the "replace" marker carried new guild sets as plain maps.
+                cell["producers"] = value
+    entity_delta = delta.get("entities", {})
+    entities: dict = state["entities"]
+    for eid in entity_delta.get("removed", ()):
+        del entities[eid]
+    for eid, change in entity_delta.get("changed", {}).items():
+        entities[eid].update(change)
+    entities.update(entity_delta.get("added", {}))
+    if "order" in entity_delta:
+        state["entities"] = {eid: entities[eid] for eid in entity_delta["order"]}
+    return state
+
+
+class DeltaStore:
+    """Base snapshots plus per-day diffs for one world; see the module docstring for the layout."""
+
+    def __init__(self, directory: Path, *, rebase_every: int = DEFAULT_REBASE_EVERY) -> None:
+        if rebase_every <= 0:
+            raise ValueError("rebase_every must be positive")
+        self.directory = Path(directory)
+        self.rebase_every = rebase_every
+
+    def exists(self) -> bool:
+        return self.directory.is_dir() and any(kind == "base" for kind, _ in self.entries())
+
+    def entries(self) -> List[Tuple[str, int]]:
+        """`(kind, day)` for every stored file, in day order."""
+        if not self.directory.is_dir():
+            return []
+        found = []
+        for path in self.directory.iterdir():
+            match = _FILE_PATTERN.match(path.name)
+            if match:
+                found.append((match.group(1), int(match.group(2))))
+        return sorted(found, key=lambda entry: (entry[1], entry[0] != "base"))
+
+    def days(self) -> List[int]:
+        return sorted({day for _, day in self.entries()})
+
+    def _path(self, kind: str, day: int) -> Path:
+        return self.directory / f"{kind}-{day:06d}.json.gz"
+
+    def _write(self, kind: str, day: int, payload: dict) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(kind, day)
+        # A unique name per write, as in `repository.atomic_write`.
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        try:
+            tmp_path.write_bytes(gzip.compress(raw, compresslevel=9, mtime=0))
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return path
+
+    def _read(self, kind: str, day: int) -> dict:
+        return json.loads(gzip.decompress(self._path(kind, day).read_bytes()))
+
+    def record(self, state: GridState) -> Path:
+        """Store `state` as a delta against the latest recorded day (or as a base); returns the written file."""
+        current = normalize(state.to_dict())
+        entries = self.entries()
+        if not entries:
+            return self._write("base", state.day, current)
+        last_day = entries[-1][1]
+        if state.day <= last_day:
+            raise ValueError(f"Day {state.day} is not after the last recorded day ({last_day})")
+        since_base = next(i for i, (kind, _) in enumerate(reversed(entries)) if kind == "base")
+        previous = self.reconstruct(last_day)
+        resized = any(previous[field] != current[field] for field in _STRUCTURAL_FIELDS)
+        if resized or since_base + 1 >= self.rebase_every:
+            return self._write("base", state.day, current)
+        return self._write("delta", state.day, diff_states(previous, current))
+
+    def reconstruct(self, day: int) -> dict:
+        """Normalized state dict for a recorded `day`."""
+        entries = [entry for entry in self.entries() if entry[1] <= day]
+        if not entries or entries[-1][1] != day:
+            raise KeyError(f"Day {day} was not recorded (recorded: {self._describe_days()})")
+        start = max(idx for idx, (kind, _) in enumerate(entries) if kind == "base")
+        state = self._read("base", entries[start][1])
+        for kind, entry_day in entries[start + 1 :]:
+            apply_delta(state, self._read(kind, entry_day))
+        return state
+
+    def truncate(self, day: int) -> int:
+        """Drop every recorded day after `day` (rewinding the world); returns how many files were removed."""
+        later = [(kind, entry_day) for kind, entry_day in self.entries() if entry_day > day]
+        for kind, entry_day in later:
+            self._path(kind, entry_day).unlink()
+        return len(later)
+
+    def load_state(self, day: int) -> GridState:
+        return GridState.from_dict(self.reconstruct(day))
+
+    def _describe_days(self) -> str:
+        days = self.days()
+        if not days:
+            return "none"
+        return f"{len(days)} days between {days[0]} and {days[-1]}"
+
+    def size_bytes(self) -> int:
+        return sum(self._path(kind, day).stat().st_size for kind, day in self.entries())
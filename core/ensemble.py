@@ -0,0 +1,247 @@
+"""Monte Carlo forecast ensembles run across a process pool."""
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import core.analysis as analysis
+from core.environment.producers import PRODUCER_PROFILES, PRODUCER_TYPES
+from core.model import GridState
+
+PERCENTILES = (5, 50, 95)
+POPULATION_METRICS = ("biomass", "rabbits", "foxes")
+# Water has no population to go extinct; its "extinction" is any cell drying out (<=0.2 water).
+WATER_METRIC = "water_mean"
+METRICS = POPULATION_METRICS + (WATER_METRIC,) + tuple(PRODUCER_TYPES)
+
+_WORKER_STATE: GridState | None = None
+
+
+@dataclass
+class MemberResult:
+    seed: int
+    days: List[int]
+    series: Dict[str, List[float]]
+    dry_cells: List[int]
+    first_extinction: Dict[str, int | None]
+
+
+@dataclass
+class MetricBand:
+    day: int
+    p5: float
+    p50: float
+    p95: float
+    extinct_fraction: float
+
+    def as_dict(self) -> Dict[str, float | int]:
+        return {
+            "day": self.day,
+            "p5": self.p5,
+            "p50": self.p50,
+            "p95": self.p95,
+            "extinct_fraction": self.extinct_fraction,
+        }
+
+
+@dataclass
+class EnsembleResult:
+    world: str
+    days: int
+    step: int
+    runs: int
+    base_seed: int
+    bands: Dict[str, List[MetricBand]]
+    extinction_probability: Dict[str, float]
+    median_extinction_day: Dict[str, float | None]
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "world": self.world,
+            "days": self.days,
+            "step": self.step,
+            "runs": self.runs,
+            "base_seed": self.base_seed,
+            "bands": {metric: [band.as_dict() for band in bands] for metric, bands in self.bands.items()},
+            "extinction_probability": dict(self.extinction_probability),
+            "median_extinction_day": dict(self.median_extinction_day),
+        }
+
+
+def run_ensemble(
+    state: GridState,
+    *,
+    world_name: str,
+    days: int,
+    step: int,
+    runs: int,
+    workers: int | None = None,
+    base_seed: int | None = None,
+) -> EnsembleResult:
+    """Run `runs` seeded forecasts (seeds base_seed..base_seed+runs-1) and aggregate percentile bands."""
+    if runs <= 0:
+        raise ValueError("--runs must be positive")
+    if days <= 0:
+        raise ValueError("--days must be positive")
+    if step <= 0:
+        raise ValueError("--step must be positive")
+    if base_seed is None:
+        base_seed = random.randrange(1 << 31)
+    seeds = [base_seed + offset for offset in range(runs)]
+    workers = max(1, min(workers or os.cpu_count() or 1, runs))
+
+    if workers == 1:
+        members = [_run_member(state.clone(), seed, world_name, days, step) for seed in seeds]
+    else:
+        # Pickle the start state once; each worker unpickles it once and clones it per run.
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(payload,)) as pool:
+            chunksize = max(1, runs // (workers * 4))
+            members = list(
+                pool.map(_run_worker_member, seeds, [world_name] * runs, [days] * runs, [step] * runs, chunksize=chunksize)
+            )
+    return _aggregate(members, world_name=world_name, days=days, step=step, base_seed=base_seed)
+
+
+def _init_worker(payload: bytes) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = pickle.loads(payload)
+
+
+def _run_worker_member(seed: int, world_name: str, days: int, step: int) -> MemberResult:
+    if _WORKER_STATE is None:
+        raise RuntimeError("Ensemble worker started without a shared state")
+    return _run_member(_WORKER_STATE.clone(), seed, world_name, days, step)
+
+
+def _run_member(state: GridState, seed: int, world_name: str, days: int, step: int) -> MemberResult:
+    result = analysis.run(state, world_name=world_name, days=days, step=step, seed=seed, copy_state=False)
+    series: Dict[str, List[float]] = {metric: [] for metric in METRICS}
+    for sample in result.samples:
+        series["biomass"].append(sample.biomass)
+        series["rabbits"].append(sample.rabbits)
+        series["foxes"].append(sample.foxes)
+        series[WATER_METRIC].append(sample.water_mean)
+        for name in PRODUCER_TYPES:
+            series[name].append(float(sample.producers.get(name, 0.0)))
+    first_extinction: Dict[str, int | None] = {
+        metric: result.summary[metric].first_extinction_day for metric in POPULATION_METRICS
+    }
+    for name in PRODUCER_TYPES:
+        first_extinction[name] = result.producer_summary[name].first_extinction_day
+    first_extinction[WATER_METRIC] = result.water_summary.first_dry_day
+    return MemberResult(
+        seed=seed,
+        days=[sample.day for sample in result.samples],
+        series=series,
+        dry_cells=[sample.dry_cells for sample in result.samples],
+        first_extinction=first_extinction,
+    )
+
+
+def _aggregate(
+    members: Sequence[MemberResult], *, world_name: str, days: int, step: int, base_seed: int
+) -> EnsembleResult:
+    sample_days = members[0].days
+    runs = len(members)
+    bands: Dict[str, List[MetricBand]] = {}
+    for metric in METRICS:
+        metric_bands = []
+        for idx, day in enumerate(sample_days):
+            values = sorted(member.series[metric][idx] for member in members)
+            if metric == WATER_METRIC:
+                extinct = sum(1 for member in members if member.dry_cells[idx] > 0)
+            else:
+                extinct = sum(1 for value in values if value <= analysis.EXTINCTION_THRESHOLD)
+            low, mid, high = (_percentile(values, pct) for pct in PERCENTILES)
+            metric_bands.append(MetricBand(day=day, p5=low, p50=mid, p95=high, extinct_fraction=extinct / runs))
+        bands[metric] = metric_bands
+
+    extinction_probability: Dict[str, float] = {}
+    median_extinction_day: Dict[str, float | None] = {}
+    for metric in METRICS:
+        hits = sorted(
+            member.first_extinction[metric] for member in members if member.first_extinction[metric] is not None
+        )
+        extinction_probability[metric] = len(hits) / runs
+        median_extinction_day[metric] = _percentile(hits, 50) if hits else None
+
+    return EnsembleResult(
+        world=world_name,
+        days=days,
+        step=step,
+        runs=runs,
+        base_seed=base_seed,
+        bands=bands,
+        extinction_probability=extinction_probability,
+        median_extinction_day=median_extinction_day,
+    )
+
+
+def _percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return float(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction)
+
+
+def _metric_label(metric: str) -> str:
+    if metric in PRODUCER_PROFILES:
+        return f"{PRODUCER_PROFILES[metric].emoji} {metric}"
+    if metric == WATER_METRIC:
+        return "water (dry cells)"
+    return metric
+
+
+def render_table(result: EnsembleResult) -> str:
+    lines: List[str] = [
+        f"Ensemble forecast for '{result.world}': {result.runs} runs x {result.days} days "
+        f"(seeds {result.base_seed}..{result.base_seed + result.runs - 1}, sampling every {result.step} days)",
+        "",
+    ]
+    header_bits: List[Tuple[str, str]] = [(metric, metric.capitalize()) for metric in POPULATION_METRICS]
+    header_bits.append((WATER_METRIC, "Water"))
+    lines.append("Day   " + "  ".join(f"{label + ' p5/p50/p95':>26}" for _, label in header_bits))
+    days = [band.day for band in result.bands["biomass"]]
+    for idx, day in enumerate(days):
+        cells = []
+        for metric, _ in header_bits:
+            band = result.bands[metric][idx]
+            if metric == WATER_METRIC:
+                cells.append(f"{band.p5:8.2f} {band.p50:8.2f} {band.p95:8.2f}")
+            else:
+                cells.append(f"{band.p5:8.0f} {band.p50:8.0f} {band.p95:8.0f}")
+        lines.append(f"{day:4d}  " + "  ".join(cells))
+
+    lines.append("")
+    lines.append("Extinction probability (any day in the window):")
+    for metric in METRICS:
+        probability = result.extinction_probability[metric]
+        median_day = result.median_extinction_day[metric]
+        day_text = f"  median day {median_day:.0f}" if median_day is not None else ""
+        lines.append(f"  {_metric_label(metric):<24} {probability * 100:5.1f}%{day_text}")
+    lines.append(f"\nRun again with --seed {result.base_seed} --runs {result.runs} for identical results.")
+    return "\n".join(lines)
+
+
+def render_csv(result: EnsembleResult) -> str:
+    rows = ["metric,day,p5,p50,p95,extinct_fraction"]
+    for metric in METRICS:
+        for band in result.bands[metric]:
+            rows.append(
+                f"{metric},{band.day},{band.p5:.4f},{band.p50:.4f},{band.p95:.4f},{band.extinct_fraction:.4f}"
+            )
+    return "\n".join(rows)
+
+
+def render_json(result: EnsembleResult) -> str:
+    return json.dumps(result.as_dict(), indent=2)
@@ -0,0 +1,360 @@
+"""Structure-of-arrays grid storage backed by NumPy.
+
+`GridArrays` keeps every per-cell field in dense arrays (one row per cell,
+row-major like `GridState.cells`) and `ArrayCell` exposes a single row through
+the regular `Cell` API so rules, analysis, and visualization keep working while
+vectorized paths operate on the arrays directly.
+"""
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from core.environment.cell import WATER_HISTORY_WINDOW, Cell, _clamp
+from core.environment.producers import CANOPY_LAYER, GROUND_LAYER, LAYER_MEMBERS, PRODUCER_TYPES
+
+if TYPE_CHECKING:
+    from core.model import GridState
+    from core.model.totals import GridTotals
+
+PRODUCER_INDEX: Dict[str, int] = {name: idx for idx, name in enumerate(PRODUCER_TYPES)}
+# Alphabetical so argmin over stacked factors reproduces the key tie-break in rules._detect_limiting_factor.
+LIMITING_FACTORS = ("facilitation", "fertility", "season", "temperature", "water")
+NO_LIMITING_FACTOR = -1
+
+
+class GridArrays:
+    """Dense `(cells x PRODUCER_TYPES)` producer matrix plus per-cell environment vectors."""
+
+    def __init__(self, cell_count: int, *, history_window: int = WATER_HISTORY_WINDOW) -> None:
+        self.cell_count = int(cell_count)
+        self.history_window = max(1, int(history_window))
+        self.producers = np.zeros((self.cell_count, len(PRODUCER_TYPES)), dtype=np.int32)
+        self.water = np.full(self.cell_count, 0.6, dtype=np.float64)
+        self.fertility = np.full(self.cell_count, 0.6, dtype=np.float64)
+        self.temperature = np.full(self.cell_count, 0.5, dtype=np.float64)
+        self.limiting_code = np.full(self.cell_count, NO_LIMITING_FACTOR, dtype=np.int16)
+        self.limiting_value = np.ones(self.cell_count, dtype=np.float64)
+        self.water_history = np.zeros((self.cell_count, self.history_window), dtype=np.float64)
+        self.history_len = np.zeros(self.cell_count, dtype=np.int16)
+        self.factor_names: List[str] = list(LIMITING_FACTORS)
+        self.ledger: "GridTotals | None" = None
+
+    @classmethod
+    def from_cells(cls, cells: Sequence[Cell]) -> "GridArrays":
+        arrays = cls(len(cells))
+        for index, cell in enumerate(cells):
+            arrays.store(index, cell)
+        return arrays
+
+    def store(self, index: int, cell: Cell) -> None:
+        """Copy a plain `Cell` into row `index`."""
+        row = self.producers[index]
+        for name, amount in cell.producers.items():
+            column = PRODUCER_INDEX.get(name)
+            if column is not None:
+                row[column] = max(0, int(amount))
+        self.water[index] = cell.water
+        self.fertility[index] = cell.fertility
+        self.temperature[index] = cell.temperature
+        self.set_history(index, cell.water_history)
+        self.limiting_code[index] = self.factor_code(cell.limiting_factor)
+        self.limiting_value[index] = cell.limiting_value
+
+    def copy(self) -> "GridArrays":
+        clone = GridArrays.__new__(GridArrays)
+        clone.cell_count = self.cell_count
+        clone.history_window = self.history_window
+        clone.producers = self.producers.copy()
+        clone.water = self.water.copy()
+        clone.fertility = self.fertility.copy()
+        clone.temperature = self.temperature.copy()
+        clone.limiting_code = self.limiting_code.copy()
+        clone.limiting_value = self.limiting_value.copy()
+        clone.water_history = self.water_history.copy()
+        clone.history_len = self.history_len.copy()
+        clone.factor_names = list(self.factor_names)
+        clone.ledger = None
+        return clone
+
+    def block(self, rows: slice | np.ndarray) -> "GridArrays":
+        """Standalone `GridArrays` over `rows` (a slice or index array), e.g. one tile for core.tiling.
+
+        Slices share producer/environment storage with this grid; the limiting-factor vectors are
+        always copied so kernels can write them without touching neighboring tiles.
+        """
+        block = GridArrays.__new__(GridArrays)
+        block.history_window = self.history_window
+        block.producers = self.producers[rows]
+        block.water = self.water[rows]
+        block.fertility = self.fertility[rows]
+        block.temperature = self.temperature[rows]
+        block.limiting_code = self.limiting_code[rows].copy()
+        block.limiting_value = self.limiting_value[rows].copy()
+        block.water_history = self.water_history[rows]
+        block.history_len = self.history_len[rows]
+        block.cell_count = len(block.water)
+        block.factor_names = list(self.factor_names)
+        block.ledger = None
+        return block
+
+    def views(self, cells: Sequence[Cell] | None = None) -> List["ArrayCell"]:
+        """Build one `ArrayCell` per row, optionally adopting entity membership from `cells`."""
+        views = [ArrayCell(self, index) for index in range(self.cell_count)]
+        if cells is not None:
+            for view, cell in zip(views, cells):
+                view.adopt_entities(cell)
+        return views
+
+    def factor_code(self, name: str | None) -> int:
+        if name is None:
+            return NO_LIMITING_FACTOR
+        try:
+            return self.factor_names.index(name)
+        except ValueError:
+            self.factor_names.append(str(name))
+            return len(self.factor_names) - 1
+
+    def factor_name(self, code: int) -> str | None:
+        if code < 0:
+            return None
+        return self.factor_names[code]
+
+    def history(self, index: int) -> List[float]:
+        return [float(value) for value in self.water_history[index, : self.history_len[index]]]
+
+    def set_history(self, index: int, values: Sequence[float]) -> None:
+        samples = list(values)[-self.history_window :]
+        self.water_history[index] = 0.0
+        self.water_history[index, : len(samples)] = samples
+        self.history_len[index] = len(samples)
+
+    def push_water_sample(self, index: int, value: float) -> None:
+        count = int(self.history_len[index])
+        if count < self.history_window:
+            self.water_history[index, count] = value
+            self.history_len[index] = count + 1
+            return
+        row = self.water_history[index]
+        row[:-1] = row[1:]
+        row[-1] = value
+
+    def water_average(self) -> np.ndarray:
+        """Vector of per-cell rolling water means (falls back to current water when empty)."""
+        counts = self.history_len.astype(np.float64)
+        # Accumulate column by column so results match Cell.water_average's left-to-right sum bit for bit.
+        sums = np.zeros(self.cell_count, dtype=np.float64)
+        for column in range(self.history_window):
+            sums += self.water_history[:, column]
+        return np.where(counts > 0, sums / np.maximum(counts, 1.0), self.water)
+
+
+class ProducerView(MutableMapping):
+    """Dict-like view of one producer row keyed by guild name."""
+
+    __slots__ = ("_row", "_ledger")
+
+    def __init__(self, row: np.ndarray, ledger: "GridTotals | None" = None) -> None:
+        self._row = row
+        self._ledger = ledger
+
+    def __getitem__(self, name: str) -> int:
+        return int(self._row[PRODUCER_INDEX[name]])
+
+    def __setitem__(self, name: str, value: int) -> None:
+        column = PRODUCER_INDEX[name]
+        if self._ledger is not None:
+            self._ledger.producer_changed(name, int(value) - int(self._row[column]))
+        self._row[column] = int(value)
+
+    def __delitem__(self, name: str) -> None:
+        raise TypeError("Producer guilds cannot be removed from array-backed cells")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PRODUCER_TYPES)
+
+    def __len__(self) -> int:
+        return len(PRODUCER_TYPES)
+
+    def __contains__(self, name: object) -> bool:
+        return name in PRODUCER_INDEX
+
+    def get(self, name: str, default: int | None = None) -> int | None:
+        column = PRODUCER_INDEX.get(name)
+        if column is None:
+            return default
+        return int(self._row[column])
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class ArrayCell(Cell):
+    """`Cell` whose producer and environment fields live in a shared `GridArrays` row."""
+
+    def __init__(self, arrays: GridArrays, index: int, entity_ids: Sequence[int] | None = None) -> None:
+        self._arrays = arrays
+        self._row = int(index)
+        self.entity_ids = [int(eid) for eid in entity_ids] if entity_ids else []
+        self._reset_entity_index()
+
+    @property
+    def producers(self) -> ProducerView:
+        return ProducerView(self._arrays.producers[self._row], self._arrays.ledger)
+
+    @producers.setter
+    def producers(self, mapping: Dict[str, int]) -> None:
+        view = self.producers
+        for name in PRODUCER_TYPES:
+            view[name] = 0
+        for name, amount in mapping.items():
+            if name in PRODUCER_INDEX:
+                view[name] = max(0, int(amount))
+
+    @property
+    def _totals(self) -> "GridTotals | None":
+        return self._arrays.ledger
+
+    def attach_totals(self, totals: "GridTotals | None") -> None:
+        self._arrays.ledger = totals
+
+    @property
+    def water(self) -> float:
+        return float(self._arrays.water[self._row])
+
+    @water.setter
+    def water(self, value: float) -> None:
+        self._arrays.water[self._row] = _clamp(float(value), 0.0, 1.0)
+
+    @property
+    def fertility(self) -> float:
+        return float(self._arrays.fertility[self._row])
+
+    @fertility.setter
+    def fertility(self, value: float) -> None:
+        self._arrays.fertility[self._row] = _clamp(float(value), 0.0, 1.0)
+
+    @property
+    def temperature(self) -> float:
+        return float(self._arrays.temperature[self._row])
+
+    @temperature.setter
+    def temperature(self, value: float) -> None:
+        self._arrays.temperature[self._row] = _clamp(float(value), 0.0, 1.0)
+
+    @property
+    def water_history(self) -> List[float]:
+        return self._arrays.history(self._row)
+
+    @water_history.setter
+    def water_history(self, values: Sequence[float]) -> None:
+        self._arrays.set_history(self._row, values)
+
+    @property
+    def limiting_factor(self) -> str | None:
+        return self._arrays.factor_name(int(self._arrays.limiting_code[self._row]))
+
+    @limiting_factor.setter
+    def limiting_factor(self, name: str | None) -> None:
+        self._arrays.limiting_code[self._row] = self._arrays.factor_code(name)
+
+    @property
+    def limiting_value(self) -> float:
+        return float(self._arrays.limiting_value[self._row])
+
+    @limiting_value.setter
+    def limiting_value(self, value: float) -> None:
+        self._arrays.limiting_value[self._row] = _clamp(float(value), 0.0, 1.0)
+
+    def water_average(self) -> float:
+        count = int(self._arrays.history_len[self._row])
+        if count <= 0:
+            return self.water
+        return float(sum(self._arrays.water_history[self._row, :count].tolist()) / count)
+
+    def _push_water_sample(self, value: float) -> None:
+        self._arrays.push_water_sample(self._row, value)
+
+    def ground_cover(self) -> int:
+        return int(self._arrays.producers[self._row, _GROUND_COLUMNS].sum())
+
+    def canopy_cover(self) -> int:
+        return int(self._arrays.producers[self._row, _CANOPY_COLUMNS].sum())
+
+    def total_producer_biomass(self) -> int:
+        return int(self._arrays.producers[self._row].sum())
+
+
+class LazyArrayCells(list):
+    """`ArrayCell` views built the first time each row is read, for grids loaded straight into arrays.
+
+    `members[bounds[i]:bounds[i + 1]]` lists row `i`'s entity ids in membership order. A view is tagged
+    with entity types from its grid (`bind`) when it is built; once every row has a view the grid gets a
+    plain list back so hot loops skip the lazy accessors. Iteration, slicing, and pickling go through
+    the building accessors, so callers see an ordinary list of cells.
+    """
+
+    def __init__(self, arrays: GridArrays, members: Sequence[int], bounds: Sequence[int]) -> None:
+        super().__init__([None] * arrays.cell_count)
+        self._arrays = arrays
+        self._members = members
+        self._bounds = bounds
+        self._grid: "GridState | None" = None
+        self._pending = arrays.cell_count
+
+    def bind(self, grid: "GridState") -> None:
+        """Attach the owning grid, whose `entities` tag new views and whose `cells` is swapped when complete."""
+        self._grid = grid
+
+    def row_entity_ids(self, index: int) -> Sequence[int]:
+        """Entity ids of row `index` without building its view."""
+        view = list.__getitem__(self, index)
+        if view is not None:
+            return view.entity_ids
+        return self._members[self._bounds[index] : self._bounds[index + 1]]
+
+    def _build(self, index: int) -> ArrayCell:
+        view = ArrayCell(self._arrays, index, self._members[self._bounds[index] : self._bounds[index + 1]])
+        list.__setitem__(self, index, view)
+        self._pending -= 1
+        grid = self._grid
+        if grid is not None:
+            view.index_entities(grid.entities)
+            if self._pending == 0 and grid.cells is self:
+                grid.cells = list.copy(self)
+        return view
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        view = list.__getitem__(self, index)
+        if view is None:
+            view = self._build(index if index >= 0 else index + len(self))
+        return view
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __reversed__(self):
+        for index in reversed(range(len(self))):
+            yield self[index]
+
+    def __contains__(self, item) -> bool:
+        return any(view is item or view == item for view in self)
+
+    def copy(self) -> List[ArrayCell]:
+        return list(self)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+LAYER_COLUMNS: Dict[str, np.ndarray] = {
+    layer: np.array([PRODUCER_INDEX[name] for name in members], dtype=np.intp)
+    for layer, members in LAYER_MEMBERS.items()
+}
+_GROUND_COLUMNS = LAYER_COLUMNS[GROUND_LAYER]
+_CANOPY_COLUMNS = LAYER_COLUMNS[CANOPY_LAYER]
@@ -4,7 +4,7 @@ from __future__ import annotations
 import os
 import random
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Sequence
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence
 
 from core.agents import Entity
 from core.environment.producers import (
@@ -12,6 +12,7 @@ from core.environment.producers import (
     GROUND_LAYER,
     LAYER_CAPS,
     LAYER_MEMBERS,
+    PRODUCER_TYPES,
     dominant_producer,
     empty_producer_map,
     normalize_producers,
@@ -19,6 +20,9 @@ from core.environment.producers import (
     total_producers,
 )
 
+if TYPE_CHECKING:
+    from core.model.totals import GridTotals
+
 _WATER_RANGE = (0.25, 0.95)
 _FERTILITY_RANGE = (0.25, 0.9)
 _TEMPERATURE_RANGE = (0.2, 0.85)
@@ -84,6 +88,84 @@ def generate_water_distribution(
     return flattened
 
 
+_ENVIRONMENT_FIELDS = ("water", "fertility", "temperature")
+
+
+def cells_are_canonical(cells_raw: Sequence[dict]) -> bool:
+    """True when every cell dict has the exact shape `Cell.to_dict` writes.
+
+    Checked once for the whole grid so `Cell.from_dict(..., validated=True)` can skip per-value coercion.
+    """
+    try:
+        if not all(tuple(data["producers"]) == PRODUCER_TYPES for data in cells_raw):
+            return False
+        amounts = [value for data in cells_raw for value in data["producers"].values()]
+        ids = [eid for data in cells_raw for eid in data["entity_ids"]]
+        fractions = [value for data in cells_raw for value in data["water_history"]]
+        fractions.extend(data[name] for data in cells_raw for name in _ENVIRONMENT_FIELDS)
+    except (KeyError, TypeError, AttributeError):
+        return False
+    return (
+        set(map(type, amounts)) <= {int}
+        and min(amounts, default=0) >= 0
+        and set(map(type, ids)) <= {int}
+        and set(map(type, fractions)) <= {float}
+        and min(fractions, default=0.0) >= 0.0
+        and max(fractions, default=1.0) <= 1.0
+    )
+
+
+class ProducerMap(dict):
+    """Producer dict that reports every change to the owning grid's `GridTotals` (when attached)."""
+
+    __slots__ = ("ledger",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.ledger: "GridTotals | None" = None
+
+    def __setitem__(self, name: str, value: int) -> None:
+        ledger = self.ledger
+        if ledger is not None:
+            ledger.producer_changed(name, value - self.get(name, 0))
+        super().__setitem__(name, value)
+
+    def __delitem__(self, name: str) -> None:
+        if self.ledger is not None:
+            self.ledger.producer_changed(name, -self.get(name, 0))
+        super().__delitem__(name)
+
+    def pop(self, name: str, *default):
+        if self.ledger is not None and name in self:
+            self.ledger.producer_changed(name, -self[name])
+        return super().pop(name, *default)
+
+    def popitem(self):
+        name, value = super().popitem()
+        if self.ledger is not None:
+            self.ledger.producer_changed(name, -value)
+        return name, value
+
+    def setdefault(self, name: str, default: int = 0) -> int:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs) -> None:
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def clear(self) -> None:
+        if self.ledger is not None:
+            for name, value in self.items():
+                self.ledger.producer_changed(name, -value)
+        super().clear()
+
+    def __reduce__(self):
+        # Rebuild through __init__ so unpickling does not replay items through __setitem__ before `ledger` exists.
+        return (ProducerMap, (dict(self),), (None, {"ledger": self.ledger}))
+
+
 @dataclass
 class Cell:
     """Single grid cell with vegetation strata, environment metrics, and entity references."""
@@ -118,6 +200,10 @@ class Cell:
             self.limiting_value = 1.0
         if self.limiting_factor is not None:
             self.limiting_factor = str(self.limiting_factor)
+        if not isinstance(self.producers, ProducerMap):
+            self.producers = ProducerMap(self.producers)
+        self._totals: "GridTotals | None" = None
+        self._reset_entity_index()
 
     @classmethod
     def with_uniform_producers(cls, *, fast_grass: int = 0, shrubs: int = 0) -> "Cell":
@@ -129,27 +215,41 @@ class Cell:
         return cell
 
     @classmethod
-    def from_dict(cls, data: dict, *, seed: int | None = None) -> "Cell":
-        ids = [int(eid) for eid in data.get("entity_ids", [])]
-        defaults = random_environment_profile(seed)
-        water = float(data.get("water", defaults[0]))
-        fertility = float(data.get("fertility", defaults[1]))
-        temperature = float(data.get("temperature", defaults[2]))
-        history_values: Sequence[float] | None = data.get("water_history")
-        history: List[float] = []
-        if history_values:
-            for value in history_values:
-                try:
-                    history.append(_clamp(float(value), 0.0, 1.0))
-                except (TypeError, ValueError):
-                    continue
-
-        producers_raw = data.get("producers")
-        if producers_raw is None:
-            producers = empty_producer_map()
-            producers["fast_grass"] = int(data.get("grass", 0))
+    def from_dict(cls, data: dict, *, seed: int | None = None, validated: bool = False) -> "Cell":
+        """Build a cell from `to_dict` output (or older partial dicts).
+
+        Missing environment fields fall back to `random_environment_profile(seed)`. Pass `validated=True` only for
+        cells that passed `cells_are_canonical`; they skip the per-value coercion and producer normalization.
+        """
+        if validated:
+            ids = list(data["entity_ids"])
+            water, fertility, temperature = data["water"], data["fertility"], data["temperature"]
+            history: List[float] = list(data["water_history"])
+            producers = data["producers"]
         else:
-            producers = normalize_producers({key: int(value) for key, value in producers_raw.items()})
+            ids = [int(eid) for eid in data.get("entity_ids", [])]
+            if all(name in data for name in _ENVIRONMENT_FIELDS):
+                defaults = (0.0, 0.0, 0.0)
+            else:
+                defaults = random_environment_profile(seed)
+            water = float(data.get("water", defaults[0]))
+            fertility = float(data.get("fertility", defaults[1]))
+            temperature = float(data.get("temperature", defaults[2]))
+            history_values: Sequence[float] | None = data.get("water_history")
+            history = []
+            if history_values:
+                for value in history_values:
+                    try:
+                        history.append(_clamp(float(value), 0.0, 1.0))
+                    except (TypeError, ValueError):
+                        continue
+
+            producers_raw = data.get("producers")
+            if producers_raw is None:
+                producers = empty_producer_map()
+                producers["fast_grass"] = int(data.get("grass", 0))
+            else:
+                producers = normalize_producers({key: int(value) for key, value in producers_raw.items()})
 
         limiting_factor = data.get("limiting_factor")
         limiting_value = data.get("limiting_value", 1.0)
@@ -184,9 +284,8 @@ class Cell:
         }
 
     def copy(self) -> "Cell":
-        return Cell(
+        clone = Cell(
             producers=dict(self.producers),
-            entity_ids=list(self.entity_ids),
             water=self.water,
             fertility=self.fertility,
             temperature=self.temperature,
@@ -194,6 +293,8 @@ class Cell:
             limiting_factor=self.limiting_factor,
             limiting_value=self.limiting_value,
         )
+        clone.adopt_entities(self)
+        return clone
 
     @property
     def grass(self) -> int:
@@ -206,15 +307,75 @@ class Cell:
         self.producers["fast_grass"] = max(0, int(value))
         self.clamp_layers()
 
-    def add_entity(self, entity_id: int) -> None:
-        if entity_id not in self.entity_ids:
-            self.entity_ids.append(entity_id)
+    def attach_totals(self, totals: "GridTotals | None") -> None:
+        """Route producer and water changes to a grid-level `GridTotals` ledger."""
+        self._totals = totals
+        self.producers.ledger = totals
+
+    def _reset_entity_index(self) -> None:
+        """Rebuild id slots from `entity_ids`; types stay unknown until `index_entities` runs."""
+        ids = list(dict.fromkeys(int(eid) for eid in self.entity_ids))
+        self.entity_ids = ids
+        self._slots: Dict[int, int] = {eid: slot for slot, eid in enumerate(ids)}
+        self._types: Dict[int, str | None] = dict.fromkeys(ids)
+        self._buckets: Dict[str, Dict[int, None]] = {}
+        self._untyped = len(ids)
+
+    def adopt_entities(self, other: "Cell") -> None:
+        """Copy entity membership (ids plus type buckets) from another cell."""
+        self.entity_ids = list(other.entity_ids)
+        self._slots = dict(other._slots)
+        self._types = dict(other._types)
+        self._buckets = {entity_type: dict(bucket) for entity_type, bucket in other._buckets.items()}
+        self._untyped = other._untyped
+
+    def index_entities(self, entities: Dict[int, Entity]) -> None:
+        """Tag ids of unknown type using the entity registry so type queries become O(1)."""
+        if not self._untyped:
+            return
+        for eid, entity_type in self._types.items():
+            if entity_type is not None:
+                continue
+            entity = entities.get(eid)
+            if entity is None:
+                continue
+            self._types[eid] = entity.type
+            self._buckets.setdefault(entity.type, {})[eid] = None
+            self._untyped -= 1
+
+    def add_entity(self, entity_id: int, entity_type: str | None = None) -> None:
+        if entity_id in self._slots:
+            return
+        self._slots[entity_id] = len(self.entity_ids)
+        self.entity_ids.append(entity_id)
+        self._types[entity_id] = entity_type
+        if entity_type is None:
+            self._untyped += 1
+        else:
+            self._buckets.setdefault(entity_type, {})[entity_id] = None
 
     def remove_entity(self, entity_id: int) -> None:
-        try:
-            self.entity_ids.remove(entity_id)
-        except ValueError:
-            pass
+        slot = self._slots.pop(entity_id, None)
+        if slot is None:
+            return
+        # Swap-remove keeps removal O(1); per-type buckets preserve arrival order for queries.
+        last = self.entity_ids.pop()
+        if last != entity_id:
+            self.entity_ids[slot] = last
+            self._slots[last] = slot
+        entity_type = self._types.pop(entity_id)
+        if entity_type is None:
+            self._untyped -= 1
+            return
+        bucket = self._buckets[entity_type]
+        del bucket[entity_id]
+        if not bucket:
+            del self._buckets[entity_type]
+
+    def ids_of_type(self, entities: Dict[int, Entity], entity_type: str) -> List[int]:
+        """Ids of the given type in arrival order."""
+        self.index_entities(entities)
+        return list(self._buckets.get(entity_type, ()))
 
     def clamp_layers(self) -> List[tuple[str, int, int]]:
         limited: List[tuple[str, int, int]] = []
@@ -285,7 +446,10 @@ class Cell:
         return float(self.water)
 
     def set_water(self, value: float, *, track_history: bool = True) -> float:
+        old = self.water
         self.water = _clamp(float(value), 0.0, 1.0)
+        if self._totals is not None:
+            self._totals.water_changed(old, self.water)
         if track_history:
             self._push_water_sample(self.water)
         return self.water
@@ -312,6 +476,8 @@ class Cell:
             del self.water_history[:overflow]
 
     def count_type(self, entities: Dict[int, Entity], entity_type: str) -> int:
+        if not self._untyped:
+            return len(self._buckets.get(entity_type, ()))
         total = 0
         for eid in self.entity_ids:
             entity = entities.get(eid)
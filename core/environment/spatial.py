@@ -1,23 +1,29 @@
 """Entity movement helpers."""
 from __future__ import annotations
 
-import random
-
 from core.agents import HERBIVORE_TYPES
 from core.model import GridState
+from core.rng import DIFFUSION, RngContext
 
 _HERBIVORE_SET = set(HERBIVORE_TYPES)
 
 
-def apply_entity_diffusion(state: GridState, move_chance: float = 0.3) -> None:
+def apply_entity_diffusion(state: GridState, move_chance: float = 0.3, *, rng: RngContext | None = None) -> None:
     """Move individual carnivores/neutral entities to neighboring cells."""
+    rng = rng or RngContext.from_global()
+    if not isinstance(state.entities, dict):
+        from core import kernels
+
+        kernels.apply_entity_diffusion(state, move_chance, rng=rng)
+        return
+    moves = rng.stream(DIFFUSION, state.day)
     for entity in list(state.entities.values()):
         if entity.type in _HERBIVORE_SET:
             continue
         neighbors = state.neighbors(entity.x, entity.y)
         if not neighbors:
             continue
-        if random.random() >= move_chance:
+        if moves.random() >= move_chance:
             continue
-        new_x, new_y = random.choice(neighbors)
+        new_x, new_y = moves.choice(neighbors)
         state.move_entity(entity.id, new_x, new_y)
@@ -0,0 +1,314 @@
+"""Append-only columnar history store (`worlds/<name>/history/`).
+
+Layout:
+
+- `meta.json`: format version, chunk size, and the ordered column list.
+- `chunk-NNNNNN/<column>.i64`: one little-endian int64 file per column per chunk; an append
+  writes one value to each column file of the open chunk, so appends never rewrite old data.
+- `index.bin`: one fixed-size record per full chunk (rows, first/last/min/max day, sorted flag).
+  Range queries skip chunks whose day span misses the range and bisect inside sorted chunks.
+
+Columns can be added later (e.g. a new producer guild); older chunks simply report them as
+missing. Timestamps are stored as integer microseconds since the Unix epoch (UTC).
+"""
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, TextIO
+
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_ROWS = 4096
+MISSING = -(2**63)
+TIMESTAMP = "timestamp"
+DAY = "day"
+AGGREGATIONS = ("mean", "last", "min", "max")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_INDEX_RECORD = struct.Struct("<qqqqqB")
+_SWAP = sys.byteorder != "little"
+
+
+def datetime_to_micros(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - _EPOCH) // _ONE_MICROSECOND
+
+
+def timestamp_to_micros(text: str) -> int:
+    return datetime_to_micros(datetime.fromisoformat(text.strip().replace("Z", "+00:00")))
+
+
+def micros_to_timestamp(micros: int) -> str:
+    """ISO8601 UTC text in the same shape `repository.log_history` writes."""
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat().replace("+00:00", "Z")
+
+
+@dataclass(frozen=True)
+class ChunkInfo:
+    rows: int
+    first_day: int
+    last_day: int
+    min_day: int
+    max_day: int
+    sorted: bool
+
+    @classmethod
+    def from_days(cls, days: Sequence[int]) -> "ChunkInfo":
+        ordered = all(days[idx] <= days[idx + 1] for idx in range(len(days) - 1))
+        return cls(len(days), days[0], days[-1], min(days), max(days), ordered)
+
+
+def _read_column(path: Path, rows: int) -> array:
+    values = array("q")
+    if path.exists():
+        with path.open("rb") as fh:
+            values.frombytes(fh.read(rows * 8))
+        if _SWAP:
+            values.byteswap()
+    if len(values) < rows:
+        values.extend([MISSING] * (rows - len(values)))
+    return values
+
+
+def _pack(values: Iterable[int]) -> bytes:
+    packed = array("q", values)
+    if _SWAP:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class HistoryStore:
+    """Chunked int64 columns with a per-chunk day index; see the module docstring for the layout."""
+
+    def __init__(self, directory: Path, columns: Sequence[str], *, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+        self.directory = Path(directory)
+        self.columns: List[str] = list(columns)
+        self.chunk_rows = int(chunk_rows)
+        self._index: List[ChunkInfo] = []
+        self._open_rows: int | None = None
+
+    @classmethod
+    def create(
+        cls, directory: Path, columns: Sequence[str], *, chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> "HistoryStore":
+        if DAY not in columns:
+            raise ValueError("History stores need a 'day' column")
+        store = cls(directory, columns, chunk_rows=chunk_rows)
+        store.directory.mkdir(parents=True, exist_ok=True)
+        store._write_meta()
+        (store.directory / "index.bin").touch()
+        return store
+
+    @classmethod
+    def open(cls, directory: Path) -> "HistoryStore":
+        directory = Path(directory)
+        meta_path = directory / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No history store at {directory}")
+        meta = json.loads(meta_path.read_text())
+        if int(meta.get("version", 0)) > FORMAT_VERSION:
+            raise ValueError(f"{directory} uses history format v{meta['version']}; this build reads v{FORMAT_VERSION}")
+        store = cls(directory, meta["columns"], chunk_rows=int(meta["chunk_rows"]))
+        raw = (directory / "index.bin").read_bytes()
+        usable = len(raw) - len(raw) % _INDEX_RECORD.size
+        store._index = [
+            ChunkInfo(rows, first, last, low, high, bool(ordered))
+            for rows, first, last, low, high, ordered in _INDEX_RECORD.iter_unpack(raw[:usable])
+        ]
+        return store
+
+    def _write_meta(self) -> None:
+        meta = {"version": FORMAT_VERSION, "chunk_rows": self.chunk_rows, "columns": self.columns}
+        tmp_path = self.directory / "meta.json.tmp"
+        tmp_path.write_text(json.dumps(meta, indent=2) + "\n")
+        os.replace(tmp_path, self.directory / "meta.json")
+
+    def _chunk_dir(self, chunk: int) -> Path:
+        return self.directory / f"chunk-{chunk:06d}"
+
+    def _column_path(self, chunk: int, column: str) -> Path:
+        return self._chunk_dir(chunk) / f"{column}.i64"
+
+    @property
+    def open_rows(self) -> int:
+        """Rows in the open (last, not yet indexed) chunk; a torn append is cut back to its shortest column."""
+        if self._open_rows is None:
+            chunk = len(self._index)
+            sizes = [
+                self._column_path(chunk, column).stat().st_size // 8
+                if self._column_path(chunk, column).exists()
+                else 0
+                for column in self.columns
+            ]
+            self._open_rows = min(sizes, default=0)
+        return self._open_rows
+
+    def __len__(self) -> int:
+        return sum(info.rows for info in self._index) + self.open_rows
+
+    def append(self, row: Mapping[str, int]) -> None:
+        self.append_many([row])
+
+    def append_many(self, rows: Iterable[Mapping[str, int]]) -> int:
+        """Append rows (missing columns are stored as MISSING, unknown ones add a column); returns the count."""
+        pending = list(rows)
+        if not pending:
+            return 0
+        new_columns = [key for row in pending for key in row if key not in self.columns]
+        if new_columns:
+            self.columns.extend(dict.fromkeys(new_columns))
+            self._write_meta()
+        written = 0
+        while written < len(pending):
+            chunk = len(self._index)
+            start = self.open_rows
+            batch = pending[written : written + self.chunk_rows - start]
+            chunk_dir = self._chunk_dir(chunk)
+            chunk_dir.mkdir(exist_ok=True)
+            for column in self.columns:
+                path = self._column_path(chunk, column)
+                with path.open("ab") as fh:
+                    size = fh.tell()
+                    if size != start * 8:
+                        # Drop a torn append; a column added mid-chunk reads as MISSING for the earlier rows.
+                        kept = min(size // 8, start)
+                        fh.truncate(kept * 8)
+                        fh.write(_pack([MISSING] * (start - kept)))
+                    fh.write(_pack(int(row.get(column, MISSING)) for row in batch))
+            written += len(batch)
+            self._open_rows = start + len(batch)
+            if self._open_rows >= self.chunk_rows:
+                self._seal(chunk)
+        return written
+
+    def _seal(self, chunk: int) -> None:
+        info = ChunkInfo.from_days(_read_column(self._column_path(chunk, DAY), self.chunk_rows))
+        with (self.directory / "index.bin").open("ab") as fh:
+            fh.write(
+                _INDEX_RECORD.pack(
+                    info.rows, info.first_day, info.last_day, info.min_day, info.max_day, int(info.sorted)
+                )
+            )
+        self._index.append(info)
+        self._open_rows = 0
+
+    def _chunks(self) -> Iterator[tuple[int, ChunkInfo | None, int]]:
+        for chunk, info in enumerate(self._index):
+            yield chunk, info, info.rows
+        if self.open_rows:
+            yield len(self._index), None, self.open_rows
+
+    def query(
+        self,
+        start_day: int | None = None,
+        end_day: int | None = None,
+        *,
+        columns: Sequence[str] | None = None,
+    ) -> Dict[str, List[int]]:
+        """Columns for rows with `start_day <= day <= end_day` (inclusive, either bound optional), in append order."""
+        wanted = list(columns or self.columns)
+        unknown = [column for column in wanted if column not in self.columns]
+        if unknown:
+            raise KeyError(f"Unknown history columns: {', '.join(unknown)}")
+        low = -math.inf if start_day is None else start_day
+        high = math.inf if end_day is None else end_day
+        result: Dict[str, List[int]] = {column: [] for column in wanted}
+        for chunk, info, rows in self._chunks():
+            if info is not None and (info.max_day < low or info.min_day > high):
+                continue
+            days = _read_column(self._column_path(chunk, DAY), rows)
+            if info is not None and info.sorted:
+                selection: slice | List[int] = slice(bisect_left(days, low), bisect_right(days, high))
+            else:
+                selection = [idx for idx, day in enumerate(days) if low <= day <= high]
+            for column in wanted:
+                values = days if column == DAY else _read_column(self._column_path(chunk, column), rows)
+                if isinstance(selection, slice):
+                    result[column].extend(values[selection])
+                else:
+                    result[column].extend(values[idx] for idx in selection)
+        return result
+
+    def iter_rows(self, start_day: int | None = None, end_day: int | None = None) -> Iterator[Dict[str, int]]:
+        data = self.query(start_day, end_day)
+        for values in zip(*(data[column] for column in self.columns)):
+            yield dict(zip(self.columns, values))
+
+    def export_csv(self, out: TextIO, *, header: Sequence[str] | None = None) -> int:
+        """Write rows as `history.csv` text (timestamp as ISO8601, MISSING values dropped from the row end)."""
+        names = list(header or self.columns)
+        out.write(",".join(names) + "\n")
+        count = 0
+        for row in self.iter_rows():
+            fields = []
+            for name in names:
+                value = row.get(name, MISSING)
+                if value == MISSING:
+                    fields.append("")
+                elif name == TIMESTAMP:
+                    fields.append(micros_to_timestamp(value))
+                else:
+                    fields.append(str(value))
+            while fields and fields[-1] == "":
+                fields.pop()
+            out.write(",".join(fields) + "\n")
+            count += 1
+        return count
+
+
+def read_csv_rows(path: Path) -> Iterator[Dict[str, int]]:
+    """Parse a `history.csv` into store rows (timestamps converted to microseconds)."""
+    with Path(path).open(newline="") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if not header:
+            return
+        for fields in reader:
+            if not fields:
+                continue
+            row: Dict[str, int] = {}
+            for name, text in zip(header, fields):
+                if text == "":
+                    continue
+                row[name] = timestamp_to_micros(text) if name == TIMESTAMP else int(float(text))
+            yield row
+
+
+def downsample(data: Mapping[str, Sequence[int]], points: int, *, how: str = "mean") -> Dict[str, List[float]]:
+    """Reduce columnar rows to at most `points` buckets of consecutive rows for charting.
+
+    Each bucket reports the last `day`/`timestamp` it covers and the `how` aggregate (mean, last,
+    min, max) of every other column; MISSING values are ignored.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{how}'. Choose from: {', '.join(AGGREGATIONS)}")
+    if points <= 0:
+        raise ValueError("points must be positive")
+    total = len(next(iter(data.values()), []))
+    size = max(1, math.ceil(total / points))
+    result: Dict[str, List[float]] = {column: [] for column in data}
+    for start in range(0, total, size):
+        for column, values in data.items():
+            bucket = [value for value in values[start : start + size] if value != MISSING]
+            if not bucket:
+                result[column].append(MISSING)
+            elif column in (DAY, TIMESTAMP) or how == "last":
+                result[column].append(bucket[-1])
+            elif how == "mean":
+                result[column].append(sum(bucket) / len(bucket))
+            elif how == "min":
+                result[column].append(min(bucket))
+            else:
+                result[column].append(max(bucket))
+    return result
@@ -0,0 +1,429 @@
+"""Vectorized rule kernels for array-backed grids (see core.environment.arrays)."""
+from __future__ import annotations
+
+import numpy as np
+
+from core import rules
+from core.agents import HERBIVORE_TYPES
+from core.agents.entity import DEATH_HUNGER
+from core.environment.arrays import LAYER_COLUMNS, LIMITING_FACTORS, PRODUCER_INDEX, GridArrays
+from core.environment.producers import (
+    GROUND_LAYER,
+    LAYER_CAPS,
+    LAYER_MEMBERS,
+    PRODUCER_PROFILES,
+    ProducerProfile,
+    within_season_window,
+)
+from core.model import GridState
+from core.rng import DIFFUSION, GROWTH, REPRODUCTION, RngContext
+
+# Matches the factor order used by rules._resource_multiplier (early block checks depend on it).
+_MULTIPLIER_ORDER = ("fertility", "temperature", "season", "facilitation")
+_LAYER_ORDER = tuple(LAYER_MEMBERS.keys())
+
+
+def grow_producers(state: GridState, rng: RngContext) -> None:
+    """Batched equivalent of rules.grow_producers for array-backed grids.
+
+    Every cell is advanced in one pass per guild. Results differ from the scalar path in two places:
+
+    - Facilitation reads neighbor ground cover from the start of the tick; the scalar sweep reads
+      the up and left neighbors after they have already grown this tick.
+    - Growth noise is one `uniform` draw per cell from `rng.generator(GROWTH, day)`; the scalar path
+      draws from `rng.stream(GROWTH, day)` and only for cells whose multiplier is not blocked. The
+      distribution is the same but the values are not.
+
+    Everything else is identical cell for cell: limiting factor and value (argmin over the alphabetical
+    `LIMITING_FACTORS` picks the same key as the scalar name tie-break), blocking, crowding, seeding,
+    dormancy, drought stress, rounding (`np.rint` and `round` both round half to even), layer clamping,
+    and the order of capacity events. With noise off and start-of-tick facilitation, the two paths give
+    the same grid on any size.
+    """
+    arrays = state.arrays
+    if arrays is None:
+        raise ValueError("grow_producers kernel requires array storage; call state.use_array_storage()")
+    if arrays.cell_count == 0:
+        return
+    generator = rng.generator(GROWTH, state.day)
+    amounts, events = grow_block(arrays, state.day, state.grid_width, state.grid_height, generator)
+    arrays.producers[:] = amounts
+    record_capacity_events(state, events)
+    state.totals.reset_producers(amounts.sum(axis=0))
+
+
+def grow_block(
+    arrays: GridArrays, day: int, width: int, height: int, generator: np.random.Generator
+) -> tuple[np.ndarray, list]:
+    """Grow every cell of a `width x height` block (the whole grid or one tile plus its halo).
+
+    Writes the limiting factor into `arrays` and returns the new producer matrix plus the
+    block-local capacity events from `_clamp_layers`; the caller commits both.
+    """
+    amounts = arrays.producers.astype(np.int64)
+    water = arrays.water
+    water_avg = arrays.water_average()
+    fertility = np.clip(arrays.fertility, 0.0, 1.0)
+
+    factors = {
+        "fertility": fertility,
+        "temperature": _temperature_factor(arrays.temperature, day),
+        "season": np.full(arrays.cell_count, rules._season_factor(day)),
+        "facilitation": _facilitation_factor(width, height, amounts),
+    }
+    water_factor = np.clip(water_avg, 0.0, 1.0)
+    limiting_values = np.stack([factors[key] if key != "water" else water_factor for key in LIMITING_FACTORS])
+    limiting_code = limiting_values.argmin(axis=0)
+    arrays.limiting_code[:] = limiting_code
+    arrays.limiting_value[:] = np.clip(limiting_values[limiting_code, np.arange(arrays.cell_count)], 0.0, 1.0)
+
+    multiplier = _resource_multiplier(factors, arrays.cell_count, generator)
+    capacities = {layer: layer_capacity(arrays, layer, water_avg) for layer in _LAYER_ORDER}
+
+    for name, profile in PRODUCER_PROFILES.items():
+        column = PRODUCER_INDEX[name]
+        amount = amounts[:, column].copy()
+        if profile.seeding_dependency:
+            dependency = amounts[:, PRODUCER_INDEX[profile.seeding_dependency]]
+            amount = np.where((amount <= 0) & (dependency >= profile.seeding_threshold), profile.seeding_amount, amount)
+        if profile.seasonal_window and not within_season_window(day, profile.seasonal_window):
+            retain = max(0.0, 1.0 - profile.dormancy_decay)
+            amounts[:, column] = np.where(amount > 0, np.rint(amount * retain), amount)
+            continue
+        cover = amounts[:, LAYER_COLUMNS[profile.layer]].sum(axis=1)
+        crowding = np.minimum(1.5, cover / np.maximum(1, capacities[profile.layer]))
+        crowd_penalty = np.maximum(0.08, 1.0 / (1.0 + np.exp(6.0 * (crowding - 0.85))))
+        growth_source = np.maximum(amount, profile.seed_floor)
+        layer_bias = 1.0 if profile.layer == GROUND_LAYER else 1.12
+        base_rate = profile.growth_rate * layer_bias
+        water_factor = np.maximum(0.0, water_response(profile, water_avg))
+        stressed = water_factor <= rules.FACTOR_BLOCK_THRESHOLD
+
+        stress_decay = np.where(water < profile.water_optimum, 0.82, 0.88)
+        stressed_amount = np.rint(amount * stress_decay).astype(np.int64)
+
+        growth_rate = base_rate * np.maximum(0.2, multiplier) * np.maximum(0.1, water_factor) * crowd_penalty
+        delta = np.rint(growth_source * growth_rate).astype(np.int64)
+        delta = np.where((delta <= 0) & (amount == 0), max(1, int(profile.seed_floor * 0.25)), delta)
+        grown_amount = np.minimum(profile.max_density, amount + np.maximum(delta, 0))
+
+        amounts[:, column] = np.where(stressed, stressed_amount, grown_amount)
+
+    return amounts, _clamp_layers(amounts, capacities)
+
+
+def layer_capacity(arrays, layer: str, water_avg: np.ndarray | None = None) -> np.ndarray:
+    """Vectorized Cell.layer_capacity for every cell."""
+    if water_avg is None:
+        water_avg = arrays.water_average()
+    base = max(1, int(LAYER_CAPS.get(layer, 100)))
+    moisture = 0.45 + 0.55 * water_avg
+    fertility = 0.4 + 0.6 * arrays.fertility
+    preferred_temp = 0.55 if layer == GROUND_LAYER else 0.68
+    delta = np.abs(arrays.temperature - preferred_temp)
+    temp_alignment = np.maximum(0.0, 1.0 - np.minimum(1.0, delta * 1.35))
+    temp_factor = 0.5 + 0.5 * temp_alignment
+    limiting = np.where(arrays.limiting_code >= 0, arrays.limiting_value, 1.0)
+    limiting_factor = 0.6 + 0.4 * limiting
+    resilience = 0.85 + 0.3 * arrays.water
+    layer_bias = 1.0 if layer == GROUND_LAYER else 0.9 + 0.2 * arrays.fertility
+    factor = np.clip(moisture * fertility * temp_factor * resilience * limiting_factor * layer_bias, 0.3, 1.4)
+    return np.maximum(8, np.rint(base * factor)).astype(np.int64)
+
+
+def water_response(profile: ProducerProfile, water_values: np.ndarray) -> np.ndarray:
+    """Vectorized producers.water_response."""
+    water_values = np.clip(water_values, 0.0, 1.0)
+    min_t, max_t = profile.water_tolerance
+    min_t = max(0.0, min(min_t, max_t - 1e-3))
+    max_t = min(1.0, max(max_t, min_t + 1e-3))
+    optimum = min(max(profile.water_optimum, min_t), max_t)
+    low_span = max(optimum - min_t, 1e-3)
+    high_span = max(max_t - optimum, 1e-3)
+    normalized = np.where(
+        water_values < optimum,
+        (water_values - min_t) / low_span,
+        (max_t - water_values) / high_span,
+    )
+    response = np.clip(0.15 + 0.85 * normalized, 0.0, 1.0)
+    response = np.where(water_values == optimum, 1.0, response)
+    return np.where((water_values <= min_t) | (water_values >= max_t), 0.0, response)
+
+
+def _temperature_factor(temperature: np.ndarray, day: int) -> np.ndarray:
+    ambient = rules._season_temperature(day)
+    delta = np.abs(ambient - np.clip(temperature, 0.0, 1.0))
+    return np.clip(1.0 - delta * 1.5, 0.0, 1.0)
+
+
+def _facilitation_factor(width: int, height: int, amounts: np.ndarray) -> np.ndarray:
+    ground = amounts[:, LAYER_COLUMNS[GROUND_LAYER]].sum(axis=1).astype(np.float64).reshape(height, width)
+    neighbor_total = np.zeros_like(ground)
+    neighbor_count = np.zeros_like(ground)
+    neighbor_total[1:, :] += ground[:-1, :]
+    neighbor_count[1:, :] += 1
+    neighbor_total[:-1, :] += ground[1:, :]
+    neighbor_count[:-1, :] += 1
+    neighbor_total[:, 1:] += ground[:, :-1]
+    neighbor_count[:, 1:] += 1
+    neighbor_total[:, :-1] += ground[:, 1:]
+    neighbor_count[:, :-1] += 1
+    cap = rules.GROUND_CAP
+    neighbor_density = neighbor_total / np.maximum(neighbor_count * cap, 1)
+    local_density = ground / cap if cap else np.zeros_like(ground)
+    factor = np.clip(0.2 + 0.5 * neighbor_density + 0.3 * local_density, 0.0, 1.0)
+    return np.where(neighbor_count > 0, factor, 0.5).reshape(-1)
+
+
+def _resource_multiplier(factors: dict, cell_count: int, generator: np.random.Generator) -> np.ndarray:
+    blocked = np.zeros(cell_count, dtype=bool)
+    for key in _MULTIPLIER_ORDER:
+        blocked |= factors[key] <= rules.FACTOR_BLOCK_THRESHOLD
+    multiplier = np.ones(cell_count)
+    for key in _MULTIPLIER_ORDER:
+        multiplier = multiplier * np.clip(0.5 + factors[key] * 0.9, rules.MULTIPLIER_MIN, rules.MULTIPLIER_MAX)
+        blocked |= multiplier <= rules.MULTIPLIER_BLOCK_THRESHOLD
+    if rules.NOISE_SCALE > 0:
+        multiplier = multiplier * (1.0 + generator.uniform(-rules.NOISE_SCALE, rules.NOISE_SCALE, cell_count))
+    return np.where(blocked, 0.0, multiplier)
+
+
+def _clamp_layers(
+    amounts: np.ndarray,
+    capacities: dict,
+    *,
+    rows: np.ndarray | None = None,
+    record: bool = True,
+) -> list:
+    """Vectorized Cell.clamp_layers over `rows` (default: every cell), optionally returning capacity events.
+
+    Events are `(row, layer_rank, layer, total, capacity)` tuples for `record_capacity_events`.
+    """
+    events = []
+    for rank, layer in enumerate(_LAYER_ORDER):
+        columns = LAYER_COLUMNS[layer]
+        cap = capacities[layer]
+        totals = amounts[:, columns].sum(axis=1)
+        over_mask = totals > cap
+        if rows is not None:
+            over_mask &= np.isin(np.arange(len(totals)), rows)
+        over = np.nonzero(over_mask)[0]
+        if not len(over):
+            continue
+        scale = np.where((cap[over] <= 0) | (totals[over] <= 0), 0.0, cap[over] / np.maximum(totals[over], 1))
+        block = amounts[np.ix_(over, columns)]
+        amounts[np.ix_(over, columns)] = np.rint(block * scale[:, None]).astype(np.int64)
+        if record:
+            events.extend((int(idx), rank, layer, int(totals[idx]), int(cap[idx])) for idx in over)
+    return events
+
+
+def record_capacity_events(state: GridState, events: list) -> None:
+    """Record `_clamp_layers` events (grid-wide row indices) in cell then layer order."""
+    events.sort(key=lambda event: (event[0], event[1]))
+    width = state.grid_width
+    for index, _, layer, total, cap in events:
+        state.record_capacity_event(x=index % width, y=index // width, layer=layer, total=total, capacity=cap)
+
+
+def tick_rabbits(state: GridState, rng: RngContext) -> None:
+    """Batched rules.tick_rabbits: every rabbit ages, grazes, and rolls for offspring in one pass.
+
+    Rabbits sharing a cell graze first-come first-served in store order, exactly like the
+    scalar loop; each cell's producers are then reduced in diet order and clamped once.
+    The crowding bonus for reproduction reads ground cover after the whole cell has grazed.
+    """
+    store = state.entities
+    arrays = state.arrays
+    rabbits = store.slots_of_type("rabbit")
+    if not len(rabbits):
+        return
+    store.hunger[rabbits] += 1
+    store.age[rabbits] += 1
+    cells = store.y[rabbits].astype(np.int64) * state.grid_width + store.x[rabbits]
+    draws = rng.generator(REPRODUCTION, state.day, "rabbit").random(len(rabbits))
+    amounts, hunger, births = graze_block(arrays, cells, store.hunger[rabbits], store.age[rabbits], draws)
+    store.hunger[rabbits] = hunger
+    arrays.producers[:] = amounts
+    state.totals.reset_producers(amounts.sum(axis=0))
+    _spawn_at(state, "rabbit", rabbits[births])
+
+
+def graze_block(
+    arrays: GridArrays, cells: np.ndarray, hunger: np.ndarray, age: np.ndarray, draws: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Graze the rabbits at block rows `cells` (already aged) and roll their offspring against `draws`.
+
+    Returns the block's new producer matrix, the rabbits' new hunger, and a births mask.
+    """
+    amounts = arrays.producers.astype(np.int64)
+    diet_columns = np.array([PRODUCER_INDEX[name] for name in rules.RABBIT_DIET], dtype=np.intp)
+    available = amounts[:, diet_columns].sum(axis=1)
+    rank = _rank_within_groups(cells)
+    eaten = np.clip(available[cells] - rules.RABBIT_INTAKE * rank, 0, rules.RABBIT_INTAKE)
+
+    hunger = np.where(eaten >= rules.RABBIT_FULL_MEAL, np.maximum(0, hunger - rules.RABBIT_FULL_RELIEF), hunger)
+    hunger = np.where(
+        (eaten > 0) & (eaten < rules.RABBIT_FULL_MEAL), np.maximum(0, hunger - rules.RABBIT_PARTIAL_RELIEF), hunger
+    )
+
+    grazed_cells = np.unique(cells)
+    remaining = np.bincount(cells, weights=eaten, minlength=arrays.cell_count).astype(np.int64)[grazed_cells]
+    for column in diet_columns:
+        take = np.minimum(amounts[grazed_cells, column], remaining)
+        amounts[grazed_cells, column] -= take
+        remaining -= take
+    capacities = {layer: layer_capacity(arrays, layer) for layer in _LAYER_ORDER}
+    _clamp_layers(amounts, capacities, rows=grazed_cells, record=False)
+
+    ground = amounts[:, LAYER_COLUMNS[GROUND_LAYER]].sum(axis=1)
+    crowd_bonus = np.minimum(
+        rules.RABBIT_CROWD_BONUS_MAX, ground[cells] / max(1, rules.GROUND_CAP) * rules.RABBIT_CROWD_BONUS
+    )
+    eligible = (hunger <= rules.RABBIT_BREED_HUNGER) & (age > rules.RABBIT_BREED_AGE)
+    births = eligible & (draws < rules.RABBIT_BREED_CHANCE + crowd_bonus)
+    return amounts, hunger, births
+
+
+def tick_foxes(state: GridState, rng: RngContext) -> None:
+    """Batched rules.tick_foxes: match foxes to the hungriest rabbits in their cell, then roll for offspring.
+
+    Within a cell the k-th fox (store order) eats the k-th hungriest rabbit, which is what the
+    scalar loop produces when each fox in turn takes the hungriest rabbit left.
+    """
+    store = state.entities
+    foxes = store.slots_of_type("fox")
+    if not len(foxes):
+        return
+    store.hunger[foxes] += 1
+    store.age[foxes] += 1
+    width = state.grid_width
+    fox_cells = store.y[foxes].astype(np.int64) * width + store.x[foxes]
+    rabbits = store.slots_of_type("rabbit")
+    rabbit_cells = store.y[rabbits].astype(np.int64) * width + store.x[rabbits]
+    draws = rng.generator(REPRODUCTION, state.day, "fox").random(len(foxes))
+    hunger, eaten, births = hunt_block(
+        fox_cells, store.hunger[foxes], store.age[foxes], rabbit_cells, store.hunger[rabbits], draws
+    )
+    _remove_slots(state, rabbits[eaten])
+    store.hunger[foxes] = hunger
+    _spawn_at(state, "fox", foxes[births])
+
+
+def hunt_block(
+    fox_cells: np.ndarray,
+    fox_hunger: np.ndarray,
+    fox_age: np.ndarray,
+    rabbit_cells: np.ndarray,
+    rabbit_hunger: np.ndarray,
+    draws: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Match foxes (already aged) to rabbits sharing their cell and roll offspring against `draws`.
+
+    Returns the foxes' new hunger, the positions of eaten rabbits (in removal order), and a births mask.
+    """
+    fed = np.zeros(len(fox_cells), dtype=bool)
+    eaten = np.zeros(0, dtype=np.intp)
+    if len(rabbit_cells):
+        order = np.lexsort((np.arange(len(rabbit_cells)), -rabbit_hunger.astype(np.int64), rabbit_cells))
+        ranked_cells = rabbit_cells[order]
+        rabbit_counts = np.bincount(rabbit_cells, minlength=int(fox_cells.max(initial=-1)) + 1)
+        first_rabbit = np.searchsorted(ranked_cells, fox_cells)
+        fox_rank = _rank_within_groups(fox_cells)
+        fed = fox_rank < rabbit_counts[fox_cells]
+        eaten = order[first_rabbit[fed] + fox_rank[fed]]
+    hunger = np.where(fed, np.maximum(0, fox_hunger - rules.FOX_MEAL_RELIEF), fox_hunger)
+
+    eligible = (hunger <= rules.FOX_BREED_HUNGER) & (fox_age > rules.FOX_BREED_AGE)
+    births = eligible & (draws < rules.FOX_BREED_CHANCE)
+    return hunger, eaten, births
+
+
+def _rank_within_groups(groups: np.ndarray) -> np.ndarray:
+    """Position of each element among earlier elements with the same group value."""
+    order = np.argsort(groups, kind="stable")
+    sorted_groups = groups[order]
+    starts = np.searchsorted(sorted_groups, sorted_groups, side="left")
+    rank = np.empty(len(groups), dtype=np.int64)
+    rank[order] = np.arange(len(groups)) - starts
+    return rank
+
+
+def _cell_indices(state: GridState, slots: np.ndarray) -> list:
+    store = state.entities
+    return (store.y[slots].astype(np.int64) * state.grid_width + store.x[slots]).tolist()
+
+
+def _spawn_at(state: GridState, entity_type: str, parents: np.ndarray) -> None:
+    """Spawn one newborn in each parent's cell (GridState.spawn_entity without per-call lookups)."""
+    store = state.entities
+    cells = state.cells
+    for index, x, y in zip(_cell_indices(state, parents), store.x[parents].tolist(), store.y[parents].tolist()):
+        entity_id = state.next_entity_id
+        store.insert(entity_id, entity_type, x, y)
+        cells[index].add_entity(entity_id, entity_type)
+        state.next_entity_id += 1
+
+
+def _remove_slots(state: GridState, slots: np.ndarray) -> None:
+    store = state.entities
+    cells = state.cells
+    for index, entity_id in zip(_cell_indices(state, slots), store.ids[slots].tolist()):
+        cells[index].remove_entity(entity_id)
+        del store[entity_id]
+
+
+def remove_dead_entities(state: GridState) -> None:
+    """Batched rules.remove_dead_entities over an EntityStore."""
+    store = state.entities
+    slots = store.active_slots()
+    _remove_slots(state, slots[(store.hunger[slots] >= DEATH_HUNGER) | (store.health[slots] <= 0)])
+
+
+# Same order as GridState.neighbors: up, down, left, right.
+_NEIGHBOR_OFFSETS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)], dtype=np.int64)
+
+
+def apply_entity_diffusion(state: GridState, move_chance: float = 0.3, *, rng: RngContext) -> None:
+    """Batched spatial.apply_entity_diffusion: draw moves for every non-herbivore at once."""
+    store = state.entities
+    slots = store.active_slots()
+    herbivore_codes = [store.type_names.index(name) for name in HERBIVORE_TYPES if name in store.type_names]
+    movers = slots[~np.isin(store.type_code[slots], herbivore_codes)]
+    if not len(movers):
+        return
+    generator = rng.generator(DIFFUSION, state.day)
+    rows, new_x, new_y = diffusion_moves(
+        store.x[movers], store.y[movers], state.grid_width, state.grid_height, move_chance, generator
+    )
+    move_slots(state, movers[rows], new_x, new_y)
+
+
+def diffusion_moves(
+    x: np.ndarray, y: np.ndarray, width: int, height: int, move_chance: float, generator: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Draw moves for movers at `(x, y)`; returns the moving rows and their target coordinates."""
+    target_x = x[:, None] + _NEIGHBOR_OFFSETS[:, 0]
+    target_y = y[:, None] + _NEIGHBOR_OFFSETS[:, 1]
+    valid = (target_x >= 0) & (target_x < width) & (target_y >= 0) & (target_y < height)
+    counts = valid.sum(axis=1)
+    moving = (counts > 0) & (generator.random(len(x)) < move_chance)
+    choice = np.minimum((generator.random(len(x)) * counts).astype(np.int64), np.maximum(counts - 1, 0))
+    picked = np.argmax(valid & (np.cumsum(valid, axis=1) == (choice + 1)[:, None]), axis=1)
+    rows = np.nonzero(moving)[0]
+    return rows, target_x[rows, picked[rows]], target_y[rows, picked[rows]]
+
+
+def move_slots(state: GridState, slots: np.ndarray, new_x: np.ndarray, new_y: np.ndarray) -> None:
+    """Relocate entities at `slots` (in order), keeping cell membership in sync."""
+    store = state.entities
+    cells = state.cells
+    old_cells = _cell_indices(state, slots)
+    new_cells = (new_y * state.grid_width + new_x).tolist()
+    for entity_id, entity_type, old_index, new_index in zip(
+        store.ids[slots].tolist(), store.type_code[slots].tolist(), old_cells, new_cells
+    ):
+        cells[old_index].remove_entity(entity_id)
+        cells[new_index].add_entity(entity_id, store.type_names[entity_type])
+    store.x[slots] = new_x
+    store.y[slots] = new_y
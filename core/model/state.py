@@ -1,12 +1,34 @@
 """Grid state container."""
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
 
 from core.environment import Cell
+from core.environment.cell import cells_are_canonical
 from core.environment.producers import PRODUCER_TYPES
 from core.agents import Entity
+from core.model.totals import GridTotals
+
+if TYPE_CHECKING:
+    from core.environment.arrays import GridArrays
+
+STORAGE_DICT = "dict"
+STORAGE_ARRAY = "array"
+STORAGE_MODES = (STORAGE_DICT, STORAGE_ARRAY)
+
+
+def default_storage() -> str:
+    """Grid storage mode selected via PW_GRID_STORAGE (dict or array)."""
+    raw = os.environ.get("PW_GRID_STORAGE", STORAGE_DICT).strip().lower()
+    return raw if raw in STORAGE_MODES else STORAGE_DICT
+
+
+def _is_lazy(cells: Sequence[Cell]) -> bool:
+    from core.environment.arrays import LazyArrayCells
+
+    return isinstance(cells, LazyArrayCells)
 
 
 @dataclass
@@ -21,20 +43,55 @@ class GridState:
     next_entity_id: int = 1
     migration_version: int = 2
     capacity_events: List[Dict[str, int]] = field(default_factory=list, repr=False, compare=False)
+    arrays: "GridArrays | None" = field(default=None, repr=False, compare=False)
+    totals: GridTotals | None = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         expected = self.grid_width * self.grid_height
         if len(self.cells) != expected:
             raise ValueError(f"Expected {expected} cells (got {len(self.cells)})")
+        if self.arrays is not None and _is_lazy(self.cells):
+            # Views (and their entity type index) are built as rows are read.
+            self.cells.bind(self)
+        else:
+            for cell in self.cells:
+                cell.index_entities(self.entities)
+        if self.totals is None:
+            self._rebuild_totals()
+        else:
+            self._attach_totals()
+
+    def _rebuild_totals(self) -> None:
+        # EntityStore keeps its own per-type counts, so only dict registries feed the population ledger.
+        types = (entity.type for entity in self.entities.values()) if isinstance(self.entities, dict) else ()
+        if self.arrays is not None:
+            self.totals = GridTotals.from_arrays(self.arrays)
+            self.totals.population.update(types)
+        else:
+            self.totals = GridTotals.build(self.cells, types)
+        self._attach_totals()
+
+    def _attach_totals(self) -> None:
+        if self.arrays is not None:
+            self.arrays.ledger = self.totals
+            return
+        for cell in self.cells:
+            cell.attach_totals(self.totals)
 
     @classmethod
-    def from_dict(cls, data: dict) -> "GridState":
+    def from_dict(cls, data: dict, *, storage: str | None = None) -> "GridState":
+        """Build a grid from `to_dict` output.
+
+        Cell dicts in the exact `to_dict` shape are validated once for the whole grid and then built
+        without per-value coercion.
+        """
         if "grid_width" not in data or "grid_height" not in data or "cells" not in data:
             raise ValueError("Legacy state format detected. Run: python migrations/0001_grid_state.py <world>")
         width = int(data["grid_width"])
         height = int(data["grid_height"])
         cells_raw: Sequence[dict] = data["cells"]
-        cells = [Cell.from_dict(cell, seed=index) for index, cell in enumerate(cells_raw)]
+        validated = cells_are_canonical(cells_raw)
+        cells = [Cell.from_dict(cell, seed=index, validated=validated) for index, cell in enumerate(cells_raw)]
         entities_raw = data.get("entities", {})
         entities: Dict[int, Entity] = {}
         if isinstance(entities_raw, dict):
@@ -47,7 +104,7 @@ class GridState:
             entities[int(eid)] = Entity.from_dict(edata)
         next_entity_id = int(data.get("next_entity_id", (max(entities.keys()) + 1) if entities else 1))
         version = int(data.get("_migration_version", 0))
-        return cls(
+        state = cls(
             day=int(data.get("day", 0)),
             grid_width=width,
             grid_height=height,
@@ -56,6 +113,29 @@ class GridState:
             next_entity_id=next_entity_id,
             migration_version=version,
         )
+        if (storage or default_storage()) == STORAGE_ARRAY:
+            state.use_array_storage()
+        return state
+
+    @property
+    def storage(self) -> str:
+        return STORAGE_ARRAY if self.arrays is not None else STORAGE_DICT
+
+    def use_array_storage(self) -> "GridState":
+        """Move cells and entities into NumPy arrays (GridArrays + EntityStore) behind thin views."""
+        if self.arrays is not None:
+            return self
+        from core.environment.arrays import GridArrays
+
+        from core.agents.store import EntityStore
+
+        arrays = GridArrays.from_cells(self.cells)
+        self.cells = arrays.views(self.cells)
+        self.arrays = arrays
+        if isinstance(self.entities, dict):
+            self.entities = EntityStore.from_entities(self.entities.values())
+        self._rebuild_totals()
+        return self
 
     def to_dict(self) -> dict:
         return {
@@ -77,7 +157,17 @@ class GridState:
         return self.cells[self._index(x, y)]
 
     def set_cell(self, x: int, y: int, cell: Cell) -> None:
-        self.cells[self._index(x, y)] = cell
+        index = self._index(x, y)
+        self.totals.remove_cell(self.cells[index])
+        if self.arrays is not None:
+            self.arrays.store(index, cell)
+            self.cells[index].adopt_entities(cell)
+        else:
+            self.cells[index].attach_totals(None)
+            self.cells[index] = cell
+            cell.attach_totals(self.totals)
+        self.totals.add_cell(self.cells[index])
+        self.cells[index].index_entities(self.entities)
 
     def neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         coords: List[Tuple[int, int]] = []
@@ -92,29 +182,33 @@ class GridState:
         return coords
 
     def total_biomass(self) -> int:
-        return int(sum(cell.total_producer_biomass() for cell in self.cells))
+        return int(sum(self.totals.producers.values()))
 
     def total_producer(self, producer_name: str) -> int:
-        return int(sum(cell.producer_amount(producer_name) for cell in self.cells))
+        return int(self.totals.producers.get(producer_name, 0))
 
     def producer_totals(self) -> Dict[str, int]:
-        totals = {name: 0 for name in PRODUCER_TYPES}
-        for cell in self.cells:
-            for name in PRODUCER_TYPES:
-                totals[name] += cell.producer_amount(name)
-        return totals
+        return {name: int(self.totals.producers.get(name, 0)) for name in PRODUCER_TYPES}
 
     def total_rabbits(self) -> int:
-        return sum(1 for entity in self.entities.values() if entity.type == "rabbit")
+        return self.population("rabbit")
 
     def total_foxes(self) -> int:
-        return sum(1 for entity in self.entities.values() if entity.type == "fox")
+        return self.population("fox")
+
+    def population(self, entity_type: str) -> int:
+        if not isinstance(self.entities, dict):
+            return self.entities.count(entity_type)
+        return int(self.totals.population.get(entity_type, 0))
 
     def water_stats(self, *, dry_threshold: float = 0.2) -> Dict[str, float | int]:
         """Return aggregate water statistics across all cells."""
 
         if not self.cells:
             return {"mean": 0.0, "min": 0.0, "max": 0.0, "dry_cells": 0, "dry_percent": 0.0}
+        tracked = self.totals.water_stats(dry_threshold=dry_threshold)
+        if tracked is not None:
+            return tracked
         total = 0.0
         minimum = 1.0
         maximum = 0.0
@@ -138,15 +232,26 @@ class GridState:
         }
 
     def clone(self) -> "GridState":
+        arrays = self.arrays.copy() if self.arrays is not None else None
+        if arrays is not None:
+            cells: List[Cell] = arrays.views(self.cells)
+        else:
+            cells = [cell.copy() for cell in self.cells]
+        if isinstance(self.entities, dict):
+            entities = {eid: entity.copy() for eid, entity in self.entities.items()}
+        else:
+            entities = self.entities.copy()
         return GridState(
             day=int(self.day),
             grid_width=int(self.grid_width),
             grid_height=int(self.grid_height),
-            cells=[cell.copy() for cell in self.cells],
-            entities={eid: Entity.from_dict(entity.to_dict()) for eid, entity in self.entities.items()},
+            cells=cells,
+            entities=entities,
             next_entity_id=int(self.next_entity_id),
             migration_version=int(self.migration_version),
             capacity_events=[],
+            arrays=arrays,
+            totals=self.totals.copy(arrays if arrays is not None else cells),
         )
 
     def record_capacity_event(self, *, x: int, y: int, layer: str, total: int, capacity: int) -> None:
@@ -167,17 +272,22 @@ class GridState:
                 yield x, y
 
     def spawn_entity(self, entity_type: str, x: int, y: int, *, hunger: int = 0, age: int = 0) -> Entity:
-        entity = Entity(id=self.next_entity_id, type=entity_type, x=x, y=y, hunger=hunger, age=age)
-        self.entities[entity.id] = entity
-        self.get_cell(x, y).add_entity(entity.id)
+        entity_id = self.next_entity_id
+        cell = self.get_cell(x, y)
+        if isinstance(self.entities, dict):
+            self.totals.entity_added(entity_type)
+        self.entities[entity_id] = Entity(id=entity_id, type=entity_type, x=x, y=y, hunger=hunger, age=age)
+        cell.add_entity(entity_id, entity_type)
         self.next_entity_id += 1
-        return entity
+        return self.entities[entity_id]
 
     def remove_entity(self, entity_id: int) -> None:
         entity = self.entities.get(entity_id)
         if not entity:
             return
         self.get_cell(entity.x, entity.y).remove_entity(entity_id)
+        if isinstance(self.entities, dict):
+            self.totals.entity_removed(entity.type)
         del self.entities[entity_id]
 
     def move_entity(self, entity_id: int, new_x: int, new_y: int) -> None:
@@ -187,11 +297,17 @@ class GridState:
         self.get_cell(entity.x, entity.y).remove_entity(entity_id)
         entity.x = new_x
         entity.y = new_y
-        self.get_cell(new_x, new_y).add_entity(entity_id)
+        self.get_cell(new_x, new_y).add_entity(entity_id, entity.type)
 
     def entities_in_cell(self, x: int, y: int) -> List[Entity]:
         cell = self.get_cell(x, y)
         return list(cell.iter_entities(self.entities))
 
     def entities_by_type(self, x: int, y: int, entity_type: str) -> List[Entity]:
-        return [entity for entity in self.entities_in_cell(x, y) if entity.type == entity_type]
+        cell = self.get_cell(x, y)
+        ids = cell.ids_of_type(self.entities, entity_type)
+        return [entity for entity in (self.entities.get(eid) for eid in ids) if entity is not None]
+
+    def count_type_at(self, x: int, y: int, entity_type: str) -> int:
+        """Number of entities of one type in a cell (O(1) via the per-cell type buckets)."""
+        return self.get_cell(x, y).count_type(self.entities, entity_type)
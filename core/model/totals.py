@@ -0,0 +1,149 @@
+"""Incrementally maintained grid aggregates."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, Sequence
+
+from core.environment.producers import PRODUCER_TYPES
+
+if TYPE_CHECKING:
+    from core.environment import Cell
+    from core.environment.arrays import GridArrays
+
+DRY_THRESHOLD = 0.2
+
+
+class GridTotals:
+    """Per-guild producer totals, per-type populations, and water sum/min/max/dry counts.
+
+    Cells report producer and water changes here (see `ProducerMap`, `ProducerView`, `Cell.set_water`),
+    `GridState.spawn_entity`/`remove_entity` report population changes, and the batched kernels reset
+    the producer totals after rewriting the matrix, so every query is O(1).
+    """
+
+    def __init__(self) -> None:
+        self.producers: Dict[str, int] = {name: 0 for name in PRODUCER_TYPES}
+        self.population: Counter[str] = Counter()
+        self.water_sum = 0.0
+        self.water_cells = 0
+        self.dry_cells = 0
+        self.water_min = 1.0
+        self.water_max = 0.0
+        # Set when the cell holding the current min/max moves away; `water_stats` then rescans once.
+        self._extremes_stale = False
+        # Cells, or the `GridArrays` of an array-backed grid, so the rescan reads the water column directly.
+        self._water_source: "Sequence[Cell] | GridArrays" = ()
+
+    @classmethod
+    def build(cls, cells: Sequence["Cell"], entity_types: Iterable[str]) -> "GridTotals":
+        totals = cls()
+        producers = totals.producers
+        waters = []
+        for cell in cells:
+            for name, amount in cell.producers.items():
+                producers[name] = producers.get(name, 0) + int(amount)
+            waters.append(cell.water)
+        if waters:
+            totals.water_sum = sum(waters)
+            totals.water_cells = len(waters)
+            totals.dry_cells = sum(1 for water in waters if water <= DRY_THRESHOLD)
+            totals.water_min = min(totals.water_min, min(waters))
+            totals.water_max = max(totals.water_max, max(waters))
+        totals.population.update(entity_types)
+        totals._water_source = cells
+        return totals
+
+    @classmethod
+    def from_arrays(cls, arrays: "GridArrays") -> "GridTotals":
+        """Same totals as `build` over the grid's cells, from column sums instead of a per-cell loop."""
+        totals = cls()
+        totals.reset_producers(arrays.producers.sum(axis=0))
+        water = arrays.water
+        if len(water):
+            # Python's left-to-right sum, so the mean matches `build` bit for bit.
+            totals.water_sum = sum(water.tolist())
+            totals.water_cells = len(water)
+            totals.dry_cells = int((water <= DRY_THRESHOLD).sum())
+            totals.water_min = min(totals.water_min, float(water.min()))
+            totals.water_max = max(totals.water_max, float(water.max()))
+        totals._water_source = arrays
+        return totals
+
+    def copy(self, cells: "Sequence[Cell] | GridArrays") -> "GridTotals":
+        clone = GridTotals.__new__(GridTotals)
+        clone.producers = dict(self.producers)
+        clone.population = Counter(self.population)
+        clone.water_sum = self.water_sum
+        clone.water_cells = self.water_cells
+        clone.dry_cells = self.dry_cells
+        clone.water_min = self.water_min
+        clone.water_max = self.water_max
+        clone._extremes_stale = self._extremes_stale
+        clone._water_source = cells
+        return clone
+
+    def add_cell(self, cell: "Cell") -> None:
+        for name, amount in cell.producers.items():
+            self.producer_changed(name, amount)
+        water = cell.water
+        self.water_sum += water
+        self.water_cells += 1
+        if water <= DRY_THRESHOLD:
+            self.dry_cells += 1
+        self.water_min = min(self.water_min, water)
+        self.water_max = max(self.water_max, water)
+
+    def remove_cell(self, cell: "Cell") -> None:
+        for name, amount in cell.producers.items():
+            self.producer_changed(name, -amount)
+        water = cell.water
+        self.water_sum -= water
+        self.water_cells -= 1
+        if water <= DRY_THRESHOLD:
+            self.dry_cells -= 1
+        if water <= self.water_min or water >= self.water_max:
+            self._extremes_stale = True
+
+    def producer_changed(self, name: str, delta: int) -> None:
+        if delta:
+            self.producers[name] = self.producers.get(name, 0) + int(delta)
+
+    def reset_producers(self, sums: Sequence[int]) -> None:
+        """Replace guild totals with column sums computed by a batched kernel (PRODUCER_TYPES order)."""
+        for idx, name in enumerate(PRODUCER_TYPES):
+            self.producers[name] = int(sums[idx])
+
+    def entity_added(self, entity_type: str) -> None:
+        self.population[entity_type] += 1
+
+    def entity_removed(self, entity_type: str) -> None:
+        self.population[entity_type] -= 1
+
+    def water_changed(self, old: float, new: float) -> None:
+        if old == new:
+            return
+        self.water_sum += new - old
+        self.dry_cells += int(new <= DRY_THRESHOLD) - int(old <= DRY_THRESHOLD)
+        if (old <= self.water_min and new > old) or (old >= self.water_max and new < old):
+            self._extremes_stale = True
+        self.water_min = min(self.water_min, new)
+        self.water_max = max(self.water_max, new)
+
+    def water_stats(self, *, dry_threshold: float = DRY_THRESHOLD) -> Dict[str, float | int] | None:
+        """Aggregate water stats, or None when `dry_threshold` differs from the tracked one."""
+        if dry_threshold != DRY_THRESHOLD:
+            return None
+        if self._extremes_stale:
+            source = self._water_source
+            waters = source.water.tolist() if hasattr(source, "water") else [cell.water for cell in source]
+            self.water_min = min(waters, default=1.0)
+            self.water_max = max(waters, default=0.0)
+            self._extremes_stale = False
+        count = self.water_cells
+        return {
+            "mean": self.water_sum / count if count else 0.0,
+            "min": min(1.0, self.water_min),
+            "max": max(0.0, self.water_max),
+            "dry_cells": self.dry_cells,
+            "dry_percent": self.dry_cells / count if count else 0.0,
+        }
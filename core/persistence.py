@@ -0,0 +1,108 @@
+"""Background writer that keeps disk I/O off the tick loop.
+
+Each artifact (`state`, `snapshot`, `history`, ...) gets its own worker thread. Writes to one artifact
+happen in submission order, for example checkpoint, then final state, then checkpoint removal. Writes to
+different artifacts run concurrently. The caller must not mutate an object after handing it to the
+writer; `Checkpointer` pickles in the foreground for this reason. The individual writes are atomic
+(`repository.atomic_write` and the binary/delta/checkpoint writers), so an interrupted run leaves
+either the old or the new file.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import core.repository as repository
+
+STATE = "state"
+SNAPSHOT = "snapshot"
+HISTORY = "history"
+DEFAULT_HISTORY_BATCH = 256
+
+
+class PersistenceWriter:
+    """Run write jobs on one background thread per artifact; `close()` waits for all of them."""
+
+    def __init__(self) -> None:
+        self._workers: Dict[str, ThreadPoolExecutor] = {}
+        self._futures: List[Future] = []
+        self._closed = False
+
+    def submit(self, artifact: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if self._closed:
+            raise RuntimeError("PersistenceWriter is closed")
+        worker = self._workers.get(artifact)
+        if worker is None:
+            worker = self._workers[artifact] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"write-{artifact}")
+        future = worker.submit(func, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def close(self) -> None:
+        """Wait for every submitted write, then re-raise the first failure (in submission order)."""
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers.values():
+            worker.shutdown(wait=True)
+        for future in self._futures:
+            error = future.exception()
+            if error is not None:
+                raise error
+
+    def __enter__(self) -> "PersistenceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Still let queued writes (e.g. the latest checkpoint) land, but keep the original error.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class HistoryBuffer:
+    """Collect `repository.history_row` records and append them in batches on a writer thread.
+
+    `artifact` picks the writer thread; pass `STATE` when checkpointing so a batch is always on disk
+    before the checkpoint written after it. `batch_rows=None` writes only on `flush()`, which a
+    checkpointed run calls at each checkpoint: rows for days after the last checkpoint are ticked
+    again by a resume, so they must not reach disk before it.
+    """
+
+    def __init__(
+        self,
+        world_name: str,
+        writer: PersistenceWriter,
+        *,
+        artifact: str = HISTORY,
+        batch_rows: int | None = DEFAULT_HISTORY_BATCH,
+        worlds_dir: Path | None = None,
+    ) -> None:
+        if batch_rows is not None and batch_rows <= 0:
+            raise ValueError("batch_rows must be positive")
+        self.world_name = world_name
+        self.writer = writer
+        self.artifact = artifact
+        self.batch_rows = batch_rows
+        self.worlds_dir = worlds_dir
+        self.rows: List[dict] = []
+        self.logged = 0
+
+    def add(self, row: dict) -> None:
+        self.rows.append(row)
+        if self.batch_rows is not None and len(self.rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        self.writer.submit(
+            self.artifact, repository.append_history_rows, self.world_name, rows, worlds_dir=self.worlds_dir
+        )
+        self.logged += len(rows)
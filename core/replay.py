@@ -0,0 +1,109 @@
+"""Time-travel replay: materialize any day of a seeded run from sparse keyframes.
+
+With a fixed `RngContext` seed every tick is a pure function of (state, day), so a run never has to be
+stored in full. `ReplayEngine` keeps a pickled keyframe every `keyframe_every` days (plus any exactly
+recorded days, e.g. from a `DeltaStore`). It rebuilds a requested day by ticking forward from the
+nearest keyframe or cached day at or before it, and keeps the most recently materialized days in an
+LRU cache, so scrubbing back and forth costs at most `keyframe_every` ticks per jump.
+"""
+from __future__ import annotations
+
+import pickle
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+from core.model import GridState
+from core.rng import RngContext
+
+if TYPE_CHECKING:
+    from core.deltas import DeltaStore
+
+DEFAULT_KEYFRAME_EVERY = 50
+DEFAULT_CACHE_SIZE = 32
+
+
+class ReplayEngine:
+    """Seeded replay of a grid timeline starting at `origin`.
+
+    States returned by `state_at` are shared with the cache; treat them as read-only (or `clone()` them).
+    """
+
+    def __init__(
+        self,
+        origin: GridState,
+        *,
+        seed: int,
+        keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        recorded: DeltaStore | None = None,
+    ) -> None:
+        if keyframe_every <= 0:
+            raise ValueError("keyframe_every must be positive")
+        if cache_size <= 0:
+            raise ValueError("cache_size must be positive")
+        self.seed = int(seed)
+        self.rng = RngContext(self.seed)
+        self.origin_day = origin.day
+        self.keyframe_every = keyframe_every
+        self.cache_size = cache_size
+        self.keyframes: Dict[int, bytes] = {origin.day: _freeze(origin)}
+        self.cache: "OrderedDict[int, GridState]" = OrderedDict()
+        # Recorded days are exact states (not replays); loaded only when they are the nearest start point.
+        self._recorded: Dict[int, Callable[[], GridState]] = {}
+        if recorded is not None:
+            for day in recorded.days():
+                if day > origin.day:
+                    self._recorded[day] = lambda day=day: recorded.load_state(day)
+        self.ticks_replayed = 0
+
+    @property
+    def keyframe_days(self) -> List[int]:
+        return sorted(set(self.keyframes) | set(self._recorded))
+
+    def state_at(self, day: int) -> GridState:
+        """Full state as of `day` (>= the origin day)."""
+        if day < self.origin_day:
+            raise ValueError(f"Day {day} is before the replay origin (day {self.origin_day})")
+        cached = self.cache.get(day)
+        if cached is not None:
+            self.cache.move_to_end(day)
+            return cached
+        # Imported here so `sim.py` can read the defaults above without loading the simulation rules.
+        import core.scheduler as scheduler
+
+        state = self._nearest_start(day)
+        while state.day < day:
+            state = scheduler.tick_grid(state, log_capacity=False, in_place=True, rng=self.rng)
+            self.ticks_replayed += 1
+            if state.day < day and (state.day - self.origin_day) % self.keyframe_every == 0:
+                self.keyframes.setdefault(state.day, _freeze(state))
+        if (day - self.origin_day) % self.keyframe_every == 0:
+            self.keyframes.setdefault(day, _freeze(state))
+        self._remember(day, state)
+        return state
+
+    def _nearest_start(self, day: int) -> GridState:
+        """A private copy of the latest keyframe, recorded day, or cached day at or before `day`."""
+        start_day = max(kf for kf in self.keyframe_days if kf <= day)
+        cached_days = [cached for cached in self.cache if start_day < cached <= day]
+        if cached_days:
+            return self.cache[max(cached_days)].clone()
+        if start_day in self.keyframes:
+            return _thaw(self.keyframes[start_day])
+        state = self._recorded[start_day]()
+        self.keyframes[start_day] = _freeze(state)
+        return state
+
+    def _remember(self, day: int, state: GridState) -> None:
+        self.cache[day] = state
+        self.cache.move_to_end(day)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+
+def _freeze(state: GridState) -> bytes:
+    return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _thaw(frozen: bytes) -> GridState:
+    return pickle.loads(frozen)
@@ -2,23 +2,40 @@
 from __future__ import annotations
 
 import json
+import os
 import random
+import re
 import shutil
+import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import IO, Iterable, Iterator
 
+from core import deltas, history
 from core.environment import Cell, generate_water_distribution, random_environment_profile
 from core.environment.producers import PRODUCER_PROFILES, PRODUCER_TYPES, empty_producer_map
 from core.model import GridState
+from core.model.state import STORAGE_ARRAY, default_storage
+from migrations import runner
 
 PRODUCER_HISTORY_FIELDS = [f"producer_{name}" for name in PRODUCER_TYPES]
 HISTORY_HEADER = "timestamp,day,biomass,rabbits,foxes"
 if PRODUCER_HISTORY_FIELDS:
     HISTORY_HEADER = HISTORY_HEADER + "," + ",".join(PRODUCER_HISTORY_FIELDS)
+HISTORY_COLUMNS = HISTORY_HEADER.split(",")
 WORLDS_DIR = Path("worlds")
 DEFAULT_CELL_BIOMASS = 50
 EXPECTED_MIGRATION_VERSION = 3
+STATE_FORMAT_JSON = "json"
+STATE_FORMAT_BINARY = "binary"
+STATE_FORMATS = (STATE_FORMAT_JSON, STATE_FORMAT_BINARY)
+HISTORY_FORMAT_CSV = "csv"
+HISTORY_FORMAT_BINARY = "binary"
+HISTORY_FORMATS = (HISTORY_FORMAT_CSV, HISTORY_FORMAT_BINARY)
+_HEADER_BYTES = 256
+_DAY_PATTERN = re.compile(rb'\s*\{\s*"day"\s*:\s*(-?\d+)')
 
 
 @dataclass
@@ -26,18 +43,27 @@ class WorldPaths:
     name: str
     directory: Path
     state: Path
+    binary_state: Path
     history: Path
+    history_store: Path
+    deltas: Path
     snapshot: Path
+    state_cache: Path
 
 
-def get_paths(world_name: str) -> WorldPaths:
-    directory = WORLDS_DIR / world_name
+def get_paths(world_name: str, worlds_dir: Path | None = None) -> WorldPaths:
+    """Files of `world_name` under `worlds_dir` (default: `WORLDS_DIR`)."""
+    directory = Path(worlds_dir if worlds_dir is not None else WORLDS_DIR) / world_name
     return WorldPaths(
         name=world_name,
         directory=directory,
         state=directory / "state.json",
+        binary_state=directory / "state.bin",
         history=directory / "history.csv",
+        history_store=directory / "history",
+        deltas=directory / "deltas",
         snapshot=directory / "snapshot.md",
+        state_cache=directory / "cache" / "state.bin",
     )
 
 
@@ -45,30 +71,176 @@ def ensure_directory(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def load_world(world_name: str) -> GridState:
-    paths = get_paths(world_name)
+@contextmanager
+def atomic_write(path: Path, mode: str = "w") -> Iterator[IO]:
+    """Open a temporary file beside `path` and rename it over `path` once the block succeeds.
+
+    Readers (and a crash mid-write) only ever see the old or the complete new file. The temporary name is unique,
+    so concurrent writers of the same file (a `serve` flush and a CLI `tick`) never share or delete each other's.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with tmp_path.open(mode, encoding=None if "b" in mode else "utf-8") as fh:
+            yield fh
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def detect_state_format(world_name: str, *, worlds_dir: Path | None = None) -> str:
+    """Return the on-disk format of a world: `binary` when state.bin exists, otherwise `json`."""
+    if get_paths(world_name, worlds_dir).binary_state.exists():
+        return STATE_FORMAT_BINARY
+    return STATE_FORMAT_JSON
+
+
+def read_state_header(world_name: str, *, worlds_dir: Path | None = None) -> dict:
+    """Return `day` and `_migration_version` without building the full grid (of the state `load_world` picks)."""
+    paths = get_paths(world_name, worlds_dir)
+    header = _state_file_header(paths)
+    delta_day = _latest_delta_day(paths)
+    if delta_day is not None and (header is None or delta_day > int(header.get("day", 0))):
+        header = {"day": delta_day, "_migration_version": EXPECTED_MIGRATION_VERSION}
+    if header is None:
+        raise FileNotFoundError(f"No grid state for '{world_name}'. Run: ./sim.py init-grid {world_name}")
+    return {"day": int(header.get("day", 0)), "_migration_version": int(header.get("_migration_version", 0))}
+
+
+def _state_file_header(paths: WorldPaths) -> dict | None:
+    if paths.binary_state.exists():
+        from core import binary_state
+
+        return binary_state.read_header(paths.binary_state)
+    if paths.state.exists():
+        return _read_json_header(paths.state)
+    return None
+
+
+def _latest_delta_day(paths: WorldPaths) -> int | None:
+    """Last day recorded in the world's deltas/, or None when it keeps no delta snapshots."""
+    store = deltas.DeltaStore(paths.deltas)
+    return store.days()[-1] if store.exists() else None
+
+
+def _read_json_header(state_path: Path) -> dict:
+    # `to_dict` writes "day" first and "_migration_version" last, so the two ends of the file are enough.
+    with state_path.open("rb") as fh:
+        head = fh.read(_HEADER_BYTES)
+    match = _DAY_PATTERN.match(head)
+    if match is None:
+        with state_path.open() as fh:
+            return json.load(fh)
+    return {"day": int(match.group(1)), "_migration_version": runner.read_state_version(state_path)}
+
+
+def load_world(world_name: str, *, mmap: bool = False, worlds_dir: Path | None = None) -> GridState:
+    """Load a world's state; `mmap=True` memory-maps binary worlds (see `load_world_readonly`)."""
+    paths = get_paths(world_name, worlds_dir)
+    delta_day = _latest_delta_day(paths)
+    if delta_day is not None:
+        header = _state_file_header(paths)
+        if header is None or delta_day > int(header.get("day", 0)):
+            # Delta worlds commit only deltas/, so a checkout has no state file or a stale one from before
+            # `deltas --init`; either way the latest recorded day is the world's state.
+            return deltas.DeltaStore(paths.deltas).load_state(delta_day)
+    if paths.binary_state.exists():
+        return _load_binary_world(world_name, paths, mmap=mmap)
     if not paths.state.exists():
         raise FileNotFoundError(f"No grid state for '{world_name}'. Run: ./sim.py init-grid {world_name}")
     with paths.state.open() as fh:
         data = json.load(fh)
-    current_version = int(data.get("_migration_version", 0))
+    _check_migration_version(world_name, int(data.get("_migration_version", 0)))
+    return GridState.from_dict(data)
+
+
+def load_world_readonly(world_name: str, *, worlds_dir: Path | None = None) -> GridState:
+    """Load a private copy that is never saved back (forecasts).
+
+    Binary worlds are memory-mapped copy-on-write, so arrays are paged in only as the simulation touches them and
+    edits never reach disk. Under array storage, JSON worlds keep a binary copy in `cache/state.bin` and are mapped
+    from it, so only the first read-only load parses the JSON. That first load (and the first after each state.json
+    change) therefore writes the cache file; the world's own state files are never written.
+    """
+    paths = get_paths(world_name, worlds_dir)
+    if (
+        paths.binary_state.exists()
+        or not paths.state.exists()
+        or default_storage() != STORAGE_ARRAY
+        or _latest_delta_day(paths) is not None
+    ):
+        return load_world(world_name, mmap=True, worlds_dir=worlds_dir)
+    from core import binary_state
+
+    stat = paths.state.stat()
+    source = [stat.st_size, stat.st_mtime_ns]
+    if paths.state_cache.exists() and binary_state.read_header(paths.state_cache).get("source") == source:
+        return binary_state.read_state(paths.state_cache, mmap=True)
+    state = load_world(world_name, worlds_dir=worlds_dir)
+    ensure_directory(paths.state_cache.parent)
+    binary_state.write_state(paths.state_cache, state, extra={"source": source})
+    return state
+
+
+def _load_binary_world(world_name: str, paths: WorldPaths, *, mmap: bool) -> GridState:
+    from core import binary_state
+
+    header = binary_state.read_header(paths.binary_state)
+    _check_migration_version(world_name, int(header.get("_migration_version", 0)))
+    return binary_state.read_state(paths.binary_state, mmap=mmap)
+
+
+def _check_migration_version(world_name: str, current_version: int) -> None:
     if current_version < EXPECTED_MIGRATION_VERSION:
         raise ValueError(
             f"World '{world_name}' is at migration v{current_version}, expected v{EXPECTED_MIGRATION_VERSION}. "
             f"Run: ./sim.py migrate {world_name}"
         )
-    return GridState.from_dict(data)
 
 
-def save_world(world_name: str, state: GridState) -> None:
-    paths = get_paths(world_name)
+def save_world(
+    world_name: str, state: GridState, *, state_format: str | None = None, worlds_dir: Path | None = None
+) -> None:
+    """Persist `state` in the world's current format; an explicit `state_format` switches the world to it."""
+    paths = get_paths(world_name, worlds_dir)
     ensure_directory(paths.directory)
-    with paths.state.open("w") as fh:
-        json.dump(state.to_dict(), fh, indent=2)
+    target = state_format or detect_state_format(world_name, worlds_dir=worlds_dir)
+    if target not in STATE_FORMATS:
+        raise ValueError(f"Unknown state format '{target}'. Choose from: {', '.join(STATE_FORMATS)}")
+    if target == STATE_FORMAT_BINARY:
+        from core import binary_state
+
+        binary_state.write_state(paths.binary_state, state)
+        stale = paths.state
+    else:
+        with atomic_write(paths.state) as fh:
+            json.dump(state.to_dict(), fh, indent=2)
+        stale = paths.binary_state
+    if state_format is not None:
+        stale.unlink(missing_ok=True)
+
+
+def delta_store(world_name: str, *, worlds_dir: Path | None = None) -> deltas.DeltaStore:
+    return deltas.DeltaStore(get_paths(world_name, worlds_dir).deltas)
 
 
-def ensure_history_file(world_name: str) -> Path:
+def record_delta(world_name: str, state: GridState, *, worlds_dir: Path | None = None) -> Path | None:
+    """Add `state` to the world's delta snapshots if it keeps them and has not recorded this day yet."""
+    store = delta_store(world_name, worlds_dir=worlds_dir)
+    if not store.exists() or state.day <= store.days()[-1]:
+        return None
+    return store.record(state)
+
+
+def convert_world(world_name: str, target_format: str) -> Path:
+    """Rewrite a world's state in `target_format`, removing the file for the other format."""
+    save_world(world_name, load_world(world_name), state_format=target_format)
     paths = get_paths(world_name)
+    return paths.binary_state if target_format == STATE_FORMAT_BINARY else paths.state
+
+
+def ensure_history_file(world_name: str, *, worlds_dir: Path | None = None) -> Path:
+    paths = get_paths(world_name, worlds_dir)
     ensure_directory(paths.directory)
     if not paths.history.exists():
         paths.history.write_text(HISTORY_HEADER + "\n")
@@ -89,22 +261,101 @@ def ensure_history_file(world_name: str) -> Path:
     return paths.history
 
 
-def log_history(world_name: str, state: GridState) -> None:
-    """Append the current state snapshot with a UTC ISO8601 timestamp."""
+def detect_history_format(world_name: str, *, worlds_dir: Path | None = None) -> str:
+    """Return `binary` when the world logs to a `history/` store, otherwise `csv`."""
+    if (get_paths(world_name, worlds_dir).history_store / "meta.json").exists():
+        return HISTORY_FORMAT_BINARY
+    return HISTORY_FORMAT_CSV
 
-    history_file = ensure_history_file(world_name)
-    timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+def history_row(state: GridState, *, timestamp: datetime | None = None) -> dict:
+    """One history record (`HISTORY_COLUMNS`); the timestamp is stored as UTC epoch microseconds."""
+    moment = timestamp or datetime.now(timezone.utc)
     producers = state.producer_totals()
-    producer_segment = ""
-    if PRODUCER_HISTORY_FIELDS:
-        ordered = ",".join(str(producers.get(name, 0)) for name in PRODUCER_TYPES)
-        producer_segment = f",{ordered}"
-    line = (
-        f"{timestamp},{state.day},{state.total_biomass():.0f},{state.total_rabbits():.0f},"
-        f"{state.total_foxes():.0f}{producer_segment}\n"
-    )
+    row = {
+        history.TIMESTAMP: history.datetime_to_micros(moment),
+        "day": state.day,
+        "biomass": round(state.total_biomass()),
+        "rabbits": round(state.total_rabbits()),
+        "foxes": round(state.total_foxes()),
+    }
+    for name, field in zip(PRODUCER_TYPES, PRODUCER_HISTORY_FIELDS):
+        row[field] = round(producers.get(name, 0))
+    return row
+
+
+def log_history(world_name: str, state: GridState, *, worlds_dir: Path | None = None) -> None:
+    """Append the current state snapshot with a UTC ISO8601 timestamp."""
+    append_history_rows(world_name, [history_row(state)], worlds_dir=worlds_dir)
+
+
+def append_history_rows(world_name: str, rows: Iterable[dict], *, worlds_dir: Path | None = None) -> int:
+    """Append `history_row` records in one write (one `append_many` for binary stores); returns the count."""
+    rows = list(rows)
+    if not rows:
+        return 0
+    if detect_history_format(world_name, worlds_dir=worlds_dir) == HISTORY_FORMAT_BINARY:
+        return history.HistoryStore.open(get_paths(world_name, worlds_dir).history_store).append_many(rows)
+    history_file = ensure_history_file(world_name, worlds_dir=worlds_dir)
+    lines = [
+        ",".join(
+            history.micros_to_timestamp(value) if column == history.TIMESTAMP else str(value)
+            for column, value in row.items()
+        )
+        for row in rows
+    ]
     with history_file.open("a") as fh:
-        fh.write(line)
+        fh.write("\n".join(lines) + "\n")
+    return len(rows)
+
+
+def load_history(
+    world_name: str,
+    start_day: int | None = None,
+    end_day: int | None = None,
+    *,
+    columns: list[str] | None = None,
+) -> dict:
+    """Columnar history rows with `start_day <= day <= end_day` from either history format."""
+    paths = get_paths(world_name)
+    if detect_history_format(world_name) == HISTORY_FORMAT_BINARY:
+        return history.HistoryStore.open(paths.history_store).query(start_day, end_day, columns=columns)
+    if not paths.history.exists():
+        raise FileNotFoundError(f"No history for '{world_name}'. Run: ./sim.py tick {world_name} --log")
+    wanted = columns or HISTORY_COLUMNS
+    unknown = [column for column in wanted if column not in HISTORY_COLUMNS]
+    if unknown:
+        raise KeyError(f"Unknown history columns: {', '.join(unknown)}")
+    result: dict = {column: [] for column in wanted}
+    for row in history.read_csv_rows(paths.history):
+        day = row.get("day", 0)
+        if (start_day is not None and day < start_day) or (end_day is not None and day > end_day):
+            continue
+        for column in wanted:
+            result[column].append(row.get(column, history.MISSING))
+    return result
+
+
+def convert_history(world_name: str, target_format: str) -> Path:
+    """Rewrite a world's history as `history.csv` or a `history/` store, removing the other one."""
+    if target_format not in HISTORY_FORMATS:
+        raise ValueError(f"Unknown history format '{target_format}'. Choose from: {', '.join(HISTORY_FORMATS)}")
+    paths = get_paths(world_name)
+    if detect_history_format(world_name) == target_format:
+        return paths.history_store if target_format == HISTORY_FORMAT_BINARY else paths.history
+    if target_format == HISTORY_FORMAT_BINARY:
+        store = history.HistoryStore.create(paths.history_store, HISTORY_COLUMNS)
+        if paths.history.exists():
+            store.append_many(history.read_csv_rows(paths.history))
+        paths.history.unlink(missing_ok=True)
+        return paths.history_store
+    store = history.HistoryStore.open(paths.history_store)
+    tmp_path = paths.history.with_suffix(".csv.tmp")
+    with tmp_path.open("w") as fh:
+        store.export_csv(fh, header=HISTORY_COLUMNS + [c for c in store.columns if c not in HISTORY_COLUMNS])
+    tmp_path.replace(paths.history)
+    shutil.rmtree(paths.history_store)
+    return paths.history
 
 
 def init_grid_world(
@@ -115,10 +366,12 @@ def init_grid_world(
     total_biomass: int | None = None,
     total_rabbits: int = 20,
     total_foxes: int = 5,
+    state_format: str = STATE_FORMAT_JSON,
+    seed: int | None = None,
 ) -> GridState:
     ensure_directory(get_paths(world_name).directory)
     base_grass = DEFAULT_CELL_BIOMASS if total_biomass is None else int(total_biomass)
-    rng = random.Random()
+    rng = random.Random(seed)
     water_noise = generate_water_distribution(width, height, seed=f"{world_name}-water")
     cells = []
     for idx in range(width * height):
@@ -167,6 +420,8 @@ def init_grid_world(
         cells=cells,
         migration_version=EXPECTED_MIGRATION_VERSION,
     )
+    if default_storage() == STORAGE_ARRAY:
+        state.use_array_storage()
     total_cells = width * height
     for _ in range(max(0, total_rabbits)):
         idx = rng.randrange(total_cells)
@@ -178,8 +433,9 @@ def init_grid_world(
         x = idx % width
         y = idx // width
         state.spawn_entity("fox", x, y)
-    save_world(world_name, state)
-    ensure_history_file(world_name)
+    save_world(world_name, state, state_format=state_format)
+    if detect_history_format(world_name) == HISTORY_FORMAT_CSV:
+        ensure_history_file(world_name)
     return state
 
 
@@ -188,19 +444,21 @@ def create_world(world_name: str, from_world: str | None = None) -> None:
     ensure_directory(dest.directory)
     if from_world:
         src = get_paths(from_world)
-        if not src.state.exists():
+        if not src.state.exists() and not src.binary_state.exists():
             raise FileNotFoundError(f"Source world '{from_world}' not found at {src.directory}")
         ensure_directory(src.directory)
-        for filename in ("state.json", "history.csv", "snapshot.md"):
+        for filename in ("state.json", "state.bin", "history.csv", "snapshot.md"):
             source_path = src.directory / filename
             if source_path.exists():
                 shutil.copy2(source_path, dest.directory / filename)
+        if src.history_store.exists():
+            shutil.copytree(src.history_store, dest.history_store, dirs_exist_ok=True)
     else:
         init_grid_world(world_name)
 
 
-def snapshot_path(world_name: str) -> Path:
-    paths = get_paths(world_name)
+def snapshot_path(world_name: str, *, worlds_dir: Path | None = None) -> Path:
+    paths = get_paths(world_name, worlds_dir)
     ensure_directory(paths.directory)
     return paths.snapshot
 
@@ -0,0 +1,56 @@
+"""Seeded, splittable random streams for simulation subsystems."""
+from __future__ import annotations
+
+import hashlib
+import random
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+GROWTH = "growth"
+REPRODUCTION = "reproduction"
+PREDATION = "predation"
+DIFFUSION = "diffusion"
+NOISE = "noise"
+SUBSYSTEMS = (GROWTH, REPRODUCTION, PREDATION, DIFFUSION, NOISE)
+
+Key = Tuple[object, ...]
+
+
+class RngContext:
+    """Root seed from which independent streams are derived per (subsystem, day, tile, ...) key.
+
+    A stream depends only on the root seed and its key, never on how many numbers other streams
+    consumed, so results are identical however work is split across tiles, threads, or processes.
+    """
+
+    def __init__(self, seed: int, *, path: Key = ()) -> None:
+        self.seed = int(seed)
+        self.path = tuple(path)
+
+    @classmethod
+    def from_global(cls) -> "RngContext":
+        """Context seeded from the module-level `random` stream, so `random.seed()` still controls unseeded runs."""
+        return cls(random.getrandbits(64))
+
+    def spawn(self, *key: object) -> "RngContext":
+        """Child context whose streams are independent of this context's (e.g. one per tile or worker)."""
+        return RngContext(self.seed, path=self.path + tuple(key))
+
+    def stream(self, subsystem: str, *key: object) -> random.Random:
+        """Scalar `random.Random` stream for one subsystem/key."""
+        return random.Random(self._derive(subsystem, key))
+
+    def generator(self, subsystem: str, *key: object) -> "np.random.Generator":
+        """NumPy generator for batched draws (requires numpy)."""
+        import numpy as np
+
+        return np.random.default_rng(self._derive(subsystem, key))
+
+    def _derive(self, subsystem: str, key: Key) -> int:
+        material = repr((self.seed, self.path, subsystem, tuple(key))).encode("utf-8")
+        return int.from_bytes(hashlib.blake2b(material, digest_size=16).digest(), "little")
+
+    def __repr__(self) -> str:
+        return f"RngContext(seed={self.seed}, path={self.path!r})"
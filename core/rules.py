@@ -15,6 +15,8 @@ from core.environment.producers import (
     within_season_window,
 )
 from core.model import GridState
+from core.rng import GROWTH, REPRODUCTION, RngContext
+from core.telemetry import PhaseProfiler, measure
 
 GROUND_CAP = LAYER_CAPS[GROUND_LAYER]
 SEASON_LENGTH = 120
@@ -23,6 +25,19 @@ MULTIPLIER_BLOCK_THRESHOLD = 0.1
 MULTIPLIER_MIN = 0.35
 MULTIPLIER_MAX = 1.6
 NOISE_SCALE = 0.10
+RABBIT_INTAKE = 6
+RABBIT_FULL_MEAL = 4
+RABBIT_FULL_RELIEF = 3
+RABBIT_PARTIAL_RELIEF = 1
+RABBIT_BREED_HUNGER = 2
+RABBIT_BREED_AGE = 5
+RABBIT_BREED_CHANCE = 0.2
+RABBIT_CROWD_BONUS = 0.1
+RABBIT_CROWD_BONUS_MAX = 0.25
+FOX_MEAL_RELIEF = 5
+FOX_BREED_HUNGER = 3
+FOX_BREED_AGE = 10
+FOX_BREED_CHANCE = 0.15
 RABBIT_DIET: Sequence[str] = (
     "seasonal_annuals",
     "fast_grass",
@@ -36,25 +51,44 @@ RABBIT_DIET: Sequence[str] = (
 )
 
 
-def apply_all(state: GridState, *, log_capacity: bool = True) -> None:
-    """Run all rule steps in canonical order."""
+def apply_all(
+    state: GridState,
+    *,
+    log_capacity: bool = True,
+    rng: RngContext | None = None,
+    profiler: PhaseProfiler | None = None,
+) -> None:
+    """Run all rule steps in canonical order (each timed as its own phase when `profiler` is set)."""
+    rng = rng or RngContext.from_global()
     state.capacity_events.clear()
-    grow_producers(state)
-    tick_rabbits(state)
-    tick_foxes(state)
-    apply_entity_diffusion(state)
-    remove_dead_entities(state)
+    with measure(profiler, "grow_producers"):
+        grow_producers(state, rng)
+    with measure(profiler, "tick_rabbits"):
+        tick_rabbits(state, rng)
+    with measure(profiler, "tick_foxes"):
+        tick_foxes(state, rng)
+    with measure(profiler, "apply_entity_diffusion"):
+        apply_entity_diffusion(state, rng=rng)
+    with measure(profiler, "remove_dead_entities"):
+        remove_dead_entities(state)
     if log_capacity and state.capacity_events:
         _log_capacity_summary(state)
 
 
-def grow_producers(state: GridState) -> None:
+def grow_producers(state: GridState, rng: RngContext | None = None) -> None:
     """Advance every cell's producer guilds."""
+    rng = rng or RngContext.from_global()
+    if state.arrays is not None:
+        from core import kernels
+
+        kernels.grow_producers(state, rng)
+        return
     season_factor = _season_factor(state.day)
+    noise = rng.stream(GROWTH, state.day)
     for y in range(state.grid_height):
         for x in range(state.grid_width):
             cell = state.get_cell(x, y)
-            multiplier, limiting_key, limiting_value = _resource_multiplier(state, cell, x, y, season_factor)
+            multiplier, limiting_key, limiting_value = _resource_multiplier(state, cell, x, y, season_factor, noise)
             cell.set_limiting_resource(limiting_key, limiting_value)
             _grow_cell_producers(state, cell, x, y, state.day, multiplier)
 
@@ -106,23 +140,37 @@ def _crowding_penalty(ratio: float) -> float:
     return max(0.08, logistic)
 
 
-def tick_rabbits(state: GridState) -> None:
+def tick_rabbits(state: GridState, rng: RngContext | None = None) -> None:
+    rng = rng or RngContext.from_global()
+    if _batched_agents(state):
+        from core import kernels
+
+        kernels.tick_rabbits(state, rng)
+        return
+    breeding = rng.stream(REPRODUCTION, state.day, "rabbit")
     for entity in list(_entities_of_type(state, "rabbit")):
         entity.hunger += 1
         entity.age += 1
         cell = state.get_cell(entity.x, entity.y)
-        eaten = _graze(cell, 6, RABBIT_DIET)
-        if eaten >= 4:
-            entity.hunger = max(0, entity.hunger - 3)
+        eaten = _graze(cell, RABBIT_INTAKE, RABBIT_DIET)
+        if eaten >= RABBIT_FULL_MEAL:
+            entity.hunger = max(0, entity.hunger - RABBIT_FULL_RELIEF)
         elif eaten > 0:
-            entity.hunger = max(0, entity.hunger - 1)
-        if entity.hunger <= 2 and entity.age > 5:
-            crowd_bonus = min(0.25, cell.ground_cover() / max(1, GROUND_CAP) * 0.1)
-            if random.random() < (0.2 + crowd_bonus):
+            entity.hunger = max(0, entity.hunger - RABBIT_PARTIAL_RELIEF)
+        if entity.hunger <= RABBIT_BREED_HUNGER and entity.age > RABBIT_BREED_AGE:
+            crowd_bonus = min(RABBIT_CROWD_BONUS_MAX, cell.ground_cover() / max(1, GROUND_CAP) * RABBIT_CROWD_BONUS)
+            if breeding.random() < (RABBIT_BREED_CHANCE + crowd_bonus):
                 state.spawn_entity("rabbit", entity.x, entity.y)
 
 
-def tick_foxes(state: GridState) -> None:
+def tick_foxes(state: GridState, rng: RngContext | None = None) -> None:
+    rng = rng or RngContext.from_global()
+    if _batched_agents(state):
+        from core import kernels
+
+        kernels.tick_foxes(state, rng)
+        return
+    breeding = rng.stream(REPRODUCTION, state.day, "fox")
     for entity in list(_entities_of_type(state, "fox")):
         entity.hunger += 1
         entity.age += 1
@@ -130,13 +178,18 @@ def tick_foxes(state: GridState) -> None:
         if rabbits:
             prey = max(rabbits, key=lambda r: r.hunger)
             state.remove_entity(prey.id)
-            entity.hunger = max(0, entity.hunger - 5)
-        if entity.hunger <= 3 and entity.age > 10:
-            if random.random() < 0.15:
+            entity.hunger = max(0, entity.hunger - FOX_MEAL_RELIEF)
+        if entity.hunger <= FOX_BREED_HUNGER and entity.age > FOX_BREED_AGE:
+            if breeding.random() < FOX_BREED_CHANCE:
                 state.spawn_entity("fox", entity.x, entity.y)
 
 
 def remove_dead_entities(state: GridState) -> None:
+    if not isinstance(state.entities, dict):
+        from core import kernels
+
+        kernels.remove_dead_entities(state)
+        return
     for entity_id in [eid for eid, entity in state.entities.items() if entity.is_dead()]:
         state.remove_entity(entity_id)
 
@@ -157,7 +210,9 @@ def _log_capacity_summary(state: GridState) -> None:
     )
 
 
-def _resource_multiplier(state: GridState, cell, x: int, y: int, season_factor: float) -> tuple[float, str | None, float]:
+def _resource_multiplier(
+    state: GridState, cell, x: int, y: int, season_factor: float, noise: random.Random
+) -> tuple[float, str | None, float]:
     factors = {
         "fertility": _clamp01(cell.fertility),
         "temperature": _temperature_factor(cell, state.day),
@@ -173,7 +228,7 @@ def _resource_multiplier(state: GridState, cell, x: int, y: int, season_factor:
         multiplier *= _clamp_multiplier(0.5 + value * 0.9)
         if multiplier <= MULTIPLIER_BLOCK_THRESHOLD:
             return 0.0, limiting_key, limiting_value
-    return multiplier * _growth_noise(), limiting_key, limiting_value
+    return multiplier * _growth_noise(noise), limiting_key, limiting_value
 
 
 def _detect_limiting_factor(values: dict[str, float]) -> tuple[str | None, float]:
@@ -188,10 +243,10 @@ def _detect_limiting_factor(values: dict[str, float]) -> tuple[str | None, float
     return limiting_key, limiting_value
 
 
-def _growth_noise() -> float:
+def _growth_noise(noise: random.Random) -> float:
     if NOISE_SCALE <= 0:
         return 1.0
-    return 1.0 + random.uniform(-NOISE_SCALE, NOISE_SCALE)
+    return 1.0 + noise.uniform(-NOISE_SCALE, NOISE_SCALE)
 
 
 def _clamp01(value: float) -> float:
@@ -247,6 +302,11 @@ def _graze(cell, amount: int, diet: Sequence[str]) -> int:
     return consumed
 
 
+def _batched_agents(state: GridState) -> bool:
+    """Agent kernels need both the cell arrays and the columnar entity store."""
+    return state.arrays is not None and not isinstance(state.entities, dict)
+
+
 def _entities_of_type(state: GridState, entity_type: str) -> Iterable[Entity]:
     for entity in state.entities.values():
         if entity.type == entity_type:
@@ -1,13 +1,48 @@
 """Tick scheduler orchestrating rule execution."""
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from core.model import GridState
+from core.rng import RngContext
+from core.telemetry import PhaseProfiler, measure
 from . import rules
 
+if TYPE_CHECKING:
+    from core.tiling import TiledExecutor
+
+
+def tick_grid(
+    state: GridState,
+    *,
+    log_capacity: bool = True,
+    in_place: bool = False,
+    rng: RngContext | None = None,
+    tiles: "TiledExecutor | None" = None,
+    profiler: PhaseProfiler | None = None,
+) -> GridState:
+    """Apply one tick over the grid using entity behaviors.
+
+    By default the input state is left untouched and a cloned successor is returned. Callers that
+    discard the previous day (tick loops, forecasts) pass ``in_place=True`` to advance the same
+    state object and skip the per-tick copy.
+
+    Random draws come from ``rng`` (per-subsystem streams keyed by day); without one, a context is
+    seeded from the global ``random`` module so ``random.seed()`` keeps working.
 
-def tick_grid(state: GridState, *, log_capacity: bool = True) -> GridState:
-    """Apply one tick over the grid using entity behaviors."""
-    next_state = state.clone()
-    rules.apply_all(next_state, log_capacity=log_capacity)
+    Passing a ``core.tiling.TiledExecutor`` as ``tiles`` runs the rules tile by tile on its pool
+    (array storage only). A ``telemetry.PhaseProfiler`` records each rule step as a phase (plus the
+    clone as ``clone_state``).
+    """
+    if in_place:
+        next_state = state
+    else:
+        with measure(profiler, "clone_state"):
+            next_state = state.clone()
+    rng = rng or RngContext.from_global()
+    if tiles is not None:
+        tiles.apply_all(next_state, log_capacity=log_capacity, rng=rng, profiler=profiler)
+    else:
+        rules.apply_all(next_state, log_capacity=log_capacity, rng=rng, profiler=profiler)
     next_state.day += 1
     return next_state
@@ -1,9 +1,12 @@
 """Telemetry helpers for summarizing simulation diagnostics."""
 from __future__ import annotations
 
+import time
+import tracemalloc
 from collections import Counter
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Tuple
+from typing import ContextManager, Dict, Iterable, Iterator, List, Tuple
 
 
 Coord = Tuple[int, int]
@@ -16,7 +19,9 @@ class CapacityTracker:
     total_events: int = 0
     cell_counts: Counter[Coord] = field(default_factory=Counter)
     layer_counts: Counter[str] = field(default_factory=Counter)
-    day_counts: Counter[int] = field(default_factory=Counter)
+    # Events arrive one tick at a time, so counting day changes is enough (and stays O(1) over long horizons).
+    active_days: int = 0
+    last_day: int | None = None
 
     def ingest(self, events: Iterable[Dict[str, int]]) -> None:
         for event in events:
@@ -27,7 +32,9 @@ class CapacityTracker:
             self.total_events += 1
             self.cell_counts[(x, y)] += 1
             self.layer_counts[layer] += 1
-            self.day_counts[day] += 1
+            if day != self.last_day:
+                self.active_days += 1
+                self.last_day = day
 
     def has_events(self) -> bool:
         return self.total_events > 0
@@ -38,7 +45,7 @@ class CapacityTracker:
         return {
             "total_events": self.total_events,
             "unique_cells": len(self.cell_counts),
-            "active_days": len(self.day_counts),
+            "active_days": self.active_days,
             "layer_totals": dict(self.layer_counts),
             "top_cells": [
                 {"x": x, "y": y, "events": count} for (x, y), count in self.cell_counts.most_common(top_n)
@@ -83,3 +90,112 @@ def capacity_csv_block(summary: Dict[str, object] | None) -> List[str]:
         f"capacity_top_cells,{top_str or 'n/a'}",
         f"capacity_layer_totals,{layer_str or 'n/a'}",
     ]
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    alloc_net: int = 0
+    alloc_peak: int = 0
+
+
+@dataclass
+class PhaseProfiler:
+    """Per-phase wall/CPU timers and call counts, plus tracemalloc allocation counters when enabled.
+
+    CPU time is process-wide, so tiled ticks include their worker threads. Allocation tracking
+    slows every allocation down, so it is opt-in and the timers should be read with that in mind.
+    """
+
+    track_allocations: bool = False
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+    _started_tracing: bool = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stats = self.phases.setdefault(name, PhaseStats())
+        before = 0
+        if self.track_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            stats.wall += time.perf_counter() - wall_start
+            stats.cpu += time.process_time() - cpu_start
+            stats.calls += 1
+            if self.track_allocations:
+                current, peak = tracemalloc.get_traced_memory()
+                stats.alloc_net += current - before
+                stats.alloc_peak = max(stats.alloc_peak, peak - before)
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def snapshot(self) -> Dict[str, object]:
+        total_wall = sum(stats.wall for stats in self.phases.values())
+        phases = {}
+        for name, stats in self.phases.items():
+            entry: Dict[str, object] = {
+                "calls": stats.calls,
+                "wall_s": round(stats.wall, 6),
+                "cpu_s": round(stats.cpu, 6),
+                "wall_ms_per_call": round(stats.wall * 1000 / stats.calls, 4) if stats.calls else 0.0,
+                "wall_share": round(stats.wall / total_wall, 4) if total_wall else 0.0,
+            }
+            if self.track_allocations:
+                entry["alloc_net_bytes"] = stats.alloc_net
+                entry["alloc_peak_bytes"] = stats.alloc_peak
+            phases[name] = entry
+        return {
+            "total_wall_s": round(total_wall, 6),
+            "total_cpu_s": round(sum(stats.cpu for stats in self.phases.values()), 6),
+            "track_allocations": self.track_allocations,
+            "phases": phases,
+        }
+
+
+def measure(profiler: PhaseProfiler | None, name: str) -> ContextManager[None]:
+    """`profiler.phase(name)`, or a no-op context when profiling is off."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
+
+
+def format_profile_lines(summary: Dict[str, object] | None) -> List[str]:
+    if not summary or not summary.get("phases"):
+        return []
+    track_allocations = bool(summary.get("track_allocations"))
+    header = f"{'Phase':<24} {'calls':>7} {'wall s':>9} {'share':>7} {'cpu s':>9} {'ms/call':>9}"
+    if track_allocations:
+        header += f" {'alloc peak':>11} {'alloc net':>11}"
+    lines = ["Phase profile:", header]
+    phases: Dict[str, Dict[str, object]] = summary["phases"]  # type: ignore[assignment]
+    for name, entry in sorted(phases.items(), key=lambda item: -float(item[1]["wall_s"])):
+        line = (
+            f"{name:<24} {entry['calls']:>7} {entry['wall_s']:>9.3f} {float(entry['wall_share']):>7.1%} "
+            f"{entry['cpu_s']:>9.3f} {entry['wall_ms_per_call']:>9.2f}"
+        )
+        if track_allocations:
+            line += f" {_format_bytes(entry['alloc_peak_bytes']):>11} {_format_bytes(entry['alloc_net_bytes']):>11}"
+        lines.append(line)
+    lines.append(f"{'total':<24} {'':>7} {summary['total_wall_s']:>9.3f} {'':>7} {summary['total_cpu_s']:>9.3f}")
+    return lines
+
+
+def _format_bytes(amount: object) -> str:
+    value = float(amount)  # type: ignore[arg-type]
+    for unit, scale in (("GB", 1 << 30), ("MB", 1 << 20), ("KB", 1 << 10)):
+        if abs(value) >= scale:
+            return f"{value / scale:.1f} {unit}"
+    return f"{value:.0f} B"
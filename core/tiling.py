@@ -0,0 +1,372 @@
+"""Tiled domain decomposition for multi-core ticks on array-backed grids.
+
+The grid is cut into rectangular tiles (full-width row bands unless a tile width is given) and
+each rule step runs its tiles on a thread or process pool:
+
+- producer growth works on each tile padded with a one-cell halo, so the `neighbors`-based
+  facilitation reads the same start-of-tick ground cover as the whole-grid kernel; only the
+  tile's own cells are written back;
+- grazing and hunting only touch an agent's own cell, so they run per tile without a halo;
+- diffusion draws moves per tile, and agents that step onto another tile are handed over in
+  one exchange pass once every tile has finished.
+
+Births, deaths, and moves are committed on the calling thread in entity order, and every tile
+draws from its own `RngContext.spawn("tile", index)` streams, so a run depends on the tile
+layout but never on the worker count or on which tile finishes first.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from core import kernels, rules
+from core.agents import HERBIVORE_TYPES
+from core.environment.arrays import GridArrays
+from core.model import GridState
+from core.rng import DIFFUSION, GROWTH, REPRODUCTION, RngContext
+from core.telemetry import PhaseProfiler, measure
+
+DEFAULT_TILE_HEIGHT = 128
+HALO = 1
+
+Rows = slice | np.ndarray
+
+
+def _rect_rows(x0: int, y0: int, x1: int, y1: int, width: int) -> Rows:
+    """Row-major cell indices of a rectangle; a slice (no copies) when it spans full rows."""
+    if x0 == 0 and x1 == width:
+        return slice(y0 * width, y1 * width)
+    ys = np.arange(y0, y1, dtype=np.int64)[:, None]
+    return (ys * width + np.arange(x0, x1, dtype=np.int64)).reshape(-1)
+
+
+@dataclass(frozen=True)
+class Tile:
+    """Cells `[x0, x1) x [y0, y1)` plus the halo rectangle `[hx0, hx1) x [hy0, hy1)` around them."""
+
+    index: int
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    hx0: int
+    hy0: int
+    hx1: int
+    hy1: int
+
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def halo_width(self) -> int:
+        return self.hx1 - self.hx0
+
+    @property
+    def halo_height(self) -> int:
+        return self.hy1 - self.hy0
+
+    def rows(self, grid_width: int) -> Rows:
+        return _rect_rows(self.x0, self.y0, self.x1, self.y1, grid_width)
+
+    def halo_rows(self, grid_width: int) -> Rows:
+        return _rect_rows(self.hx0, self.hy0, self.hx1, self.hy1, grid_width)
+
+    def interior(self) -> Rows:
+        """Positions of the tile's own cells inside its halo block."""
+        return _rect_rows(
+            self.x0 - self.hx0, self.y0 - self.hy0, self.x1 - self.hx0, self.y1 - self.hy0, self.halo_width
+        )
+
+    def local_cells(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Block indices (no halo) of cells at grid coordinates `(x, y)` inside this tile."""
+        return (y.astype(np.int64) - self.y0) * self.width + (x - self.x0)
+
+
+class TilePlan:
+    """Tiles covering a `width x height` grid plus a cell-to-tile lookup."""
+
+    def __init__(self, width: int, height: int, *, tile_height: int, tile_width: int | None = None) -> None:
+        if tile_height <= 0 or (tile_width is not None and tile_width <= 0):
+            raise ValueError("Tile dimensions must be positive")
+        self.width = width
+        self.height = height
+        tile_width = min(tile_width or width, width)
+        tiles: List[Tile] = []
+        for y0 in range(0, height, tile_height):
+            y1 = min(height, y0 + tile_height)
+            for x0 in range(0, width, tile_width):
+                x1 = min(width, x0 + tile_width)
+                tiles.append(
+                    Tile(
+                        index=len(tiles),
+                        x0=x0,
+                        y0=y0,
+                        x1=x1,
+                        y1=y1,
+                        hx0=max(0, x0 - HALO),
+                        hy0=max(0, y0 - HALO),
+                        hx1=min(width, x1 + HALO),
+                        hy1=min(height, y1 + HALO),
+                    )
+                )
+        self.tiles = tiles
+        self.cell_tile = np.empty(width * height, dtype=np.int64)
+        for tile in tiles:
+            self.cell_tile[tile.rows(width)] = tile.index
+
+    def split(self, cells: np.ndarray) -> List[np.ndarray]:
+        """Positions into `cells` grouped by tile (original order kept within each tile)."""
+        groups = self.cell_tile[cells]
+        order = np.argsort(groups, kind="stable")
+        bounds = np.searchsorted(groups[order], np.arange(len(self.tiles) + 1))
+        return [order[bounds[idx] : bounds[idx + 1]] for idx in range(len(self.tiles))]
+
+
+class TiledExecutor:
+    """Runs `rules.apply_all` tile by tile on a pool; pass it to `scheduler.tick_grid(tiles=...)`.
+
+    Threads are the default (NumPy releases the GIL inside the kernels); `processes=True` ships
+    each tile's arrays to worker processes instead. Requires array storage.
+    """
+
+    def __init__(
+        self,
+        *,
+        tile_height: int = DEFAULT_TILE_HEIGHT,
+        tile_width: int | None = None,
+        workers: int | None = None,
+        processes: bool = False,
+    ) -> None:
+        self.tile_height = tile_height
+        self.tile_width = tile_width
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.processes = processes
+        self._pool: Executor | None = None
+        self._plan: TilePlan | None = None
+
+    def __enter__(self) -> "TiledExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            pool_cls = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+            self._pool = pool_cls(max_workers=self.workers)
+        return self._pool
+
+    def plan(self, state: GridState) -> TilePlan:
+        plan = self._plan
+        if plan is None or (plan.width, plan.height) != (state.grid_width, state.grid_height):
+            plan = TilePlan(
+                state.grid_width, state.grid_height, tile_height=self.tile_height, tile_width=self.tile_width
+            )
+            self._plan = plan
+        return plan
+
+    def apply_all(
+        self,
+        state: GridState,
+        *,
+        log_capacity: bool = True,
+        rng: RngContext | None = None,
+        profiler: PhaseProfiler | None = None,
+    ) -> None:
+        """Tiled equivalent of rules.apply_all (same canonical step order and profiler phases)."""
+        if state.arrays is None or isinstance(state.entities, dict):
+            raise ValueError("Tiled ticks require array storage; call state.use_array_storage()")
+        rng = rng or RngContext.from_global()
+        plan = self.plan(state)
+        state.capacity_events.clear()
+        with measure(profiler, "grow_producers"):
+            self.grow_producers(state, plan, rng)
+        with measure(profiler, "tick_rabbits"):
+            self.tick_rabbits(state, plan, rng)
+        with measure(profiler, "tick_foxes"):
+            self.tick_foxes(state, plan, rng)
+        with measure(profiler, "apply_entity_diffusion"):
+            self.apply_entity_diffusion(state, plan, rng)
+        with measure(profiler, "remove_dead_entities"):
+            kernels.remove_dead_entities(state)
+        if log_capacity and state.capacity_events:
+            rules._log_capacity_summary(state)
+
+    def grow_producers(self, state: GridState, plan: TilePlan, rng: RngContext) -> None:
+        arrays = state.arrays
+        width = state.grid_width
+        tiles = plan.tiles
+        jobs = [(arrays.block(tile.halo_rows(width)), tile, width, state.day, rng) for tile in tiles]
+        results = list(self.pool.map(_grow_tile, *zip(*jobs)))
+        events = []
+        for tile, (amounts, limiting_code, limiting_value, tile_events) in zip(tiles, results):
+            rows = tile.rows(width)
+            arrays.producers[rows] = amounts
+            arrays.limiting_code[rows] = limiting_code
+            arrays.limiting_value[rows] = limiting_value
+            events.extend(tile_events)
+        kernels.record_capacity_events(state, events)
+        state.totals.reset_producers(arrays.producers.sum(axis=0))
+
+    def tick_rabbits(self, state: GridState, plan: TilePlan, rng: RngContext) -> None:
+        store = state.entities
+        arrays = state.arrays
+        rabbits = store.slots_of_type("rabbit")
+        if not len(rabbits):
+            return
+        store.hunger[rabbits] += 1
+        store.age[rabbits] += 1
+        x, y = store.x[rabbits], store.y[rabbits]
+        groups = plan.split(y.astype(np.int64) * state.grid_width + x)
+        jobs = [
+            (
+                arrays.block(tile.rows(state.grid_width)),
+                tile.local_cells(x[positions], y[positions]),
+                store.hunger[rabbits[positions]],
+                store.age[rabbits[positions]],
+                rng.spawn("tile", tile.index),
+                state.day,
+            )
+            for tile, positions in zip(plan.tiles, groups)
+            if len(positions)
+        ]
+        occupied = [(tile, positions) for tile, positions in zip(plan.tiles, groups) if len(positions)]
+        births = []
+        for (tile, positions), (amounts, hunger, born) in zip(occupied, self.pool.map(_graze_tile, *zip(*jobs))):
+            arrays.producers[tile.rows(state.grid_width)] = amounts
+            store.hunger[rabbits[positions]] = hunger
+            births.append(positions[born])
+        state.totals.reset_producers(arrays.producers.sum(axis=0))
+        kernels._spawn_at(state, "rabbit", rabbits[np.sort(np.concatenate(births))])
+
+    def tick_foxes(self, state: GridState, plan: TilePlan, rng: RngContext) -> None:
+        store = state.entities
+        foxes = store.slots_of_type("fox")
+        if not len(foxes):
+            return
+        store.hunger[foxes] += 1
+        store.age[foxes] += 1
+        width = state.grid_width
+        rabbits = store.slots_of_type("rabbit")
+        fox_x, fox_y = store.x[foxes], store.y[foxes]
+        rabbit_x, rabbit_y = store.x[rabbits], store.y[rabbits]
+        fox_groups = plan.split(fox_y.astype(np.int64) * width + fox_x)
+        rabbit_groups = plan.split(rabbit_y.astype(np.int64) * width + rabbit_x)
+        occupied = [
+            (tile, fox_positions, rabbit_positions)
+            for tile, fox_positions, rabbit_positions in zip(plan.tiles, fox_groups, rabbit_groups)
+            if len(fox_positions)
+        ]
+        jobs = [
+            (
+                tile.local_cells(fox_x[fox_positions], fox_y[fox_positions]),
+                store.hunger[foxes[fox_positions]],
+                store.age[foxes[fox_positions]],
+                tile.local_cells(rabbit_x[rabbit_positions], rabbit_y[rabbit_positions]),
+                store.hunger[rabbits[rabbit_positions]],
+                rng.spawn("tile", tile.index),
+                state.day,
+            )
+            for tile, fox_positions, rabbit_positions in occupied
+        ]
+        eaten, births = [], []
+        for (_, fox_positions, rabbit_positions), (hunger, tile_eaten, born) in zip(
+            occupied, self.pool.map(_hunt_tile, *zip(*jobs))
+        ):
+            store.hunger[foxes[fox_positions]] = hunger
+            eaten.append(rabbit_positions[tile_eaten])
+            births.append(fox_positions[born])
+        kernels._remove_slots(state, rabbits[np.concatenate(eaten)])
+        kernels._spawn_at(state, "fox", foxes[np.sort(np.concatenate(births))])
+
+    def apply_entity_diffusion(
+        self, state: GridState, plan: TilePlan, rng: RngContext, move_chance: float = 0.3
+    ) -> None:
+        store = state.entities
+        slots = store.active_slots()
+        herbivore_codes = [store.type_names.index(name) for name in HERBIVORE_TYPES if name in store.type_names]
+        movers = slots[~np.isin(store.type_code[slots], herbivore_codes)]
+        if not len(movers):
+            return
+        x, y = store.x[movers], store.y[movers]
+        groups = [
+            (tile, positions)
+            for tile, positions in zip(plan.tiles, plan.split(y.astype(np.int64) * state.grid_width + x))
+            if len(positions)
+        ]
+        jobs = [
+            (
+                x[positions],
+                y[positions],
+                state.grid_width,
+                state.grid_height,
+                move_chance,
+                rng.spawn("tile", tile.index),
+                state.day,
+            )
+            for tile, positions in groups
+        ]
+        moved, new_x, new_y = [], [], []
+        for (_, positions), (rows, tile_x, tile_y) in zip(groups, self.pool.map(_diffusion_tile, *zip(*jobs))):
+            moved.append(positions[rows])
+            new_x.append(tile_x)
+            new_y.append(tile_y)
+        # Exchange: commit every tile's moves at once, including agents crossing into another tile.
+        moved_positions = np.concatenate(moved)
+        order = np.argsort(moved_positions, kind="stable")
+        kernels.move_slots(
+            state, movers[moved_positions[order]], np.concatenate(new_x)[order], np.concatenate(new_y)[order]
+        )
+
+
+def _grow_tile(
+    block: GridArrays, tile: Tile, grid_width: int, day: int, rng: RngContext
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, list]:
+    """Grow one tile's halo block; returns its interior rows and grid-indexed capacity events."""
+    generator = rng.spawn("tile", tile.index).generator(GROWTH, day)
+    amounts, events = kernels.grow_block(block, day, tile.halo_width, tile.halo_height, generator)
+    interior = tile.interior()
+    halo_width = tile.halo_width
+    tile_events = []
+    for row, rank, layer, total, cap in events:
+        x, y = tile.hx0 + row % halo_width, tile.hy0 + row // halo_width
+        if tile.x0 <= x < tile.x1 and tile.y0 <= y < tile.y1:
+            tile_events.append((y * grid_width + x, rank, layer, total, cap))
+    return amounts[interior], block.limiting_code[interior], block.limiting_value[interior], tile_events
+
+
+def _graze_tile(
+    block: GridArrays, cells: np.ndarray, hunger: np.ndarray, age: np.ndarray, rng: RngContext, day: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    draws = rng.generator(REPRODUCTION, day, "rabbit").random(len(cells))
+    return kernels.graze_block(block, cells, hunger, age, draws)
+
+
+def _hunt_tile(
+    fox_cells: np.ndarray,
+    fox_hunger: np.ndarray,
+    fox_age: np.ndarray,
+    rabbit_cells: np.ndarray,
+    rabbit_hunger: np.ndarray,
+    rng: RngContext,
+    day: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    draws = rng.generator(REPRODUCTION, day, "fox").random(len(fox_cells))
+    return kernels.hunt_block(fox_cells, fox_hunger, fox_age, rabbit_cells, rabbit_hunger, draws)
+
+
+def _diffusion_tile(
+    x: np.ndarray, y: np.ndarray, width: int, height: int, move_chance: float, rng: RngContext, day: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return kernels.diffusion_moves(x, y, width, height, move_chance, rng.generator(DIFFUSION, day))
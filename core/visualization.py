@@ -33,15 +33,15 @@ def generate_snapshot(state: GridState) -> str:
     )
 
 
-def save_snapshot(world_name: str, snapshot_text: str) -> Path:
-    path = repository.snapshot_path(world_name)
-    with path.open("w") as fh:
+def save_snapshot(world_name: str, snapshot_text: str, *, worlds_dir: Path | None = None) -> Path:
+    path = repository.snapshot_path(world_name, worlds_dir=worlds_dir)
+    with repository.atomic_write(path) as fh:
         fh.write(snapshot_text)
     return path
 
 
-def update_readme(world_name: str, *, staging: bool | None = None) -> None:
-    snapshot_file = repository.snapshot_path(world_name)
+def update_readme(world_name: str, *, staging: bool | None = None, worlds_dir: Path | None = None) -> None:
+    snapshot_file = repository.snapshot_path(world_name, worlds_dir=worlds_dir)
     if not snapshot_file.exists():
         raise FileNotFoundError(f"Snapshot not found for world '{world_name}' at {snapshot_file}")
     snapshot_text = snapshot_file.read_text()
@@ -55,7 +55,8 @@ def update_readme(world_name: str, *, staging: bool | None = None) -> None:
     if not pattern.search(readme):
         raise RuntimeError(f"Marker pair {start}/{end} not found in README.md")
     replacement = f"{start}\n{snapshot_text}\n{end}"
-    readme_path.write_text(pattern.sub(replacement, readme))
+    with repository.atomic_write(readme_path) as fh:
+        fh.write(pattern.sub(replacement, readme))
 
 
 def cell_to_emoji(cell: Cell, entities: Dict[int, Entity]) -> str:
@@ -78,7 +79,7 @@ def _herbivore_symbol(cell: Cell, entities: Dict[int, Entity]) -> str | None:
         symbol = HERBIVORE_EMOJIS.get(herbivore_type)
         if not symbol:
             continue
-        if any(entity.type == herbivore_type for entity in cell.iter_entities(entities)):
+        if cell.count_type(entities, herbivore_type):
             return symbol
     return None
 
@@ -19,8 +19,8 @@ DEFAULT_GRID_SIZE = 10
 TARGET_VERSION = 1
 
 
-def migrate_world(world_name: str, grid_size: int = DEFAULT_GRID_SIZE) -> None:
-    paths = repository.get_paths(world_name)
+def migrate_world(world_name: str, grid_size: int = DEFAULT_GRID_SIZE, *, worlds_dir: Path | None = None) -> None:
+    paths = repository.get_paths(world_name, worlds_dir)
     state_path = paths.state
     if not state_path.exists():
         raise SystemExit(f"State file not found for '{world_name}' at {state_path}")
@@ -17,8 +17,8 @@ import core.repository as repository
 TARGET_VERSION = 2
 
 
-def migrate_world(world_name: str) -> None:
-    paths = repository.get_paths(world_name)
+def migrate_world(world_name: str, *, worlds_dir: Path | None = None) -> None:
+    paths = repository.get_paths(world_name, worlds_dir)
     state_path = paths.state
     if not state_path.exists():
         raise SystemExit(f"State file not found for '{world_name}'. Run init-grid first.")
@@ -18,8 +18,8 @@ from core.environment.producers import empty_producer_map
 TARGET_VERSION = 3
 
 
-def migrate_world(world_name: str) -> None:
-    paths = repository.get_paths(world_name)
+def migrate_world(world_name: str, *, worlds_dir: Path | None = None) -> None:
+    paths = repository.get_paths(world_name, worlds_dir)
     state_path = paths.state
     if not state_path.exists():
         raise SystemExit(f"State file not found for '{world_name}'. Run init-grid first.")
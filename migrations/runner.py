@@ -4,23 +4,52 @@ from __future__ import annotations
 
 import importlib
 import json
+import os
+import re
 import sys
 from pathlib import Path
-from typing import Iterable
+from types import ModuleType
+from typing import Dict, Tuple
 
 MIGRATIONS_DIR = Path(__file__).resolve().parent
-MIGRATION_MODULES = ["migrations.0001_grid_state", "migrations.0002_entities", "migrations.0003_producers_and_water"]
+# Same default as core.repository.WORLDS_DIR; not imported so checking a current world stays cheap.
+DEFAULT_WORLDS_DIR = Path("worlds")
+MIGRATION_MODULES = [
+    "migrations.0001_grid_state",
+    "migrations.0002_entities",
+    "migrations.0003_producers_and_water",
+]
+# A module's number prefix is the version it produces, so a current world is detected without importing any of
+# them; `_load` checks the prefix against the module's TARGET_VERSION once it is imported.
+MIGRATIONS = [(int(name.rsplit(".", 1)[1].split("_", 1)[0]), name) for name in MIGRATION_MODULES]
+LATEST_VERSION = MIGRATIONS[-1][0]
 
+# state.json ends with `"_migration_version": N` (GridState.to_dict writes it last), so the tail is enough.
+_TAIL_BYTES = 4096
+_VERSION_PATTERN = re.compile(rb'"_migration_version"\s*:\s*(-?\d+)')
+_version_cache: Dict[Path, Tuple[int, int, int]] = {}
 
-def run_pending(world_name: str, silent: bool = False) -> bool:
-    """Run all pending migrations for a world. Returns True if state changed."""
+
+def run_pending(world_name: str, silent: bool = False, *, worlds_dir: Path | None = None) -> bool:
+    """Run all pending migrations for a world under `worlds_dir` (default: worlds/). Returns True if state changed.
+
+    A current world costs one read of the end of state.json and imports no migration modules.
+    """
+    directory = Path(worlds_dir if worlds_dir is not None else DEFAULT_WORLDS_DIR) / world_name
+    if _is_binary_world(directory) or _is_delta_only_world(directory):
+        # state.bin and deltas/ are only ever written by current code; load_world still enforces the header version.
+        return False
+    if _current_version(directory) >= LATEST_VERSION:
+        return False
     changed = False
-    for module_name in MIGRATION_MODULES:
-        module = importlib.import_module(module_name)
+    for target_version, module_name in MIGRATIONS:
+        before = _current_version(directory)
+        if before >= target_version:
+            continue
+        module = _load(target_version, module_name)
         if hasattr(module, "migrate_world"):
-            before = _current_version(world_name)
-            module.migrate_world(world_name)
-            after = _current_version(world_name)
+            module.migrate_world(world_name, worlds_dir=directory.parent)
+            after = _current_version(directory)
             if after > before:
                 changed = True
                 if not silent:
@@ -28,10 +57,48 @@ def run_pending(world_name: str, silent: bool = False) -> bool:
     return changed
 
 
-def _current_version(world_name: str) -> int:
-    state_path = Path("worlds") / world_name / "state.json"
-    if not state_path.exists():
+def _load(target_version: int, module_name: str) -> ModuleType:
+    module = importlib.import_module(module_name)
+    declared = getattr(module, "TARGET_VERSION", None)
+    if declared != target_version:
+        raise RuntimeError(f"{module_name} declares TARGET_VERSION {declared}, but its file name says {target_version}")
+    return module
+
+
+def _is_binary_world(directory: Path) -> bool:
+    return (directory / "state.bin").exists()
+
+
+def _is_delta_only_world(directory: Path) -> bool:
+    return not (directory / "state.json").exists() and (directory / "deltas").is_dir()
+
+
+def _current_version(directory: Path) -> int:
+    """`_migration_version` of the world's state.json, cached per file size and mtime."""
+    state_path = directory / "state.json"
+    try:
+        stat = state_path.stat()
+    except FileNotFoundError:
         return 0
+    cached = _version_cache.get(state_path)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    version = read_state_version(state_path, stat.st_size)
+    _version_cache[state_path] = (stat.st_size, stat.st_mtime_ns, version)
+    return version
+
+
+def read_state_version(state_path: Path, size: int | None = None) -> int:
+    """`_migration_version` of a state.json, read from the end of the file when it is there."""
+    if size is None:
+        size = state_path.stat().st_size
+    with state_path.open("rb") as fh:
+        fh.seek(max(0, size - _TAIL_BYTES), os.SEEK_SET)
+        tail = fh.read()
+    matches = _VERSION_PATTERN.findall(tail)
+    if matches:
+        return int(matches[-1])
+    # Legacy or hand-edited files may put the key anywhere (or omit it); fall back to a full parse.
     try:
         data = json.loads(state_path.read_text())
     except json.JSONDecodeError:
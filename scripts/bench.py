@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""Benchmark the tick, forecast, load/save, render, and history paths on generated worlds."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import core.analysis as analysis
+import core.repository as repository
+import core.scheduler as scheduler
+import core.visualization as visualization
+from core.environment.producers import GROUND_LAYER, LAYER_MEMBERS
+from core.model import GridState
+from core.model.state import STORAGE_ARRAY, STORAGE_DICT, STORAGE_MODES
+from core.rng import RngContext
+from scripts.qa_grid_sanity import build_fixture
+
+PHASES = ("tick", "forecast", "save", "load", "render", "log_history")
+GUILD_MIXES = ("mixed", "ground", "fixture")
+DEFAULT_SIZES = "25x25,100x100"
+DEFAULT_THRESHOLD = 0.10
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}' (expected WIDTHxHEIGHT)") from exc
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}' (dimensions must be positive)")
+    return width, height
+
+
+def generate_world(
+    name: str,
+    width: int,
+    height: int,
+    *,
+    rabbit_density: float,
+    fox_density: float,
+    guild_mix: str,
+    storage: str,
+    seed: int,
+) -> GridState:
+    """Create and save a benchmark world under `repository.WORLDS_DIR`.
+
+    `mixed` keeps the environment-driven guilds from `init_grid_world`, `ground` strips every
+    non-ground guild, and `fixture` tiles the `qa_grid_sanity` checkerboard mix across the grid.
+    Densities are agents per cell.
+    """
+    cells = width * height
+    rabbits = int(round(cells * rabbit_density))
+    foxes = int(round(cells * fox_density))
+    state = repository.init_grid_world(
+        name, width=width, height=height, total_rabbits=rabbits, total_foxes=foxes, seed=seed
+    )
+    if storage == STORAGE_ARRAY:
+        state.use_array_storage()
+    if guild_mix == "ground":
+        ground = set(LAYER_MEMBERS[GROUND_LAYER])
+        for cell in state.cells:
+            for key in cell.producers:
+                if key not in ground:
+                    cell.producers[key] = 0
+    elif guild_mix == "fixture":
+        fixture = build_fixture(width, height)
+        for cell, template in zip(state.cells, fixture.cells):
+            for key in cell.producers:
+                cell.producers[key] = template.producers.get(key, 0)
+    repository.save_world(name, state)
+    return state
+
+
+def time_runs(
+    repeat: int, setup: Callable[[], object], action: Callable[[object], object]
+) -> Tuple[List[float], object]:
+    """Run `action(setup())` `repeat` times, timing only the action; returns durations and the last result."""
+    durations = []
+    result = None
+    for _ in range(max(1, repeat)):
+        subject = setup()
+        start = time.perf_counter()
+        result = action(subject)
+        durations.append(time.perf_counter() - start)
+    return durations, result
+
+
+def bench_scenario(name: str, state: GridState, args: argparse.Namespace) -> List[Dict[str, object]]:
+    cells = state.grid_width * state.grid_height
+    phases = args.phases
+    rows: List[Dict[str, object]] = []
+
+    def record(phase: str, durations: List[float], **work: float) -> None:
+        best = min(durations)
+        row: Dict[str, object] = {
+            "scenario": name,
+            "phase": phase,
+            "seconds": best,
+            "median_seconds": statistics.median(durations),
+            "runs": durations,
+        }
+        for key, amount in work.items():
+            row[f"{key}_per_sec"] = amount / best if best > 0 else None
+        rows.append(row)
+
+    if "tick" in phases:
+
+        def run_ticks(subject: GridState) -> int:
+            agent_ticks = 0
+            rng = RngContext(args.seed)
+            for _ in range(args.ticks):
+                agent_ticks += len(subject.entities)
+                subject = scheduler.tick_grid(subject, log_capacity=False, in_place=True, rng=rng)
+            return agent_ticks
+
+        durations, agent_ticks = time_runs(args.repeat, state.clone, run_ticks)
+        record("tick", durations, cell_ticks=cells * args.ticks, agent_ticks=agent_ticks)
+
+    if "forecast" in phases:
+
+        def run_forecast(subject: GridState) -> int:
+            result = analysis.run(
+                subject, world_name=name, days=args.forecast_days, step=1, seed=args.seed, copy_state=False
+            )
+            return sum(sample.rabbits + sample.foxes for sample in result.samples[:-1])
+
+        durations, agent_ticks = time_runs(args.repeat, state.clone, run_forecast)
+        record("forecast", durations, cell_ticks=cells * args.forecast_days, agent_ticks=agent_ticks)
+
+    paths = repository.get_paths(name)
+    if "save" in phases:
+        def save(subject: GridState) -> None:
+            repository.save_world(name, subject, state_format=args.state_format)
+
+        durations, _ = time_runs(args.repeat, lambda: state, save)
+        state_file = paths.binary_state if args.state_format == repository.STATE_FORMAT_BINARY else paths.state
+        record("save", durations, cells=cells, bytes=state_file.stat().st_size)
+
+    if "load" in phases:
+        durations, _ = time_runs(args.repeat, lambda: name, repository.load_world)
+        record("load", durations, cells=cells)
+
+    if "render" in phases:
+        durations, _ = time_runs(args.repeat, lambda: state, visualization.render_grid)
+        record("render", durations, cells=cells)
+
+    if "log_history" in phases:
+
+        def append_rows(subject: GridState) -> None:
+            for _ in range(args.history_rows):
+                repository.log_history(name, subject)
+
+        durations, _ = time_runs(args.repeat, lambda: state, append_rows)
+        record("log_history", durations, rows=args.history_rows)
+    return rows
+
+
+def environment_info() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import numpy
+
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def format_rate(value: object) -> str:
+    if value is None:
+        return "-"
+    value = float(value)
+    for unit, scale in (("G", 1e9), ("M", 1e6), ("k", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f}{unit}"
+    return f"{value:.1f}"
+
+
+def render_table(rows: List[Dict[str, object]]) -> str:
+    lines = [f"{'scenario':<28} {'phase':<12} {'best s':>9} {'median s':>9}  throughput"]
+    for row in rows:
+        rates = ", ".join(
+            f"{key[: -len('_per_sec')].replace('_', '-')}/s {format_rate(value)}"
+            for key, value in row.items()
+            if key.endswith("_per_sec")
+        )
+        lines.append(
+            f"{row['scenario']:<28} {row['phase']:<12} {row['seconds']:>9.4f} {row['median_seconds']:>9.4f}  {rates}"
+        )
+    return "\n".join(lines)
+
+
+def compare(rows: List[Dict[str, object]], baseline_path: Path, threshold: float) -> Tuple[List[str], int]:
+    """Compare best times against a previous JSON report; returns report lines and the regression count."""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(row["scenario"], row["phase"]): row for row in baseline.get("results", [])}
+    commit = (baseline.get("environment") or {}).get("commit") or "unknown"
+    lines = [f"Compared with {baseline_path} (commit {commit[:12]}, regression threshold {threshold:.0%}):"]
+    regressions = 0
+    for row in rows:
+        old = previous.get((row["scenario"], row["phase"]))
+        if old is None or not old.get("seconds"):
+            lines.append(f"  {row['scenario']:<28} {row['phase']:<12} (no baseline)")
+            continue
+        change = row["seconds"] / old["seconds"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  faster"
+        lines.append(
+            f"  {row['scenario']:<28} {row['phase']:<12} "
+            f"{old['seconds']:.4f}s -> {row['seconds']:.4f}s ({change:+.1%}){flag}"
+        )
+    return lines, regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Patient World hot paths on generated worlds.")
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: [parse_size(part) for part in text.split(",") if part],
+        default=[parse_size(part) for part in DEFAULT_SIZES.split(",")],
+        help=f"Comma-separated WIDTHxHEIGHT grids (default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument("--rabbit-density", type=float, default=0.5, help="Rabbits per cell (default: 0.5)")
+    parser.add_argument("--fox-density", type=float, default=0.05, help="Foxes per cell (default: 0.05)")
+    parser.add_argument("--guild-mix", choices=GUILD_MIXES, default="mixed", help="Producer mix (default: mixed)")
+    parser.add_argument("--storage", choices=STORAGE_MODES, default=STORAGE_DICT, help="Grid storage backend")
+    parser.add_argument(
+        "--state-format",
+        choices=repository.STATE_FORMATS,
+        default=repository.STATE_FORMAT_JSON,
+        help="Format used by the save/load phases (default: json)",
+    )
+    parser.add_argument(
+        "--phases",
+        type=lambda text: [part for part in text.split(",") if part],
+        default=list(PHASES),
+        help=f"Comma-separated subset of {','.join(PHASES)}",
+    )
+    parser.add_argument("--ticks", type=int, default=10, help="Ticks per tick-phase run (default: 10)")
+    parser.add_argument("--forecast-days", type=int, default=30, help="Days per forecast run (default: 30)")
+    parser.add_argument("--history-rows", type=int, default=50, help="Rows per log_history run (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per phase; best and median reported")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for world generation and ticks (default: 1)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this path")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown fraction flagged as a regression with --compare (default: 0.10)",
+    )
+    args = parser.parse_args()
+    unknown = sorted(set(args.phases) - set(PHASES))
+    if unknown:
+        parser.error(f"Unknown phases: {', '.join(unknown)}")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    # load_world picks the storage backend from the environment, so pin it for the whole run.
+    os.environ["PW_GRID_STORAGE"] = args.storage
+    rows: List[Dict[str, object]] = []
+    original_worlds_dir = repository.WORLDS_DIR
+    with tempfile.TemporaryDirectory(prefix="pw-bench-") as tmp:
+        repository.WORLDS_DIR = Path(tmp)
+        try:
+            for width, height in args.sizes:
+                name = f"{width}x{height}-{args.guild_mix}-{args.storage}"
+                state = generate_world(
+                    name,
+                    width,
+                    height,
+                    rabbit_density=args.rabbit_density,
+                    fox_density=args.fox_density,
+                    guild_mix=args.guild_mix,
+                    storage=args.storage,
+                    seed=args.seed,
+                )
+                scenario_rows = bench_scenario(name, state, args)
+                table = render_table(scenario_rows)
+                print(table if not rows else table.split("\n", 1)[1], flush=True)
+                rows.extend(scenario_rows)
+        finally:
+            repository.WORLDS_DIR = original_worlds_dir
+
+    report = {
+        "environment": environment_info(),
+        "parameters": {
+            "sizes": [f"{width}x{height}" for width, height in args.sizes],
+            "rabbit_density": args.rabbit_density,
+            "fox_density": args.fox_density,
+            "guild_mix": args.guild_mix,
+            "storage": args.storage,
+            "state_format": args.state_format,
+            "ticks": args.ticks,
+            "forecast_days": args.forecast_days,
+            "history_rows": args.history_rows,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": rows,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Wrote {len(rows)} results to {args.output}")
+    if args.compare:
+        lines, regressions = compare(rows, args.compare, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
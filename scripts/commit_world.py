@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import subprocess
 import sys
 from pathlib import Path
@@ -26,19 +25,29 @@ def parse_args() -> argparse.Namespace:
 def main() -> int:
     args = parse_args()
     paths = repository.get_paths(args.world)
-    required = [paths.state, paths.history, paths.snapshot]
+    state_path = paths.binary_state if paths.binary_state.exists() else paths.state
+    untrack = []
+    if repository.delta_store(args.world).exists():
+        # Delta worlds commit the new day's diff instead of another full state file, and stop tracking the state
+        # file so later checkouts load the latest recorded day rather than a state frozen at `deltas --init`.
+        state_path = paths.deltas
+        untrack = [paths.state, paths.binary_state]
+    history_path = paths.history_store if paths.history_store.exists() else paths.history
+    required = [state_path, history_path, paths.snapshot]
     missing = [p for p in required if not p.exists()]
     if missing:
         raise SystemExit(f"Missing files for world '{args.world}': {', '.join(str(p) for p in missing)}")
 
-    with paths.state.open() as fh:
-        state = json.load(fh)
-    day = state.get("day", 0)
+    day = repository.read_state_header(args.world)["day"]
 
     subprocess.run(["git", "config", "user.name", args.user], check=True)
     subprocess.run(["git", "config", "user.email", args.email], check=True)
-    subprocess.run(["git", "add", "README.md", str(paths.state), str(paths.history)], check=True)
+    subprocess.run(["git", "add", "README.md", str(state_path), str(history_path)], check=True)
     subprocess.run(["git", "add", "-f", str(paths.snapshot)], check=True)
+    if untrack:
+        subprocess.run(
+            ["git", "rm", "--cached", "--quiet", "--ignore-unmatch", *(str(path) for path in untrack)], check=True
+        )
 
     if subprocess.run(["git", "diff", "--cached", "--quiet"]).returncode == 0:
         print("No changes to commit")
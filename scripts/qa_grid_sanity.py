@@ -14,6 +14,7 @@ if str(ROOT_DIR) not in sys.path:
 from core.environment import Cell
 from core.environment.producers import CANOPY_LAYER, GROUND_LAYER, empty_producer_map
 from core.model import GridState
+from core.model.state import STORAGE_ARRAY, STORAGE_DICT, STORAGE_MODES
 from core.scheduler import tick_grid
 from core.agents import HERBIVORE_TYPES
 
@@ -109,8 +110,10 @@ def _sum_species(state: GridState, coords: Iterable[Tuple[int, int]], species: s
     return counter
 
 
-def run_checks(ticks: int) -> GridState:
+def run_checks(ticks: int, *, storage: str = STORAGE_DICT) -> GridState:
     state = build_fixture()
+    if storage == STORAGE_ARRAY:
+        state.use_array_storage()
     diffusion_validated = False
     for step in range(ticks):
         previous = state
@@ -128,12 +131,18 @@ def run_checks(ticks: int) -> GridState:
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sanity check the grid tick loop.")
     parser.add_argument("--ticks", type=int, default=25, help="Number of ticks to run (default: 25)")
+    parser.add_argument(
+        "--storage",
+        choices=STORAGE_MODES,
+        default=STORAGE_DICT,
+        help="Grid storage backend to exercise (default: dict)",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    final_state = run_checks(max(1, args.ticks))
+    final_state = run_checks(max(1, args.ticks), storage=args.storage)
     print(
         f"Sanity checks passed after {args.ticks} ticks "
         f"(Day {final_state.day}, totals: "
@@ -3,18 +3,36 @@
 from __future__ import annotations
 
 import argparse
+import json
 import sys
-from typing import List
+import time
+from typing import TYPE_CHECKING, List, TextIO
 
-import core.analysis as analysis
+import core.history as history
+import core.replay as replay
 import core.repository as repository
-import core.scheduler as scheduler
-import core.telemetry as telemetry
-import core.visualization as visualization
-from core.model import GridState
 from migrations import runner
 
-COMMANDS = {"tick", "forecast", "init-grid", "migrate"}
+# Commands import the simulation, analysis, and rendering modules they use when they run, so cron jobs and
+# scripts that spawn the CLI per call only pay for what that call needs.
+if TYPE_CHECKING:
+    import core.analysis as analysis
+    import core.checkpoint as checkpoint
+    import core.telemetry as telemetry
+    from core.model import GridState
+
+COMMANDS = {
+    "tick",
+    "tick-all",
+    "forecast",
+    "history",
+    "deltas",
+    "replay",
+    "serve",
+    "init-grid",
+    "migrate",
+    "convert",
+}
 
 
 def normalize_args(argv: List[str]) -> List[str]:
@@ -40,6 +58,11 @@ def build_parser() -> argparse.ArgumentParser:
     tick_p.add_argument("--count", type=int, default=1, help="Number of ticks to run")
     tick_p.add_argument("--snapshot", action="store_true", help="Generate snapshot.md after ticking")
     tick_p.add_argument("--log", action="store_true", help="Append final state to history.csv")
+    tick_p.add_argument(
+        "--log-every-day",
+        action="store_true",
+        help="Append every ticked day's totals to the history (buffered; implies --log)",
+    )
     tick_p.add_argument(
         "--update-readme",
         action="store_true",
@@ -50,13 +73,59 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print detailed carrying-capacity stats after the run",
     )
+    tick_p.add_argument(
+        "--seed",
+        type=int,
+        help="Seed every tick's random streams (keyed by day), making the run replayable with `replay --seed`",
+    )
+    tick_p.add_argument(
+        "--tile-rows",
+        type=int,
+        help="Run ticks in row bands of this height on a worker pool (array storage; requires numpy)",
+    )
+    tick_p.add_argument("--tile-cols", type=int, help="Tile width for --tile-rows (default: full grid width)")
+    tick_p.add_argument("--workers", type=int, help="Tile workers for --tile-rows (default: CPU count)")
+    tick_p.add_argument(
+        "--processes",
+        action="store_true",
+        help="Use worker processes instead of threads for --tile-rows",
+    )
+    _add_profile_arguments(tick_p)
+    _add_checkpoint_arguments(tick_p)
     tick_p.set_defaults(func=cmd_tick)
 
+    tick_all_p = subparsers.add_parser("tick-all", help="Tick every world under worlds/ in one batch")
+    tick_all_p.add_argument("--count", type=int, default=1, help="Number of ticks per world")
+    tick_all_p.add_argument("--worlds", help="Comma-separated worlds to tick (default: every world found)")
+    tick_all_p.add_argument("--exclude", help="Comma-separated worlds to skip")
+    tick_all_p.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    tick_all_p.add_argument("--seed", type=int, help="Seed every world's ticks (see tick --seed)")
+    tick_all_p.add_argument("--snapshot", action="store_true", help="Generate snapshot.md for each world")
+    tick_all_p.add_argument("--log", action="store_true", help="Append each world's final state to its history")
+    tick_all_p.add_argument(
+        "--format",
+        choices=("table", "json"),
+        default="table",
+        help="Report format",
+    )
+    tick_all_p.set_defaults(func=cmd_tick_all)
+
     forecast_p = subparsers.add_parser("forecast", help="Forecast world evolution (read-only)")
     forecast_p.add_argument("world", nargs="?", default="dev", help="World name (default: dev)")
     forecast_p.add_argument("--days", type=int, default=365, help="Days to simulate ahead (default: 365)")
     forecast_p.add_argument("--step", type=int, default=30, help="Sampling interval in days (default: 30)")
-    forecast_p.add_argument("--seed", type=int, help="Random seed for noisy projections")
+    forecast_p.add_argument("--seed", type=int, help="Random seed for noisy projections (base seed with --runs)")
+    forecast_p.add_argument(
+        "--runs",
+        type=int,
+        default=1,
+        help="Monte Carlo ensemble size; >1 reports p5/p50/p95 bands and extinction odds (default: 1)",
+    )
+    forecast_p.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for --runs ensembles (default: CPU count)",
+    )
     forecast_p.add_argument(
         "--format",
         choices=("table", "csv", "json"),
@@ -68,79 +137,573 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show detailed carrying-capacity stats for the simulated window",
     )
+    forecast_p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write csv/json-lines rows as they are simulated (constant memory); summary follows the rows",
+    )
+    _add_profile_arguments(forecast_p)
+    _add_checkpoint_arguments(forecast_p)
     forecast_p.set_defaults(func=cmd_forecast)
 
+    history_p = subparsers.add_parser("history", help="Query a world's logged history by day range")
+    history_p.add_argument("world", nargs="?", default="dev", help="World name (default: dev)")
+    history_p.add_argument("--from", dest="start_day", type=int, help="First day to include")
+    history_p.add_argument("--to", dest="end_day", type=int, help="Last day to include")
+    history_p.add_argument("--columns", help="Comma-separated columns to show (default: all)")
+    history_p.add_argument("--points", type=int, help="Downsample to at most this many rows (for charts)")
+    history_p.add_argument(
+        "--how",
+        choices=history.AGGREGATIONS,
+        default="mean",
+        help="Aggregate used by --points (default: mean)",
+    )
+    history_p.add_argument(
+        "--format",
+        choices=("table", "csv", "json"),
+        default="table",
+        help="Output format",
+    )
+    history_p.add_argument(
+        "--convert",
+        dest="target_format",
+        choices=repository.HISTORY_FORMATS,
+        help="Rewrite the world's history as history.csv or a binary history/ store instead of querying",
+    )
+    history_p.set_defaults(func=cmd_history)
+
+    deltas_p = subparsers.add_parser("deltas", help="Manage delta-encoded daily state snapshots")
+    deltas_p.add_argument("world", help="World name")
+    deltas_action = deltas_p.add_mutually_exclusive_group()
+    deltas_action.add_argument(
+        "--init",
+        action="store_true",
+        help="Start recording: store the current state as the base (each later tick adds a delta)",
+    )
+    deltas_action.add_argument("--export", type=int, metavar="DAY", help="Write the state of a recorded day as JSON")
+    deltas_action.add_argument(
+        "--restore",
+        type=int,
+        nargs="?",
+        const=-1,
+        metavar="DAY",
+        help="Rewind the world's state to a recorded day (default: latest), dropping later days",
+    )
+    deltas_p.add_argument("--output", help="File for --export (default: stdout)")
+    deltas_p.set_defaults(func=cmd_deltas)
+
+    replay_p = subparsers.add_parser("replay", help="Rebuild full states of past days of a seeded run")
+    replay_p.add_argument("world", help="World name")
+    replay_p.add_argument(
+        "--day",
+        dest="days",
+        type=int,
+        action="append",
+        help="Day to materialize (repeatable; default: read days from stdin interactively)",
+    )
+    replay_p.add_argument("--seed", type=int, required=True, help="Seed the run was ticked with (tick --seed)")
+    replay_p.add_argument(
+        "--keyframe-every",
+        type=int,
+        default=replay.DEFAULT_KEYFRAME_EVERY,
+        help=f"Days between in-memory keyframes (default: {replay.DEFAULT_KEYFRAME_EVERY})",
+    )
+    replay_p.add_argument(
+        "--cache-size",
+        type=int,
+        default=replay.DEFAULT_CACHE_SIZE,
+        help=f"Materialized days kept in the LRU cache (default: {replay.DEFAULT_CACHE_SIZE})",
+    )
+    replay_p.add_argument("--export", metavar="FILE", help="Write the last requested day's full state as JSON")
+    replay_p.set_defaults(func=cmd_replay)
+
+    serve_p = subparsers.add_parser("serve", help="Keep worlds in memory and answer tick/forecast/totals requests")
+    serve_p.add_argument("--socket", help="Unix socket path (default: worlds/sim.sock)")
+    serve_p.add_argument("--port", type=int, help="Listen on localhost TCP instead of a Unix socket")
+    serve_p.add_argument("--host", default="127.0.0.1", help="TCP bind address with --port (default: 127.0.0.1)")
+    serve_p.add_argument(
+        "--flush-interval",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="Save ticked worlds to disk this often (default: 30)",
+    )
+    serve_p.add_argument("--preload", help="Comma-separated worlds to load at startup (default: load on first use)")
+    serve_p.set_defaults(func=cmd_serve)
+
     init_p = subparsers.add_parser("init-grid", help="Create a fresh grid-based world")
     init_p.add_argument("world", help="World name to initialize")
     init_p.add_argument("--width", type=int, default=10, help="Grid width (default: 10)")
     init_p.add_argument("--height", type=int, default=10, help="Grid height (default: 10)")
     init_p.add_argument("--rabbits", type=int, default=20, help="Initial rabbit population (default: 20)")
     init_p.add_argument("--foxes", type=int, default=5, help="Initial fox population (default: 5)")
+    init_p.add_argument(
+        "--state-format",
+        choices=repository.STATE_FORMATS,
+        default=repository.STATE_FORMAT_JSON,
+        help="On-disk state format (default: json; binary requires numpy)",
+    )
     init_p.set_defaults(func=cmd_init_grid)
 
     migrate_p = subparsers.add_parser("migrate", help="Run pending migrations for a world")
     migrate_p.add_argument("world", nargs="?", default="dev", help="World name (default: dev)")
     migrate_p.set_defaults(func=cmd_migrate)
 
+    convert_p = subparsers.add_parser("convert", help="Switch a world between state.json and state.bin")
+    convert_p.add_argument("world", help="World name to convert")
+    convert_p.add_argument(
+        "--to",
+        dest="target_format",
+        choices=repository.STATE_FORMATS,
+        required=True,
+        help="Target state format",
+    )
+    convert_p.set_defaults(func=cmd_convert)
+
     return parser
 
 
-def cmd_tick(args: argparse.Namespace) -> None:
-    runner.run_pending(args.world)
-    state = repository.load_world(args.world)
-    capacity_tracker = telemetry.CapacityTracker()
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", action="store_true", help="Report per-phase wall/CPU time and call counts")
+    parser.add_argument(
+        "--profile-format",
+        choices=("table", "json"),
+        default="table",
+        help="Profile report format (default: table)",
+    )
+    parser.add_argument(
+        "--profile-alloc",
+        action="store_true",
+        help="Also count allocations per phase via tracemalloc (slows the run; implies --profile)",
+    )
+
+
+def _add_checkpoint_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        metavar="DAYS",
+        help="Save a resumable checkpoint under worlds/<world>/checkpoints/ every DAYS simulated days",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue bit-exactly from the latest checkpoint (same arguments as the interrupted run)",
+    )
+
+
+def _make_checkpointer(args: argparse.Namespace, kind: str, *outputs) -> checkpoint.Checkpointer | None:
+    import core.checkpoint as checkpoint
+
+    if args.checkpoint_every is None:
+        return None
+    return checkpoint.Checkpointer(checkpoint.checkpoint_path(args.world, kind), args.checkpoint_every, outputs)
+
+
+def _load_checkpoint(args: argparse.Namespace, kind: str) -> dict:
+    import core.checkpoint as checkpoint
+
+    try:
+        return checkpoint.load(checkpoint.checkpoint_path(args.world, kind), kind)
+    except (FileNotFoundError, ValueError) as exc:
+        raise SystemExit(str(exc)) from None
+
+
+def _make_profiler(args: argparse.Namespace) -> telemetry.PhaseProfiler | None:
+    if not (args.profile or args.profile_alloc):
+        return None
+    import core.telemetry as telemetry
+
+    return telemetry.PhaseProfiler(track_allocations=args.profile_alloc)
 
-    for _ in range(max(args.count, 0)):
-        state = scheduler.tick_grid(state)
-        capacity_tracker.ingest(state.capacity_events)
 
-    repository.save_world(args.world, state)
+def _report_profile(args: argparse.Namespace, profiler: telemetry.PhaseProfiler | None, out=sys.stdout) -> None:
+    if profiler is None:
+        return
+    import core.telemetry as telemetry
 
-    if args.snapshot:
-        snap_text = visualization.generate_snapshot(state)
-        visualization.save_snapshot(args.world, snap_text)
+    profiler.close()
+    summary = profiler.snapshot()
+    if args.profile_format == "json":
+        print(json.dumps({"profile": summary}, indent=2), file=out)
+    else:
+        for line in telemetry.format_profile_lines(summary):
+            print(line, file=out)
 
-    if args.log:
-        repository.log_history(args.world, state)
 
-    if args.update_readme:
-        if args.world not in {"prod", "staging"}:
-            raise SystemExit("README updates are restricted to prod or staging")
-        visualization.update_readme(args.world)
+def cmd_tick(args: argparse.Namespace) -> None:
+    import core.checkpoint as checkpoint
+    import core.telemetry as telemetry
+    from core import batch
+    from core.rng import RngContext
 
+    if args.update_readme and args.world not in {"prod", "staging"}:
+        raise SystemExit("README updates are restricted to prod or staging")
+    if args.resume and args.checkpoint_every is None:
+        raise SystemExit("--resume needs the interrupted run's --checkpoint-every")
+    runner.run_pending(args.world)
+    if args.resume:
+        payload = _load_checkpoint(args, checkpoint.TICK)
+        start_day = repository.read_state_header(args.world)["day"]
+        if payload["start_day"] != start_day or payload["count"] != args.count:
+            raise SystemExit(
+                f"Tick checkpoint is for --count {payload['count']} from day {payload['start_day']}; "
+                f"{args.world} is at day {start_day}"
+            )
+        state = payload["state"]
+        capacity_tracker = payload["capacity_tracker"]
+        done = int(payload["done"])
+    else:
+        state = repository.load_world(args.world)
+        capacity_tracker = telemetry.CapacityTracker()
+        start_day = state.day
+        done = 0
+    profiler = _make_profiler(args)
+    tiles = _tiled_executor(args, state)
+    rng = RngContext(args.seed) if args.seed is not None else None
+    try:
+        state = batch.advance_world(
+            args.world,
+            state,
+            args.count,
+            tracker=capacity_tracker,
+            done=done,
+            start_day=start_day,
+            rng=rng,
+            tiles=tiles,
+            profiler=profiler,
+            checkpoint_every=args.checkpoint_every,
+            log=args.log,
+            log_every_day=args.log_every_day,
+            snapshot=args.snapshot,
+            update_readme=args.update_readme,
+        )
+    finally:
+        if tiles is not None:
+            tiles.close()
     print(repository.format_summary(args.world, state))
     lines = telemetry.format_capacity_lines(capacity_tracker.snapshot(), verbose=args.capacity_report)
     if lines:
         for line in lines:
             print(line)
+    _report_profile(args, profiler)
+
+
+def cmd_tick_all(args: argparse.Namespace) -> int:
+    from core import batch
+
+    worlds = args.worlds.split(",") if args.worlds else batch.discover_worlds()
+    excluded = set(args.exclude.split(",")) if args.exclude else set()
+    worlds = [name for name in worlds if name not in excluded]
+    if not worlds:
+        raise SystemExit(f"No worlds to tick under {repository.WORLDS_DIR}")
+    start = time.perf_counter()
+    results = batch.tick_worlds(
+        worlds,
+        args.count,
+        workers=args.workers,
+        log=args.log,
+        snapshot=args.snapshot,
+        seed=args.seed,
+    )
+    elapsed = time.perf_counter() - start
+    if args.format == "json":
+        print(json.dumps({"wall_s": round(elapsed, 4), "worlds": [r.as_dict() for r in results]}, indent=2))
+    else:
+        print(batch.render_table(results))
+        print(f"Batch wall time: {elapsed:.2f}s")
+    return 0 if all(result.ok for result in results) else 1
+
+
+def _tiled_executor(args: argparse.Namespace, state: GridState):
+    if args.tile_rows is None:
+        if args.tile_cols is not None or args.workers is not None or args.processes:
+            raise SystemExit("--tile-cols, --workers, and --processes require --tile-rows")
+        return None
+    from core.tiling import TiledExecutor
+
+    state.use_array_storage()
+    return TiledExecutor(
+        tile_height=args.tile_rows,
+        tile_width=args.tile_cols,
+        workers=args.workers,
+        processes=args.processes,
+    )
 
 
 def cmd_forecast(args: argparse.Namespace) -> None:
+    import core.analysis as analysis
+    import core.checkpoint as checkpoint
+
     runner.run_pending(args.world, silent=True)
-    state = repository.load_world(args.world)
-    result = analysis.run(
+    if args.runs > 1:
+        if args.stream:
+            raise SystemExit("--stream applies to single forecasts; drop it when using --runs")
+        if args.profile or args.profile_alloc:
+            raise SystemExit("--profile applies to single forecasts; drop it when using --runs")
+        if args.checkpoint_every is not None or args.resume:
+            raise SystemExit("--checkpoint-every/--resume apply to single forecasts; drop them when using --runs")
+        _forecast_ensemble(args, repository.load_world_readonly(args.world))
+        return
+    if args.stream and args.format == "table":
+        raise SystemExit("--stream writes csv or json lines; add --format csv or --format json")
+    if args.resume and args.checkpoint_every is None:
+        raise SystemExit("--resume needs the interrupted run's --checkpoint-every")
+    profiler = _make_profiler(args)
+    if args.stream:
+        # With checkpoints, rows are held back until the next checkpoint so a resumed run appends right after them.
+        out = checkpoint.CheckpointedOutput(sys.stdout) if args.checkpoint_every is not None else sys.stdout
+        stream = _open_forecast_stream(args, profiler, out)
+        if args.format == "csv":
+            analysis.stream_csv(stream, out, include_capacity=args.capacity_report, header=not args.resume)
+        else:
+            analysis.stream_jsonl(stream, out)
+        out.flush()
+        # Profile goes to stderr so csv/json output stays machine-readable.
+        _report_profile(args, profiler, sys.stderr)
+        return
+    result = analysis.finish(_open_forecast_stream(args, profiler))
+
+    if args.format == "table":
+        print(analysis.render_table(result, capacity_details=args.capacity_report))
+    elif args.format == "csv":
+        print(analysis.render_csv(result, include_capacity=args.capacity_report))
+    else:
+        print(analysis.render_json(result))
+    _report_profile(args, profiler, sys.stderr)
+
+
+def _open_forecast_stream(
+    args: argparse.Namespace, profiler: telemetry.PhaseProfiler | None = None, out: TextIO | None = None
+) -> analysis.ForecastStream:
+    """New or resumed forecast stream; `out` (the streamed output) is flushed before each checkpoint."""
+    import core.analysis as analysis
+    import core.checkpoint as checkpoint
+
+    checkpointer = _make_checkpointer(args, checkpoint.FORECAST, *((out,) if out is not None else ()))
+    if not args.resume:
+        return analysis.ForecastStream(
+            repository.load_world_readonly(args.world),
+            world_name=args.world,
+            days=args.days,
+            step=args.step,
+            seed=args.seed,
+            copy_state=False,
+            keep_samples=not args.stream,
+            profiler=profiler,
+            checkpoint=checkpointer,
+        )
+    stream = analysis.ForecastStream.resume(
+        _load_checkpoint(args, checkpoint.FORECAST), profiler=profiler, checkpoint=checkpointer
+    )
+    expected = (stream.days, stream.step, stream.seed, not stream.keep_samples)
+    if expected != (args.days, args.step, args.seed, args.stream):
+        raise SystemExit(
+            f"Forecast checkpoint is for --days {stream.days} --step {stream.step} --seed {stream.seed}"
+            f"{' --stream' if not stream.keep_samples else ''}; rerun --resume with the same arguments"
+        )
+    return stream
+
+
+def _forecast_ensemble(args: argparse.Namespace, state: GridState) -> None:
+    import core.ensemble as ensemble
+
+    result = ensemble.run_ensemble(
         state,
         world_name=args.world,
         days=args.days,
         step=args.step,
-        seed=args.seed,
+        runs=args.runs,
+        workers=args.workers,
+        base_seed=args.seed,
     )
-
     if args.format == "table":
-        print(analysis.render_table(result, capacity_details=args.capacity_report))
+        print(ensemble.render_table(result))
     elif args.format == "csv":
-        print(analysis.render_csv(result, include_capacity=args.capacity_report))
+        print(ensemble.render_csv(result))
     else:
-        print(analysis.render_json(result))
+        print(ensemble.render_json(result))
+
+
+def cmd_history(args: argparse.Namespace) -> None:
+    if args.target_format:
+        path = repository.convert_history(args.world, args.target_format)
+        print(f"Converted {args.world} history to {args.target_format} ({path}).")
+        return
+    columns = args.columns.split(",") if args.columns else None
+    if columns and "day" not in columns:
+        columns = ["day", *columns]
+    try:
+        data = repository.load_history(args.world, args.start_day, args.end_day, columns=columns)
+    except KeyError as exc:
+        raise SystemExit(exc.args[0]) from None
+    if args.points:
+        data = history.downsample(data, args.points, how=args.how)
+    names = list(data)
+    records = [
+        {name: _history_value(name, value) for name, value in zip(names, values)} for values in zip(*data.values())
+    ]
+    if args.format == "json":
+        print(json.dumps(records, indent=2))
+        return
+    rows = [["" if record[name] is None else _history_text(record[name]) for name in names] for record in records]
+    if args.format == "csv":
+        print(",".join(names))
+        for row in rows:
+            print(",".join(row))
+        return
+    widths = [max([len(name), *(len(row[idx]) for row in rows)]) for idx, name in enumerate(names)]
+    print("  ".join(name.rjust(width) for name, width in zip(names, widths)))
+    for row in rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+
+def _history_value(name: str, value: float) -> object:
+    if value == history.MISSING:
+        return None
+    if name == history.TIMESTAMP:
+        return history.micros_to_timestamp(int(value))
+    return int(value) if float(value).is_integer() else round(value, 2)
+
+
+def _history_text(value: object) -> str:
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+
+def cmd_deltas(args: argparse.Namespace) -> None:
+    store = repository.delta_store(args.world)
+    if args.init:
+        if store.exists():
+            raise SystemExit(f"{args.world} already records deltas ({store.directory})")
+        runner.run_pending(args.world, silent=True)
+        path = store.record(repository.load_world(args.world))
+        print(f"Recording deltas for {args.world} from {path}.")
+        print("scripts/commit_world.py now commits deltas/ and removes the state file from git.")
+        return
+    if not store.exists():
+        raise SystemExit(f"{args.world} has no delta snapshots. Run: ./sim.py deltas {args.world} --init")
+    days = store.days()
+    if args.export is not None:
+        try:
+            data = store.reconstruct(args.export)
+        except KeyError as exc:
+            raise SystemExit(exc.args[0]) from None
+        text = json.dumps(data, indent=2)
+        if args.output:
+            with open(args.output, "w") as fh:
+                fh.write(text + "\n")
+        else:
+            print(text)
+        return
+    if args.restore is not None:
+        day = days[-1] if args.restore < 0 else args.restore
+        try:
+            state = store.load_state(day)
+        except KeyError as exc:
+            raise SystemExit(exc.args[0]) from None
+        repository.save_world(args.world, state)
+        dropped = store.truncate(day)
+        suffix = f"; dropped {dropped} later snapshot files" if dropped else ""
+        print(f"Restored {args.world} to day {day}{suffix}.")
+        return
+    bases = sum(1 for kind, _ in store.entries() if kind == "base")
+    print(
+        f"{args.world}: {len(days)} recorded days ({days[0]}-{days[-1]}), {bases} base snapshots, "
+        f"{store.size_bytes() / 1024:.1f} KiB"
+    )
+
+
+def cmd_replay(args: argparse.Namespace) -> None:
+    runner.run_pending(args.world, silent=True)
+    store = repository.delta_store(args.world)
+    if store.exists():
+        origin = store.load_state(store.days()[0])
+        recorded = store
+    else:
+        origin = repository.load_world_readonly(args.world)
+        recorded = None
+    engine = replay.ReplayEngine(
+        origin,
+        seed=args.seed,
+        keyframe_every=args.keyframe_every,
+        cache_size=args.cache_size,
+        recorded=recorded,
+    )
+    state = None
+    if args.days:
+        for day in args.days:
+            state = _replay_day(args, engine, day)
+    else:
+        print(f"Replaying {args.world} from day {engine.origin_day}: enter a day, +N/-N to step, q to quit.")
+        day = engine.origin_day
+        for line in sys.stdin:
+            command = line.strip()
+            if command in {"q", "quit", "exit"}:
+                break
+            try:
+                day = day + int(command) if command[:1] in "+-" and command[1:] else int(command)
+            except ValueError:
+                print("Enter a day number, +N, -N, or q.")
+                continue
+            state = _replay_day(args, engine, day)
+    if args.export and state is not None:
+        with open(args.export, "w") as fh:
+            json.dump(state.to_dict(), fh, indent=2)
+
+
+def _replay_day(args: argparse.Namespace, engine: replay.ReplayEngine, day: int) -> GridState | None:
+    before = engine.ticks_replayed
+    start = time.perf_counter()
+    try:
+        state = engine.state_at(day)
+    except ValueError as exc:
+        print(exc)
+        return None
+    elapsed = time.perf_counter() - start
+    print(repository.format_summary(args.world, state))
+    print(f"  replayed {engine.ticks_replayed - before} ticks in {elapsed:.2f}s")
+    return state
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    import asyncio
+
+    from core import daemon
+
+    if args.socket and args.port is not None:
+        raise SystemExit("Use either --socket or --port, not both")
+    try:
+        server = daemon.SimulationDaemon(flush_interval=args.flush_interval)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from None
+
+    async def run() -> None:
+        for name in args.preload.split(",") if args.preload else ():
+            try:
+                await server.handle({"command": "totals", "world": name})
+            except FileNotFoundError as exc:
+                raise SystemExit(str(exc)) from None
+        await server.serve(
+            socket_path=args.socket,
+            host=args.host,
+            port=args.port,
+            ready=lambda address: print(f"Serving {len(server.worlds)} preloaded worlds on {address}", flush=True),
+        )
+
+    asyncio.run(run())
+    print("Server stopped; all worlds flushed.")
 
 
 def cmd_init_grid(args: argparse.Namespace) -> None:
+    import core.visualization as visualization
+
     state = repository.init_grid_world(
         args.world,
         width=max(1, args.width),
         height=max(1, args.height),
         total_rabbits=max(0, args.rabbits),
         total_foxes=max(0, args.foxes),
+        state_format=args.state_format,
     )
     snap_text = visualization.generate_snapshot(state)
     visualization.save_snapshot(args.world, snap_text)
@@ -155,14 +718,19 @@ def cmd_migrate(args: argparse.Namespace) -> None:
         print(f"No migrations needed for {args.world}.")
 
 
+def cmd_convert(args: argparse.Namespace) -> None:
+    runner.run_pending(args.world, silent=True)
+    path = repository.convert_world(args.world, args.target_format)
+    print(f"Converted {args.world} to {args.target_format} ({path}).")
+
+
 def main(argv: List[str] | None = None) -> int:
     if argv is None:
         argv = sys.argv[1:]
     argv = normalize_args(argv)
     parser = build_parser()
     args = parser.parse_args(argv)
-    args.func(args)
-    return 0
+    return args.func(args) or 0
 
 
 if __name__ == "__main__":
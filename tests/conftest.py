@@ -0,0 +1,52 @@
+"""Shared pytest setup: make the repository root importable (same as scripts/ and migrations/)."""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from core.environment import Cell  # noqa: E402
+from core.environment.producers import PRODUCER_TYPES  # noqa: E402
+from core.model import GridState  # noqa: E402
+from core.repository import EXPECTED_MIGRATION_VERSION  # noqa: E402
+
+
+def build_grid(width: int, height: int, seed: int, *, max_producer: int = 400, max_entities: int = 4) -> GridState:
+    """Seeded dict-storage grid with random producers, soil, water history, rabbits, and foxes."""
+    rnd = random.Random(seed)
+    cells = []
+    for _ in range(width * height):
+        producers = {name: rnd.randrange(0, max_producer) if rnd.random() < 0.6 else 0 for name in PRODUCER_TYPES}
+        cell = Cell(producers=producers, water=rnd.random(), fertility=rnd.random(), temperature=rnd.random())
+        for _ in range(rnd.randrange(0, 5)):
+            cell.set_water(rnd.random())
+        cells.append(cell)
+    state = GridState(
+        day=rnd.randrange(0, 365),
+        grid_width=width,
+        grid_height=height,
+        cells=cells,
+        migration_version=EXPECTED_MIGRATION_VERSION,
+    )
+    for _ in range(rnd.randrange(0, max_entities * width * height + 1)):
+        state.spawn_entity(
+            rnd.choice(("rabbit", "fox")),
+            rnd.randrange(width),
+            rnd.randrange(height),
+            hunger=rnd.randrange(0, 8),
+            age=rnd.randrange(0, 30),
+        )
+    return state
+
+
+@pytest.fixture
+def make_grid() -> Callable[..., GridState]:
+    """`build_grid` as a fixture: `make_grid(width, height, seed, ...)`."""
+    return build_grid
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import copy
+import importlib.util
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import core.repository as repository
+import core.telemetry as telemetry
+import core.visualization as visualization
+from core import batch, deltas, scheduler
+from core.rng import RngContext
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def _state(producers: dict) -> dict:
+    cell = {"producers": producers, "water": 0.5}
+    return {"day": 1, "grid_width": 1, "grid_height": 1, "cells": [cell], "entities": {}, "next_entity_id": 1}
+
+
+def test_dropped_guild_is_removed_on_replay():
+    old = _state({"fast_grass": 10, "moss_carpet": 4})
+    new = _state({"fast_grass": 12})
+    new["day"] = 2
+
+    delta = deltas.diff_states(old, new)
+
+    assert delta["cells"]["0"]["producers"] == {"replace": {"fast_grass": 12}}
+    assert deltas.apply_delta(copy.deepcopy(old), delta) == new
+
+
+def test_same_guild_set_only_lists_changed_amounts():
+    old = _state({"fast_grass": 10, "moss_carpet": 4})
+    new = _state({"fast_grass": 10, "moss_carpet": 7})
+
+    delta = deltas.diff_states(old, new)
+
+    assert delta["cells"]["0"] == {"producers": {"moss_carpet": 7}}
+    assert deltas.apply_delta(copy.deepcopy(old), delta) == new
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def _commit_world(repo: Path, world: str, monkeypatch) -> None:
+    spec = importlib.util.spec_from_file_location("commit_world", ROOT_DIR / "scripts" / "commit_world.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.chdir(repo)
+    monkeypatch.setattr(sys, "argv", ["commit_world.py", world])
+    assert module.main() == 0
+
+
+def _tick(repo: Path, world: str, count: int) -> None:
+    worlds_dir = repo / "worlds"
+    state = repository.load_world(world, worlds_dir=worlds_dir)
+    batch.advance_world(
+        world,
+        state,
+        count,
+        tracker=telemetry.CapacityTracker(),
+        rng=RngContext(state.day),
+        log_capacity=False,
+        log=True,
+        snapshot=True,
+        worlds_dir=worlds_dir,
+    )
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+def test_delta_world_keeps_advancing_across_checkouts(make_grid, tmp_path, monkeypatch):
+    origin = tmp_path / "origin"
+    worlds_dir = origin / "worlds"
+    origin.mkdir()
+    (origin / "README.md").write_text("world\n")
+    start = make_grid(4, 3, 5)
+    repository.save_world("prod", start, worlds_dir=worlds_dir)
+    repository.log_history("prod", start, worlds_dir=worlds_dir)
+    visualization.save_snapshot("prod", "snapshot\n", worlds_dir=worlds_dir)
+    _git(origin, "init", "--quiet")
+    _git(origin, "add", ".")
+    _git(origin, "commit", "--quiet", "-m", "start")
+
+    repository.delta_store("prod", worlds_dir=worlds_dir).record(start)  # sim.py deltas prod --init
+    _tick(origin, "prod", 2)
+    _commit_world(origin, "prod", monkeypatch)
+    assert "worlds/prod/state.json" not in _git(origin, "ls-files")
+
+    checkout = tmp_path / "checkout"
+    _git(tmp_path, "clone", "--quiet", str(origin), str(checkout))
+    assert repository.read_state_header("prod", worlds_dir=checkout / "worlds")["day"] == start.day + 2
+    _tick(checkout, "prod", 3)
+    _commit_world(checkout, "prod", monkeypatch)
+
+    again = tmp_path / "again"
+    _git(tmp_path, "clone", "--quiet", str(checkout), str(again))
+    store = repository.delta_store("prod", worlds_dir=again / "worlds")
+    assert store.days() == [start.day, start.day + 2, start.day + 5]
+    assert repository.load_world("prod", worlds_dir=again / "worlds").day == start.day + 5
+
+
+def test_state_file_older_than_the_deltas_is_ignored(make_grid, tmp_path):
+    worlds_dir = tmp_path / "worlds"
+    state = make_grid(4, 3, 8)
+    repository.save_world("prod", state, worlds_dir=worlds_dir)
+    repository.delta_store("prod", worlds_dir=worlds_dir).record(state)
+    later = scheduler.tick_grid(state, log_capacity=False, rng=RngContext(8))
+    repository.delta_store("prod", worlds_dir=worlds_dir).record(later)
+
+    assert repository.read_state_header("prod", worlds_dir=worlds_dir)["day"] == later.day
+    loaded = repository.load_world("prod", worlds_dir=worlds_dir)
+    assert deltas.normalize(loaded.to_dict()) == deltas.normalize(later.to_dict())
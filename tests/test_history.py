@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from core.history import MISSING, HistoryStore
+
+
+def test_column_added_mid_chunk_reads_missing_for_earlier_rows(tmp_path):
+    store = HistoryStore.create(tmp_path / "history", ["day", "biomass"], chunk_rows=4)
+    store.append_many([{"day": 1, "biomass": 10}, {"day": 2, "biomass": 20}])
+    store.append_many([{"day": 3, "biomass": 30, "producer_moss": 5}])
+
+    data = HistoryStore.open(tmp_path / "history").query()
+
+    assert data["day"] == [1, 2, 3]
+    assert data["producer_moss"] == [MISSING, MISSING, 5]
+
+
+def test_column_added_mid_chunk_keeps_rows_across_the_seal(tmp_path):
+    store = HistoryStore.create(tmp_path / "history", ["day"], chunk_rows=2)
+    store.append_many([{"day": 1}])
+    store.append_many([{"day": 2, "rabbits": 4}, {"day": 3, "rabbits": 6}])
+
+    data = HistoryStore.open(tmp_path / "history").query(columns=["day", "rabbits"])
+
+    assert data == {"day": [1, 2, 3], "rabbits": [MISSING, 4, 6]}
+
+
+def test_torn_append_is_cut_back_before_the_next_row(tmp_path):
+    store = HistoryStore.create(tmp_path / "history", ["day", "biomass"], chunk_rows=8)
+    store.append_many([{"day": 1, "biomass": 10}, {"day": 2, "biomass": 20}])
+    with (tmp_path / "history" / "chunk-000000" / "biomass.i64").open("ab") as fh:
+        fh.write(b"\x01\x02\x03")  # half-written value from a crash
+
+    reopened = HistoryStore.open(tmp_path / "history")
+    reopened.append_many([{"day": 3, "biomass": 30}])
+
+    assert HistoryStore.open(tmp_path / "history").query() == {"day": [1, 2, 3], "biomass": [10, 20, 30]}
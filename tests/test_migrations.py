@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import importlib
+
+import core.repository as repository
+from migrations import runner
+
+
+def test_file_prefixes_match_declared_target_versions():
+    for version, module_name in runner.MIGRATIONS:
+        assert importlib.import_module(module_name).TARGET_VERSION == version
+    assert [version for version, _ in runner.MIGRATIONS] == list(range(1, runner.LATEST_VERSION + 1))
+
+
+def test_latest_version_is_what_the_loader_expects():
+    assert runner.LATEST_VERSION == repository.EXPECTED_MIGRATION_VERSION
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+import core.repository as repository
+
+
+def test_overlapping_atomic_writes_do_not_share_a_temp_file(tmp_path):
+    path = tmp_path / "state.json"
+
+    with repository.atomic_write(path) as first:
+        first.write("first")
+        with repository.atomic_write(path) as second:
+            second.write("second")
+        assert path.read_text() == "second"
+
+    assert path.read_text() == "first"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_readonly_load_caches_json_worlds_under_the_given_root(make_grid, tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    from core.environment.arrays import LazyArrayCells
+
+    monkeypatch.setenv("PW_GRID_STORAGE", "array")
+    worlds_dir = tmp_path / "worlds"
+    repository.save_world("forecast", make_grid(5, 4, 2), worlds_dir=worlds_dir)
+    expected = repository.load_world("forecast", worlds_dir=worlds_dir).to_dict()
+    paths = repository.get_paths("forecast", worlds_dir)
+    saved = paths.state.read_bytes()
+
+    first = repository.load_world_readonly("forecast", worlds_dir=worlds_dir)
+    assert paths.state_cache.exists()
+    second = repository.load_world_readonly("forecast", worlds_dir=worlds_dir)
+
+    assert isinstance(second.cells, LazyArrayCells)
+    assert first.to_dict() == second.to_dict() == expected
+    assert paths.state.read_bytes() == saved
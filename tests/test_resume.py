@@ -0,0 +1,126 @@
+"""A run interrupted after a checkpoint and resumed must produce exactly what an uninterrupted run does."""
+from __future__ import annotations
+
+import csv
+import functools
+import io
+
+import pytest
+
+import core.analysis as analysis
+import core.checkpoint as checkpoint
+import core.repository as repository
+import core.telemetry as telemetry
+from core import batch, persistence, scheduler
+from core.rng import RngContext
+
+WORLD = "resume"
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _crash_on_tick(number: int):
+    """`scheduler.tick_grid` stand-in that raises `Interrupted` on its `number`-th call."""
+    tick_grid = scheduler.tick_grid
+    ticks = []
+
+    def tick(*args, **kwargs):
+        ticks.append(None)
+        if len(ticks) == number:
+            raise Interrupted
+        return tick_grid(*args, **kwargs)
+
+    return tick
+
+
+def _stream(state, checkpointer=None) -> analysis.ForecastStream:
+    return analysis.ForecastStream(
+        state, world_name=WORLD, days=40, step=3, seed=17, keep_samples=True, checkpoint=checkpointer
+    )
+
+
+def test_resumed_forecast_stream_is_bit_exact(make_grid, tmp_path, monkeypatch):
+    state = make_grid(6, 5, 17)
+    expected = io.StringIO()
+    expected_result = analysis.stream_jsonl(_stream(state), expected)
+
+    # `sim.py forecast --stream --checkpoint-every 5`, killed on day 23 (after the day-21 row), then `--resume >>`.
+    path = tmp_path / "forecast.ckpt"
+    written = io.StringIO()
+    out = checkpoint.CheckpointedOutput(written)
+    with monkeypatch.context() as patch:
+        patch.setattr(scheduler, "tick_grid", _crash_on_tick(23))
+        with pytest.raises(Interrupted):
+            analysis.stream_jsonl(_stream(state, checkpoint.Checkpointer(path, 5, (out,))), out)
+    payload = checkpoint.load(path, checkpoint.FORECAST)
+    assert payload["stream"].current.day == state.day + 20
+
+    out = checkpoint.CheckpointedOutput(written)
+    resumed = analysis.ForecastStream.resume(payload, checkpoint=checkpoint.Checkpointer(path, 5, (out,)))
+    result = analysis.stream_jsonl(resumed, out)
+    out.flush()
+
+    assert written.getvalue() == expected.getvalue()
+    assert result.as_dict() == expected_result.as_dict()
+    assert not path.exists()
+
+
+def _history_days(worlds_dir) -> list:
+    with repository.get_paths(WORLD, worlds_dir).history.open() as fh:
+        return [int(row["day"]) for row in csv.DictReader(fh)]
+
+
+def test_resumed_tick_batch_is_bit_exact(make_grid, tmp_path, monkeypatch):
+    # Small batches, so unchecked history flushes would put rows past the last checkpoint on disk before the crash.
+    monkeypatch.setattr(persistence, "HistoryBuffer", functools.partial(persistence.HistoryBuffer, batch_rows=3))
+    state = make_grid(6, 5, 23)
+    clean_dir, crash_dir = tmp_path / "clean", tmp_path / "crash"
+    for worlds_dir in (clean_dir, crash_dir):
+        repository.save_world(WORLD, state.clone(), worlds_dir=worlds_dir)
+
+    batch.advance_world(
+        WORLD,
+        repository.load_world(WORLD, worlds_dir=clean_dir),
+        12,
+        tracker=telemetry.CapacityTracker(),
+        rng=RngContext(23),
+        checkpoint_every=5,
+        log_every_day=True,
+        worlds_dir=clean_dir,
+    )
+
+    with monkeypatch.context() as patch:
+        patch.setattr(scheduler, "tick_grid", _crash_on_tick(9))
+        with pytest.raises(Interrupted):
+            batch.advance_world(
+                WORLD,
+                repository.load_world(WORLD, worlds_dir=crash_dir),
+                12,
+                tracker=telemetry.CapacityTracker(),
+                rng=RngContext(23),
+                checkpoint_every=5,
+                log_every_day=True,
+                worlds_dir=crash_dir,
+            )
+    path = checkpoint.checkpoint_path(WORLD, checkpoint.TICK, worlds_dir=crash_dir)
+    payload = checkpoint.load(path, checkpoint.TICK)
+    assert payload["done"] == 5
+    batch.advance_world(
+        WORLD,
+        payload["state"],
+        payload["count"],
+        tracker=payload["capacity_tracker"],
+        done=payload["done"],
+        start_day=payload["start_day"],
+        rng=RngContext(23),
+        checkpoint_every=5,
+        log_every_day=True,
+        worlds_dir=crash_dir,
+    )
+
+    clean = repository.get_paths(WORLD, clean_dir).state.read_bytes()
+    assert repository.get_paths(WORLD, crash_dir).state.read_bytes() == clean
+    assert _history_days(crash_dir) == _history_days(clean_dir) == list(range(state.day + 1, state.day + 13))
+    assert not path.exists()
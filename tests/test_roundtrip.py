@@ -0,0 +1,47 @@
+"""Binary state files and delta histories must reproduce the state they were written from."""
+from __future__ import annotations
+
+import pytest
+
+from core import scheduler
+from core.deltas import DeltaStore, normalize
+from core.rng import RngContext
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+@pytest.mark.parametrize("storage", ["dict", "array"])
+def test_binary_state_round_trip(make_grid, tmp_path, storage, mmap):
+    pytest.importorskip("numpy")
+    from core import binary_state
+
+    state = make_grid(7, 4, 3)
+    scheduler.tick_grid(state, log_capacity=False, in_place=True, rng=RngContext(3))
+    if storage == "array":
+        state.use_array_storage()
+    path = tmp_path / "state.bin"
+
+    binary_state.write_state(path, state)
+    loaded = binary_state.read_state(path, mmap=mmap)
+
+    assert loaded.to_dict() == state.to_dict()
+    assert loaded.next_entity_id == state.next_entity_id
+    # Saving the loaded state again (without building its views first) writes the same bytes.
+    again = tmp_path / "again.bin"
+    binary_state.write_state(again, binary_state.read_state(path, mmap=mmap))
+    assert again.read_bytes() == path.read_bytes()
+
+
+@pytest.mark.parametrize("rebase_every", [1, 3, 100])
+def test_delta_store_reconstructs_every_recorded_day(make_grid, tmp_path, rebase_every):
+    state = make_grid(5, 5, 11)
+    store = DeltaStore(tmp_path / "deltas", rebase_every=rebase_every)
+    rng = RngContext(11)
+    expected = {}
+    for _ in range(8):
+        store.record(state)
+        expected[state.day] = normalize(state.to_dict())
+        state = scheduler.tick_grid(state, log_capacity=False, in_place=True, rng=rng)
+
+    assert store.days() == sorted(expected)
+    for day, data in expected.items():
+        assert store.reconstruct(day) == data
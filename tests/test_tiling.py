@@ -0,0 +1,36 @@
+"""Tiled ticks depend on the tile plan and seed only, never on how many workers run the tiles."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from core import scheduler  # noqa: E402
+from core.rng import RngContext  # noqa: E402
+from core.tiling import TiledExecutor  # noqa: E402
+
+
+def _run(state, executor: TiledExecutor, seed: int, days: int = 6) -> dict:
+    rng = RngContext(seed)
+    with executor:
+        for _ in range(days):
+            state = scheduler.tick_grid(state, log_capacity=False, in_place=True, rng=rng, tiles=executor)
+    return state.to_dict()
+
+
+@pytest.mark.parametrize("tile_width", [None, 3])
+@pytest.mark.parametrize("seed", range(3))
+def test_worker_count_does_not_change_the_result(make_grid, seed, tile_width):
+    state = make_grid(9, 11, seed).use_array_storage()
+    expected = _run(state.clone(), TiledExecutor(tile_height=4, tile_width=tile_width, workers=1), seed)
+
+    for workers in (2, 5):
+        executor = TiledExecutor(tile_height=4, tile_width=tile_width, workers=workers)
+        assert _run(state.clone(), executor, seed) == expected
+
+
+def test_process_pool_matches_threads(make_grid):
+    state = make_grid(8, 8, 4).use_array_storage()
+    expected = _run(state.clone(), TiledExecutor(tile_height=3, workers=1), 4, days=3)
+
+    assert _run(state.clone(), TiledExecutor(tile_height=3, workers=2, processes=True), 4, days=3) == expected
@@ -0,0 +1,92 @@
+"""The incrementally maintained `GridTotals` must always agree with a full rescan of the grid."""
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from core import scheduler
+from core.environment.producers import PRODUCER_TYPES
+from core.model import GridState
+from core.model.totals import DRY_THRESHOLD
+from core.rng import RngContext
+
+
+def _rescan(state: GridState) -> dict:
+    data = state.to_dict()
+    producers = {name: sum(cell["producers"].get(name, 0) for cell in data["cells"]) for name in PRODUCER_TYPES}
+    population = Counter(entity["type"] for entity in data["entities"].values())
+    waters = [cell["water"] for cell in data["cells"]]
+    return {
+        "producers": producers,
+        "rabbits": population["rabbit"],
+        "foxes": population["fox"],
+        "water_min": min(waters),
+        "water_max": max(waters),
+        "water_mean": sum(waters) / len(waters),
+        "dry_cells": sum(1 for water in waters if water <= DRY_THRESHOLD),
+    }
+
+
+def _assert_totals_match(state: GridState) -> None:
+    expected = _rescan(state)
+    water = state.water_stats()
+    assert state.producer_totals() == expected["producers"]
+    assert state.total_biomass() == sum(expected["producers"].values())
+    assert (state.total_rabbits(), state.total_foxes()) == (expected["rabbits"], expected["foxes"])
+    assert (water["min"], water["max"], water["dry_cells"]) == (
+        expected["water_min"],
+        expected["water_max"],
+        expected["dry_cells"],
+    )
+    assert water["mean"] == pytest.approx(expected["water_mean"], rel=1e-12)
+
+
+def _churn(state: GridState, seed: int, days: int = 4) -> GridState:
+    """Tick, spawn into and remove from `state`, checking the totals after every step."""
+    rng = RngContext(seed)
+    for day in range(days):
+        state = scheduler.tick_grid(state, log_capacity=False, in_place=True, rng=rng)
+        _assert_totals_match(state)
+        x, y = day % state.grid_width, (day * 3) % state.grid_height
+        state.spawn_entity("rabbit", x, y)
+        state.spawn_entity("fox", x, y)
+        for entity_id in list(state.entities)[::3]:
+            state.remove_entity(entity_id)
+        _assert_totals_match(state)
+    return state
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_dict_totals_match_rescan(make_grid, seed):
+    state = make_grid(6, 5, seed)
+    _assert_totals_match(state)
+    _churn(state, seed)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_array_totals_match_rescan(make_grid, seed):
+    pytest.importorskip("numpy")
+    state = make_grid(6, 5, seed).use_array_storage()
+    _assert_totals_match(state)
+    clone = _churn(state, seed).clone()
+    _assert_totals_match(clone)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_lazy_binary_load_totals_match_rescan(make_grid, tmp_path, seed):
+    pytest.importorskip("numpy")
+    from core import binary_state
+    from core.environment.arrays import LazyArrayCells
+
+    path = tmp_path / "state.bin"
+    binary_state.write_state(path, make_grid(6, 5, seed))
+    state = binary_state.read_state(path, mmap=True)
+    assert isinstance(state.cells, LazyArrayCells)
+
+    # Spawn into and remove from rows that have not been built yet, before anything else reads them.
+    state.spawn_entity("fox", 5, 4)
+    state.remove_entity(next(iter(state.entities)))
+    assert isinstance(state.cells, LazyArrayCells)
+    _assert_totals_match(state)
+    _churn(state, seed)